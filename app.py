@@ -1,7 +1,8 @@
 import streamlit as st
 import extra_streamlit_components as stx
-import service
 from core.db import init_db
+from core.session_token import verify_session_token
+from core.summary_jobs import get_summary_worker
 from dotenv import load_dotenv
 import time
 
@@ -11,6 +12,9 @@ st.set_page_config(page_title="그룹웨어 데모", layout="wide")
 
 init_db()
 
+# 공지 요약 백그라운드 워커 (프로세스당 1회 시작, 재시작 전 남은 작업 이어서 처리)
+get_summary_worker()
+
 # 세션 기본값
 st.session_state.setdefault("logged_in", False)
 st.session_state.setdefault("role", None)              # "ADMIN" | "EMPLOYEE"
@@ -26,10 +30,11 @@ cookie_manager = stx.CookieManager(key="init_cookie_manager")
 cookies = cookie_manager.get_all()
 user_token = cookies.get("user_token")
 
-# 자동 로그인 시도
+# 자동 로그인 시도 (서명된 세션 토큰만 확인, DB 조회 없음)
 if not st.session_state.logged_in and user_token:
-    info = service.get_account_info(str(user_token))
+    info = verify_session_token(str(user_token))
     if info:
+        st.session_state.session_token = str(user_token)
         st.session_state.logged_in = True
         st.session_state.role = info["role"]
         
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+레이아웃 리런당 전송량 벤치마크 (core.layout.apply_portal_theme + render_floating_widget)
+
+- 기존 방식(리런마다 위젯 원본 이미지를 base64 data URL로 전송 + 테마 CSS 전체 전송),
+  정적 서빙이 꺼져 있을 때의 대체 방식(축소 이미지 data URL을 한 번만 인코딩),
+  정적 서빙 방식(축소 이미지/CSS를 내용 해시 URL로 static/cache/에 한 번 기록, 리런마다 URL만 전송)을 비교
+- streamlit.testing의 AppTest로 직원 화면과 같은 순서로 두 함수를 호출하고,
+  스크립트가 보내는 ForwardMsg(delta)의 직렬화 크기를 리런마다 합산
+- Streamlit 자체 메시지 캐시(global.minCachedMessageSize 10KB 이상, 브라우저가 이미 가진 메시지는 참조만 전송)는
+  제외한 크기 (캐시가 적용돼도 서버는 리런마다 메시지를 만들고 해시를 계산함)
+
+사용 방법 (프로젝트 루트에서):
+  python benchmarks/bench_layout_payload.py
+  python benchmarks/bench_layout_payload.py --reruns 20 --img assets/chatimg.png
+"""
+import argparse
+import base64
+import mimetypes
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+
+def _page(img_path):
+    from core.layout import apply_portal_theme, render_floating_widget
+    apply_portal_theme(hide_pages_sidebar_nav=True, hide_sidebar=False, active_menu="홈")
+    render_floating_widget(img_path=img_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--img", default="assets/chatimg_r.png", help="플로팅 위젯 이미지")
+    args = parser.parse_args()
+
+    from streamlit import config
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    from streamlit.testing.v1 import AppTest
+    from core import static_assets
+
+    sent = {"bytes": 0}
+    original_enqueue = ScriptRunContext.enqueue
+
+    def counting_enqueue(self, msg):
+        if msg.WhichOneof("type") == "delta":
+            sent["bytes"] += msg.ByteSize()
+        return original_enqueue(self, msg)
+
+    ScriptRunContext.enqueue = counting_enqueue
+
+    def legacy_image_url(img_path, max_px=None):
+        """변경 전 구현 (비교용): 리런마다 원본 파일을 읽어 base64 인코딩"""
+        p = Path(img_path)
+        if not p.exists():
+            return None
+        mime = mimetypes.guess_type(str(p))[0] or "image/png"
+        return f"data:{mime};base64,{base64.b64encode(p.read_bytes()).decode('utf-8')}"
+
+    def run(label, static_serving, legacy=False):
+        config.set_option("server.enableStaticServing", static_serving)
+        image_url = static_assets.image_url
+        if legacy:
+            static_assets.image_url = legacy_image_url
+        try:
+            at = AppTest.from_function(_page, args=(args.img,), default_timeout=30)
+            sizes, times = [], []
+            for _ in range(args.reruns):
+                sent["bytes"] = 0
+                t0 = time.perf_counter()
+                at.run()
+                times.append(time.perf_counter() - t0)
+                assert not at.exception, at.exception
+                sizes.append(sent["bytes"])
+        finally:
+            static_assets.image_url = image_url
+        steady = sizes[1:] or sizes
+        print(f"{label:<22} | {sizes[0]:>12,} | {sum(steady) // len(steady):>15,} | "
+              f"{sum(times[1:] or times) / len(times[1:] or times) * 1000:>11.1f}")
+        return sum(steady) / len(steady)
+
+    print()
+    print(f"image {args.img} ({os.path.getsize(args.img):,} bytes), {args.reruns} reruns")
+    print(f"{'':<22} | {'1st run B':>12} | {'per rerun B':>15} | {'rerun ms':>11}")
+    print("-" * 70)
+    before = run("legacy (data URL)", static_serving=False, legacy=True)
+    run("memoized data URL", static_serving=False)
+    after = run("static serving", static_serving=True)
+    print(f"\nbytes per rerun: {before:,.0f} -> {after:,.0f} ({before / after:.0f}x smaller)")
+
+    ScriptRunContext.enqueue = original_enqueue
+
+
+if __name__ == "__main__":
+    main()
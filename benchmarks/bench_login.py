@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+로그인 벤치마크 (service.login_account)
+
+- 기존 방식(스크립트 스레드에서 바로 PBKDF2 + get_employee_info로 두 번째 연결/쿼리)과
+  해시 풀 + accounts/employees 조인 1회 + 성공 검증 기억 방식을 비교
+- 출근 시간처럼 --clients개 세션이 동시에 --accounts개 계정으로 로그인
+  (1회차: 처음 로그인, 2회차: 같은 계정 재로그인)
+- 로그인과 별개로 다른 세션의 리런을 흉내내는 가벼운 쿼리를 10ms마다 실행해 응답 지연(p95/max)도 측정
+- 마지막에 _ITERATIONS를 바꾼 뒤 로그인하면 저장된 해시가 새 반복 횟수로 바뀌는지 확인
+- 임시 SQLite DB를 만들어 측정하므로 운영 DB에는 영향 없음
+
+사용 방법 (프로젝트 루트에서):
+  python benchmarks/bench_login.py
+  python benchmarks/bench_login.py --accounts 128 --clients 64
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)  # sql/schema.sql 상대경로 기준
+
+from core import auth, db  # noqa: E402
+
+PASSWORD = "pw-1234"
+
+
+def legacy_login_account(service, login_id, pw):
+    """변경 전 구현 (비교용)"""
+    with db.get_conn() as conn:
+        acc = conn.execute(
+            "SELECT login_id, password_hash, role, employee_id FROM accounts WHERE login_id = ?",
+            (login_id,),
+        ).fetchone()
+    if not acc or not auth.verify_password(pw, acc["password_hash"]):
+        return None
+    emp = service.get_employee_info(acc["employee_id"])
+    return {"role": "EMPLOYEE", "employee": emp, "loginId": acc["login_id"]} if emp else None
+
+
+def seed(n: int):
+    login_ids = [f"BENCH{i:04d}" for i in range(n)]
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+        hashes = list(pool.map(lambda _: auth.hash_password(PASSWORD), login_ids))
+    with db.get_conn() as conn:
+        conn.executemany(
+            "INSERT INTO employees(employee_id, name, department, team) VALUES(?, ?, ?, ?)",
+            [(lid, f"직원{lid}", "경영관리본부", "재경팀") for lid in login_ids],
+        )
+        conn.executemany(
+            "INSERT INTO accounts(login_id, password_hash, role, employee_id) VALUES(?, ?, 'EMPLOYEE', ?)",
+            [(lid, h, lid) for lid, h in zip(login_ids, hashes)],
+        )
+    return login_ids
+
+
+def storm(login, login_ids, clients):
+    """
+    동시 로그인 실행
+
+    Returns:
+        (초당 로그인 수, 로그인 p95 ms, 리런 p95 ms, 리런 max ms)
+    """
+    stop = threading.Event()
+    probe_ms = []
+
+    def probe():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            with db.get_conn() as conn:
+                conn.execute("SELECT COUNT(1) AS cnt FROM notices").fetchone()
+            probe_ms.append((time.perf_counter() - t0) * 1000)
+            time.sleep(0.01)
+
+    def one(lid):
+        t0 = time.perf_counter()
+        assert login(lid, PASSWORD), lid
+        return (time.perf_counter() - t0) * 1000
+
+    prober = threading.Thread(target=probe, daemon=True)
+    prober.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as sessions:
+        login_ms = list(sessions.map(one, login_ids))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    prober.join()
+
+    def p95(xs):
+        return statistics.quantiles(xs, n=20)[-1] if len(xs) >= 2 else (xs or [0])[0]
+
+    return len(login_ids) / elapsed, p95(login_ms), p95(probe_ms), max(probe_ms or [0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=32, help="동시에 로그인하는 세션 수")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db.DB_PATH = Path(tmp.name) / "bench.db"
+    db.init_db()
+    import service
+
+    print(f"\nseeding {args.accounts} accounts ({auth._ITERATIONS:,} PBKDF2 iterations)...")
+    login_ids = seed(args.accounts)
+
+    print(f"{args.clients} concurrent sessions, {auth.LOGIN_HASH_WORKERS} hash workers, {os.cpu_count()} CPU")
+    print(f"{'':<20} | {'logins/s':>9} | {'login p95 ms':>12} | {'rerun p95 ms':>12} | {'rerun max ms':>12}")
+    print("-" * 77)
+    rows = [
+        ("legacy", lambda lid, pw: legacy_login_account(service, lid, pw)),
+        ("pooled (1st)", service.login_account),
+        ("pooled (re-login)", service.login_account),
+    ]
+    for label, login in rows:
+        rate, login_p95, probe_p95, probe_max = storm(login, login_ids, args.clients)
+        print(f"{label:<20} | {rate:>9.1f} | {login_p95:>12.1f} | {probe_p95:>12.1f} | {probe_max:>12.1f}")
+
+    # 반복 횟수 변경 후 로그인 -> 재해시 저장 확인
+    auth._ITERATIONS = auth._ITERATIONS + 10_000
+    lid = login_ids[0]
+    assert service.login_account(lid, PASSWORD)
+    for _ in range(100):
+        with db.get_conn() as conn:
+            stored = conn.execute("SELECT password_hash FROM accounts WHERE login_id = ?", (lid,)).fetchone()["password_hash"]
+        if not auth.needs_rehash(stored):
+            break
+        time.sleep(0.05)
+    assert not auth.needs_rehash(stored) and auth.verify_password(PASSWORD, stored)
+    print(f"\nrehash on login: {lid} -> pbkdf2${auth._ITERATIONS} ok")
+
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+팝업 조회 벤치마크 (get_latest_popup_for_employee)
+
+- 기존 방식(전체 popups 로드 + 팝업마다 popup_logs 조회 + 이미지 2회 조회)과
+  popup_deliveries 기반 단일 쿼리 방식을 popups 10건 ~ 100,000건에서 비교
+- 임시 SQLite DB를 만들어 측정하므로 운영 DB에는 영향 없음
+
+사용 방법 (프로젝트 루트에서):
+  python benchmarks/bench_popup_resolution.py
+  python benchmarks/bench_popup_resolution.py --sizes 10 1000 100000 --repeat 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)  # sql/schema.sql 상대경로 기준
+
+from core import db  # noqa: E402
+
+TEAMS = ["재경팀", "연구1팀", "연구2팀", "생산팀", "품질팀", "영업1팀", "영업2팀"]
+EMPLOYEE_ID = "HS001"  # 재경팀 / 경영관리본부
+LEGACY_MAX_SIZE = 10_000  # 기존 방식은 이보다 크면 너무 오래 걸려 생략
+
+
+def legacy_get_latest_popup(service, employee_id):
+    """변경 전 구현 (비교용)"""
+    emp = service.get_employee_info(employee_id)
+    if not emp:
+        return None
+
+    with db.get_conn() as conn:
+        popups = conn.execute("SELECT * FROM popups ORDER BY created_at DESC").fetchall()
+
+    for p in popups:
+        popup_id = int(p["popup_id"])
+        if service._has_responded(employee_id, popup_id):
+            continue
+        team_targets = service._parse_csv(p["target_teams"])
+        dept_targets = service._parse_csv(p["target_departments"])
+        if team_targets:
+            matches = emp["team"] in team_targets
+        elif dept_targets:
+            matches = emp["department"] in dept_targets
+        else:
+            matches = False
+        if matches:
+            service.get_first_image_attachment(int(p["post_id"]))
+            return {"popupId": popup_id}
+    return None
+
+
+def seed(n: int, pending: bool):
+    """
+    popups n건 생성
+    - 팀을 돌아가며 대상 지정 (직원 팀 대상은 약 1/7)
+    - 직원은 자기 팀 대상 팝업에 모두 응답한 상태
+    - pending=True면 가장 최신 팝업 1건만 미응답 (실사용에서 흔한 상황)
+    """
+    ts0 = 1_700_000_000_000
+    with db.get_conn() as conn:
+        conn.execute("DELETE FROM popup_logs")
+        conn.execute("DELETE FROM popup_deliveries")
+        conn.execute("DELETE FROM popup_targets")
+        conn.execute("DELETE FROM notice_files")
+        conn.execute("DELETE FROM popups")
+        conn.execute("DELETE FROM notices")
+
+        notices, popups, targets, deliveries, logs = [], [], [], [], []
+        for i in range(n):
+            pid = ts0 + i
+            # pending=True면 최신 팝업은 반드시 직원 팀 대상
+            team = "재경팀" if (pending and i == n - 1) else TEAMS[i % len(TEAMS)]
+            notices.append((pid, pid, "중요", f"공지 {i}", "내용", "관리자"))
+            popups.append((pid, pid, f"공지 {i}", "내용", "", team, pid))
+            targets.append((pid, "TEAM", team))
+            if team == "재경팀":
+                answered = not (pending and i == n - 1)
+                deliveries.append((pid, EMPLOYEE_ID, pid, pid if answered else None))
+                if answered:
+                    logs.append((pid, EMPLOYEE_ID, pid, "확인함", "예"))
+
+        conn.executemany(
+            "INSERT INTO notices(post_id, created_at, type, title, content, author, views) VALUES(?,?,?,?,?,?,0)",
+            notices,
+        )
+        conn.executemany(
+            "INSERT INTO popups(popup_id, post_id, title, content, target_departments, target_teams, created_at) "
+            "VALUES(?,?,?,?,?,?,?)",
+            popups,
+        )
+        conn.executemany(
+            "INSERT INTO popup_targets(popup_id, target_type, target_value) VALUES(?,?,?)",
+            targets,
+        )
+        conn.executemany(
+            "INSERT INTO popup_deliveries(popup_id, employee_id, created_at, responded_at) VALUES(?,?,?,?)",
+            deliveries,
+        )
+        conn.executemany(
+            "INSERT INTO popup_logs(created_at, employee_id, popup_id, action, confirmed) VALUES(?,?,?,?,?)",
+            logs,
+        )
+        conn.execute("ANALYZE")
+
+
+def measure(fn, repeat: int) -> float:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db.DB_PATH = Path(tmp.name) / "bench.db"
+    db.init_db()
+
+    import service
+
+    print()
+    print(f"{'popups':>8} | {'scenario':>10} | {'legacy ms':>10} | {'single-query ms':>15}")
+    print("-" * 54)
+    for n in args.sizes:
+        for pending in (True, False):
+            seed(n, pending)
+            new_ms = measure(lambda: service.get_latest_popup_for_employee(EMPLOYEE_ID), args.repeat)
+            if n <= LEGACY_MAX_SIZE:
+                legacy_ms = f"{measure(lambda: legacy_get_latest_popup(service, EMPLOYEE_ID), max(1, args.repeat // 5)):10.2f}"
+            else:
+                legacy_ms = f"{'-':>10}"
+            scenario = "pending" if pending else "none"
+            print(f"{n:>8} | {scenario:>10} | {legacy_ms} | {new_ms:15.3f}")
+
+    db.close_pools()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
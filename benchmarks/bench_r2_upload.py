@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+첨부 업로드 벤치마크 (core.storage.save_files)
+
+- 기존 방식(업로드마다 boto3 클라이언트 생성 + 파일 순차 업로드 + 단일 PUT)과
+  클라이언트 재사용 + 파일 병렬 업로드 + 큰 파일 멀티파트 방식을 비교
+- R2 대신 로컬 S3 호환 저장소(core/local_s3.py)에 올리므로 R2 계정/네트워크 없이 실행 가능
+  요청당 지연(--latency-ms)과 연결당 대역폭(--bandwidth-mbps)으로 R2 왕복을 흉내냄
+
+사용 방법 (프로젝트 루트에서):
+  python benchmarks/bench_r2_upload.py
+  python benchmarks/bench_r2_upload.py --files 8 --size-mb 1 24 --latency-ms 40 --bandwidth-mbps 10
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=6, help="공지 1건에 올리는 첨부 수")
+    parser.add_argument("--size-mb", type=float, nargs="+", default=[0.5, 4, 24], help="첨부 1개 크기(MB)")
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--bandwidth-mbps", type=float, default=20, help="연결 1개당 MB/s")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    # core.storage / core.local_s3는 import 시점에 환경변수를 읽음
+    os.environ["R2_BACKEND"] = "local"
+    os.environ["R2_LOCAL_ROOT"] = tmp.name
+    os.environ["R2_LOCAL_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["R2_LOCAL_BANDWIDTH_MBPS"] = str(args.bandwidth_mbps)
+
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from core import storage
+    from core.local_s3 import LocalS3Client
+
+    def legacy_upload(files):
+        """변경 전 구현 (비교용): 파일마다 클라이언트를 새로 만들고 순차 업로드"""
+        for data, name, folder, mime in files:
+            # 실제 boto3 클라이언트 생성 비용 (엔드포인트/인증 정보는 더미)
+            boto3.client(
+                "s3", endpoint_url="https://example.r2.cloudflarestorage.com",
+                aws_access_key_id="x", aws_secret_access_key="x", region_name="auto",
+            )
+            LocalS3Client(Path(tmp.name)).upload_fileobj(
+                data, storage.R2_BUCKET_NAME, f"{folder}/{name}", ExtraArgs={"ContentType": mime},
+                Config=TransferConfig(multipart_threshold=1 << 40, use_threads=False),
+            )
+
+    print()
+    print(f"latency {args.latency_ms:g}ms, bandwidth {args.bandwidth_mbps:g}MB/s per connection, "
+          f"{args.files} files per notice")
+    print(f"{'size MB':>8} | {'legacy s':>9} | {'pooled+parallel s':>17} | {'speedup':>7}")
+    print("-" * 52)
+    for size_mb in args.size_mb:
+        payload = os.urandom(int(size_mb * 1024 * 1024))
+
+        def batch(tag):
+            return [(io.BytesIO(payload), f"{tag}_{i}.bin", "uploads", "application/octet-stream") for i in range(args.files)]
+
+        t0 = time.perf_counter()
+        legacy_upload(batch("legacy"))
+        legacy_s = time.perf_counter() - t0
+
+        storage.get_r2_client()  # 첫 생성은 측정에서 제외 (프로세스당 1회)
+        t0 = time.perf_counter()
+        urls = storage.save_files(batch("new"))
+        new_s = time.perf_counter() - t0
+        assert len(urls) == args.files
+
+        print(f"{size_mb:>8g} | {legacy_s:9.2f} | {new_s:17.2f} | {legacy_s / new_s:6.1f}x")
+
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+챗봇 답변 캐시
+
+"연차 신청 방법", "연차 신청 방법 알려줘"처럼 같은 내용을 묻는 질문은
+같은 공지 집합을 근거로 같은 답을 받으므로 POTENS 호출 없이 이전 답변을 재사용한다.
+
+- 키: 정규화한 키워드(ChatbotEngine._extract_keywords 결과, 소문자/정렬)
+      + 컨텍스트로 선택된 공지 집합의 지문(post_id + 제목/내용 해시)
+- 공지가 수정되면 지문이 달라져서 자연히 새 답변을 생성하고,
+  service의 공지 저장/수정/삭제 시 해당 공지를 참조한 답변은 즉시 삭제
+- ANSWER_CACHE_TTL_SEC가 지나면 만료, ANSWER_CACHE_SIZE를 넘으면 오래 안 쓴 것부터 제거
+"""
+import copy
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+ANSWER_CACHE_TTL_SEC = float(os.getenv("ANSWER_CACHE_TTL_SEC", "3600"))
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "512"))
+
+
+def notice_set_fingerprint(notices: Iterable[Dict]) -> str:
+    """컨텍스트 공지 집합 지문 (순서 무관, 제목/내용이 바뀌면 달라짐)"""
+    h = hashlib.sha1()
+    for n in sorted(notices, key=lambda x: int(x["post_id"])):
+        h.update(str(int(n["post_id"])).encode())
+        h.update(b"\0")
+        h.update(hashlib.sha1(f"{n.get('title') or ''}\0{n.get('content') or ''}".encode("utf-8")).digest())
+    return h.hexdigest()
+
+
+def answer_cache_key(keywords: List[str], notices: Iterable[Dict]) -> Optional[str]:
+    """
+    답변 캐시 키
+
+    Returns:
+        키워드가 없으면(인사말 등) None -> 캐시하지 않음
+    """
+    normalized = sorted({k.strip().lower() for k in keywords if k and k.strip()})
+    if not normalized:
+        return None
+    return "|".join(normalized) + "#" + notice_set_fingerprint(notices)
+
+
+class AnswerCache:
+    """TTL + LRU 답변 캐시 (공지 ID -> 키 역색인으로 공지 변경 시 무효화)"""
+
+    def __init__(self, max_size: int = ANSWER_CACHE_SIZE, ttl: float = ANSWER_CACHE_TTL_SEC):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict, Set[int]]]" = OrderedDict()
+        self._by_notice: Dict[int, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result, _ = entry
+            if time.monotonic() >= expires_at:
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict, notice_ids: Iterable[int]) -> None:
+        ids = {int(i) for i in notice_ids}
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(result), ids)
+            for post_id in ids:
+                self._by_notice.setdefault(post_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_notice(self, post_id: int) -> int:
+        with self._lock:
+            keys = list(self._by_notice.get(int(post_id), ()))
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_notice.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for post_id in entry[2]:
+            keys = self._by_notice.get(post_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_notice[post_id]
+
+
+_cache: Optional[AnswerCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """프로세스 전역 답변 캐시"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnswerCache()
+    return _cache
+
+
+def invalidate_answers_for_notice(post_id: int) -> None:
+    """공지 저장/수정/삭제 후 호출 (해당 공지를 근거로 한 답변 삭제)"""
+    try:
+        get_answer_cache().invalidate_notice(post_id)
+    except Exception as e:
+        print(f"[answer_cache] 공지 {post_id} 답변 캐시 삭제 실패: {e}")
@@ -5,14 +5,26 @@ import base64
 import hashlib
 import hmac
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
 
 
 # -------------------------------------------------------
 # 비밀번호 해시(데모용)
 # - 실제 운영이면 bcrypt/argon2 권장
 # - 여기서는 표준라이브러리로 PBKDF2 사용
+# - 반복 횟수를 바꾸면 기존 해시는 다음 로그인 때 새 횟수로 다시 저장됨 (needs_rehash)
 # -------------------------------------------------------
-_ITERATIONS = 120_000
+_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "120000"))
+_DKLEN = 32
+
+# 로그인 검증 (verify_password_pooled)
+LOGIN_HASH_WORKERS = int(os.getenv("LOGIN_HASH_WORKERS", str(os.cpu_count() or 2)))
+LOGIN_VERIFY_CACHE_SIZE = int(os.getenv("LOGIN_VERIFY_CACHE_SIZE", "1024"))
+LOGIN_VERIFY_CACHE_TTL_SEC = float(os.getenv("LOGIN_VERIFY_CACHE_TTL_SEC", "600"))
 
 
 def hash_password(password: str) -> str:
@@ -22,7 +34,7 @@ def hash_password(password: str) -> str:
     """
     password = (password or "").encode("utf-8")
     salt = os.urandom(16)
-    dk = hashlib.pbkdf2_hmac("sha256", password, salt, _ITERATIONS, dklen=32)
+    dk = hashlib.pbkdf2_hmac("sha256", password, salt, _ITERATIONS, dklen=_DKLEN)
 
     salt_b64 = base64.b64encode(salt).decode("ascii")
     dk_b64 = base64.b64encode(dk).decode("ascii")
@@ -52,3 +64,97 @@ def verify_password(password: str, stored: str) -> bool:
         return hmac.compare_digest(dk, dk_expected)
     except Exception:
         return False
+
+
+def needs_rehash(stored: str) -> bool:
+    """저장된 해시가 현재 설정(_ITERATIONS, 길이)과 다르면 True (로그인 성공 시 다시 저장)"""
+    try:
+        algo, iters_s, _, dk_b64 = stored.split("$", 3)
+        return (
+            algo != "pbkdf2"
+            or int(iters_s) != _ITERATIONS
+            or len(base64.b64decode(dk_b64.encode("ascii"))) != _DKLEN
+        )
+    except Exception:
+        return True
+
+
+# -------------------------------------------------------
+# 로그인 검증 풀
+# - PBKDF2는 CPU를 오래 쓰므로 스크립트 스레드마다 바로 돌리지 않고
+#   LOGIN_HASH_WORKERS개 스레드 풀에서만 실행 (출근 시간 로그인이 몰려도 동시 계산은 풀 크기까지)
+#   hashlib.pbkdf2_hmac은 계산 중 GIL을 풀어서 다른 세션의 리런은 계속 진행됨
+# - 같은 (저장 해시, 비밀번호) 검증이 동시에 들어오면 계산 1번을 같이 기다림
+# - 성공한 검증만 LOGIN_VERIFY_CACHE_TTL_SEC 동안 기억 (실패는 기억하지 않아 대입 공격 비용은 그대로)
+#   키는 프로세스별 임의 비밀키로 만든 HMAC이라 메모리에 비밀번호가 남지 않음
+#   저장 해시가 바뀌면(비밀번호 변경) 키도 바뀌어 이전 결과는 쓰이지 않음
+# -------------------------------------------------------
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+_memo_secret = os.urandom(32)
+_verified: "OrderedDict[bytes, float]" = OrderedDict()   # 키 -> 검증 시각
+_inflight: Dict[bytes, Future] = {}
+_verify_lock = threading.Lock()
+
+
+def get_hash_pool() -> ThreadPoolExecutor:
+    """비밀번호 해시 계산용 스레드 풀 (프로세스 전역 1개)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=max(1, LOGIN_HASH_WORKERS), thread_name_prefix="pw-hash")
+    return _pool
+
+
+def _memo_key(password: str, stored: str) -> bytes:
+    msg = (stored or "").encode("utf-8") + b"\0" + (password or "").encode("utf-8")
+    return hmac.new(_memo_secret, msg, hashlib.sha256).digest()
+
+
+def verify_password_pooled(password: str, stored: str) -> bool:
+    """
+    verify_password를 해시 풀에서 실행 (최근 성공한 검증은 계산 생략)
+
+    Args:
+        password: 입력 비밀번호
+        stored: accounts.password_hash
+
+    Returns:
+        일치 여부
+    """
+    key = _memo_key(password, stored)
+    now = time.time()
+    with _verify_lock:
+        ts = _verified.get(key)
+        if ts is not None:
+            if now - ts < LOGIN_VERIFY_CACHE_TTL_SEC:
+                _verified.move_to_end(key)
+                return True
+            del _verified[key]
+
+        fut = _inflight.get(key)
+        owner = fut is None
+        if owner:
+            fut = get_hash_pool().submit(verify_password, password, stored)
+            _inflight[key] = fut
+
+    try:
+        ok = fut.result()
+    finally:
+        if owner:
+            with _verify_lock:
+                _inflight.pop(key, None)
+
+    if ok and owner and LOGIN_VERIFY_CACHE_SIZE > 0 and LOGIN_VERIFY_CACHE_TTL_SEC > 0:
+        with _verify_lock:
+            _verified[key] = time.time()
+            while len(_verified) > LOGIN_VERIFY_CACHE_SIZE:
+                _verified.popitem(last=False)
+    return ok
+
+
+def hash_password_async(password: str) -> Future:
+    """hash_password를 해시 풀에서 실행 (로그인 후 재해시 저장용)"""
+    return get_hash_pool().submit(hash_password, password)
@@ -0,0 +1,228 @@
+"""
+챗봇 로그 비동기 저장 (write-behind)
+
+답변 직후 chat_logs INSERT를 사용자 요청 안에서 하지 않고 메모리 큐에 넣어두면
+백그라운드 스레드가 모아서 한 번에(executemany) 저장한다.
+
+- 큐 크기 상한(CHAT_LOG_QUEUE_SIZE)이 있고, 가득 찼을 때의 처리는 CHAT_LOG_FULL_POLICY
+    block: CHAT_LOG_BLOCK_TIMEOUT초까지 빈 자리를 기다린 뒤, 그래도 없으면 직접 저장 (기본, 유실 없음)
+    sync : 기다리지 않고 바로 직접 저장
+    drop : 버리고 건수만 집계 (로그보다 응답 속도가 중요할 때)
+- CHAT_LOG_BATCH_SIZE건이 모이거나 CHAT_LOG_FLUSH_INTERVAL초가 지나면 저장
+- 프로세스 종료 시(atexit) 남은 로그를 모두 저장
+- CHAT_LOG_ASYNC=0 이면 기존처럼 요청 안에서 바로 저장
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.db import get_conn
+from core.keyword_stats import maybe_compact_keyword_counts, record_keyword_counts
+
+CHAT_LOG_ASYNC = os.getenv("CHAT_LOG_ASYNC", "1").lower() not in ("0", "false", "no")
+CHAT_LOG_QUEUE_SIZE = int(os.getenv("CHAT_LOG_QUEUE_SIZE", "1000"))
+CHAT_LOG_BATCH_SIZE = int(os.getenv("CHAT_LOG_BATCH_SIZE", "100"))
+CHAT_LOG_FLUSH_INTERVAL = float(os.getenv("CHAT_LOG_FLUSH_INTERVAL", "1"))
+CHAT_LOG_FULL_POLICY = os.getenv("CHAT_LOG_FULL_POLICY", "block").lower()
+CHAT_LOG_BLOCK_TIMEOUT = float(os.getenv("CHAT_LOG_BLOCK_TIMEOUT", "0.2"))
+
+# (user_id, user_query, bot_response, response_type, notice_refs, keywords, cached, created_at)
+ChatLogRow = Tuple[str, str, str, str, str, str, int, int]
+
+_INSERT_SQL = """
+    INSERT INTO chat_logs
+    (user_id, user_query, bot_response, response_type, notice_refs, keywords, cached, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def write_chat_logs(rows: Sequence[ChatLogRow]) -> None:
+    """chat_logs에 여러 건을 한 트랜잭션으로 저장 (키워드 집계 포함)"""
+    if not rows:
+        return
+    with get_conn() as conn:
+        conn.executemany(_INSERT_SQL, list(rows))
+        # 키워드 집계도 같은 트랜잭션에서 누적 (user_id, keywords, created_at)
+        record_keyword_counts(conn, [(r[0], r[5], r[7]) for r in rows])
+    maybe_compact_keyword_counts()
+
+
+class ChatLogSink:
+    """chat_logs 비동기 저장기 (프로세스 전역 1개, get_chat_log_sink로 사용)"""
+
+    def __init__(
+        self,
+        max_queue: int = CHAT_LOG_QUEUE_SIZE,
+        batch_size: int = CHAT_LOG_BATCH_SIZE,
+        flush_interval: float = CHAT_LOG_FLUSH_INTERVAL,
+        full_policy: str = CHAT_LOG_FULL_POLICY,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.01, flush_interval)
+        self.full_policy = full_policy if full_policy in ("block", "sync", "drop") else "block"
+        self._queue: "queue.Queue[ChatLogRow]" = queue.Queue(maxsize=max(1, max_queue))
+        self._stopped = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {"queued": 0, "written": 0, "batches": 0, "sync_writes": 0, "dropped": 0, "failed": 0}
+        self._thread = threading.Thread(target=self._run, name="chat-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, row: ChatLogRow) -> None:
+        """
+        로그 1건 등록 (저장은 백그라운드에서)
+
+        Args:
+            row: chat_logs 1행 (ChatLogRow 순서)
+        """
+        if self._stopped.is_set():
+            self._write_sync([row])
+            return
+        try:
+            if self.full_policy == "block":
+                self._queue.put(row, timeout=CHAT_LOG_BLOCK_TIMEOUT)
+            else:
+                self._queue.put_nowait(row)
+            self._count("queued")
+            return
+        except queue.Full:
+            pass
+
+        if self.full_policy == "drop":
+            self._count("dropped")
+            print("[chat_log] 로그 큐가 가득 차 1건을 버렸습니다.")
+            return
+        self._write_sync([row])
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        큐에 쌓인 로그가 모두 저장될 때까지 대기
+
+        Returns:
+            제한 시간 안에 모두 저장됐는지 여부
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline or not self._thread.is_alive():
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """남은 로그를 저장하고 저장 스레드 종료 (이후 submit은 바로 저장)"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._thread.join(timeout)
+        # 스레드가 제한 시간 안에 못 끝냈거나 이미 죽었으면 남은 건 여기서 저장
+        leftover = self._drain(self._queue.qsize())
+        if leftover:
+            self._write_sync(leftover)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            result = dict(self._stats)
+        result["pending"] = self._queue.qsize()
+        result["policy"] = self.full_policy
+        return result
+
+    # ----- 내부 -----
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stopped.is_set():
+                    return
+                continue
+
+            batch = [first]
+            # 모일 시간을 조금 주되, batch_size가 차면 바로 저장
+            deadline = time.monotonic() + (0 if self._stopped.is_set() else self.flush_interval)
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        batch.append(self._queue.get_nowait())
+                    else:
+                        batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _drain(self, limit: int) -> List[ChatLogRow]:
+        rows = []
+        for _ in range(limit):
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            self._queue.task_done()
+        return rows
+
+    def _write_batch(self, batch: List[ChatLogRow]) -> None:
+        for attempt in (1, 2):
+            try:
+                write_chat_logs(batch)
+                self._count("written", len(batch))
+                self._count("batches")
+                return
+            except Exception as e:
+                if attempt == 1:
+                    print(f"[chat_log] 로그 {len(batch)}건 저장 실패, 재시도: {e}")
+                    time.sleep(1.0)
+                else:
+                    self._count("failed", len(batch))
+                    print(f"[chat_log] 로그 {len(batch)}건 저장 실패, 버림: {e}")
+
+    def _write_sync(self, rows: List[ChatLogRow]) -> None:
+        try:
+            write_chat_logs(rows)
+            self._count("written", len(rows))
+            self._count("sync_writes")
+        except Exception as e:
+            self._count("failed", len(rows))
+            print(f"[chat_log] 로그 저장 실패: {e}")
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += n
+
+
+_sink: Optional[ChatLogSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_chat_log_sink() -> ChatLogSink:
+    """프로세스 전역 로그 저장기 (처음 호출 시 저장 스레드 시작, 종료 시 자동 flush)"""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = ChatLogSink()
+                atexit.register(_sink.stop)
+    return _sink
+
+
+def submit_chat_log(row: ChatLogRow) -> None:
+    """
+    챗봇 로그 저장 요청
+
+    CHAT_LOG_ASYNC가 켜져 있으면 큐에 넣고 바로 반환, 아니면 바로 저장
+    """
+    if CHAT_LOG_ASYNC:
+        get_chat_log_sink().submit(row)
+    else:
+        write_chat_logs([row])
+
+
+def flush_chat_logs(timeout: float = 10.0) -> bool:
+    """대기 중인 로그 저장 대기 (관리자 통계 조회 직전 등 최신 로그가 필요할 때)"""
+    if not CHAT_LOG_ASYNC or _sink is None:
+        return True
+    return _sink.flush(timeout)
@@ -6,9 +6,14 @@ import requests
 import json
 import os
 import time
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from dotenv import load_dotenv
 from core.db import get_conn
+from core.notice_index import get_notice_index, context_cost
+from core.search import search_notices
+from core.llm_client import chunk_text, get_llm_client, LLMBusyError, LLMUnavailableError
+from core.answer_cache import ANSWER_CACHE_ENABLED, answer_cache_key, get_answer_cache
+from core.chat_log_sink import submit_chat_log
 
 # .env 파일 로드
 load_dotenv()
@@ -18,6 +23,16 @@ POTENS_API_KEY = os.getenv("POTENS_API_KEY", "")
 POTENS_API_URL = os.getenv("POTENS_API_URL", "https://ai.potens.ai/api/chat")
 RESPONSE_TIMEOUT = float(os.getenv("RESPONSE_TIMEOUT", "30"))
 
+# 컨텍스트 공지 선택 (BM25 검색 상위 k개, 공지 블록 문자 수 합계 상한)
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "8"))
+RETRIEVAL_CHAR_BUDGET = int(os.getenv("RETRIEVAL_CHAR_BUDGET", "6000"))
+# "최근 공지 알려줘" 같은 질문도 답할 수 있도록 최신 공지를 몇 건 함께 넣음
+RETRIEVAL_RECENT_FILL = int(os.getenv("RETRIEVAL_RECENT_FILL", "3"))
+
+# 비정상 응답 태그 (TYPE:MISSING / TYPE:IRRELEVANT)
+_TYPE_TAG = "TYPE:"
+_MISSING_TAG = "TYPE:MISSING "
+
 # PostgreSQL 사용 여부
 USE_POSTGRES = bool(os.getenv("DATABASE_URL"))
 
@@ -27,7 +42,7 @@ class ChatbotEngine:
     노티가드 챗봇 엔진 (통합 버전)
 
     Features:
-    - 최신 공지사항 기반 질의응답
+    - 질문 관련 공지(BM25 검색) 기반 질의응답
     - POTENS.ai API 연동
     - 응답 타입 분류 (NORMAL/MISSING/IRRELEVANT)
     - 채팅 로그 저장
@@ -42,6 +57,7 @@ class ChatbotEngine:
         self.user_id = user_id
         self.api_key = POTENS_API_KEY
         self.api_url = POTENS_API_URL
+        self.last_result: Optional[Dict] = None  # ask_stream 최종 결과
 
     def ask(self, user_query: str) -> Dict:
         """
@@ -55,17 +71,110 @@ class ChatbotEngine:
                 "response": "챗봇 답변",
                 "response_type": "NORMAL" | "MISSING" | "IRRELEVANT",
                 "notice_refs": [공지 ID 리스트],
-                "keywords": [추출된 키워드]
+                "keywords": [추출된 키워드],
+                "cached": 답변 캐시 재사용 여부
             }
         """
-        # 1. 최근 공지 조회 (기본값 50개)
-        recent_notices = self._get_recent_notices()
+        prepared = self._prepare_answer(user_query)
+        if "result" in prepared:
+            return prepared["result"]
+
+        # 5. POTENS API 호출
+        response_text = self._call_potens_api(prepared["prompt"])
+
+        return self._finish_answer(user_query, prepared, response_text)
+
+    def ask_stream(self, user_query: str) -> Iterator[str]:
+        """
+        사용자 질문 처리 (스트리밍)
+
+        답변 조각을 받는 대로 내보내고, 응답 타입 분류/참조 공지 추출/로그 저장/캐시 저장은
+        스트림이 끝난 뒤 ask()와 같은 방식으로 처리한다.
+        최종 결과(ask()와 같은 dict)는 스트림 소비가 끝나면 self.last_result에 들어간다.
+
+        - "TYPE:"으로 시작하는 응답(MISSING/IRRELEVANT)은 태그를 보여주지 않도록
+          끝까지 모은 뒤 정리된 답변을 한 번에 내보냄
+        - 캐시 적중이나 업스트림 스트리밍 미지원 시에는 완성된 답변을 잘게 나눠 전달
+
+        Args:
+            user_query: 사용자 질문
+
+        Yields:
+            화면에 이어 붙일 답변 조각
+        """
+        self.last_result = None
+        prepared = self._prepare_answer(user_query)
+        if "result" in prepared:
+            self.last_result = prepared["result"]
+            yield from chunk_text(prepared["result"]["response"])
+            return
+
+        parts = []
+        head = ""          # 응답 앞부분 (TYPE: 태그 판정 전까지 보류)
+        show_live = None   # None: 판정 전, True: 바로 표시, False: 끝까지 모음
+        for piece in self._stream_potens_api(prepared["prompt"]):
+            parts.append(piece)
+            if show_live is None:
+                head += piece
+                if len(head.lstrip()) < len(_TYPE_TAG):
+                    continue
+                show_live = not head.lstrip().startswith(_TYPE_TAG)
+                if show_live:
+                    yield head
+            elif show_live:
+                yield piece.replace(_MISSING_TAG, "⚠️ ")
+
+        response_text = "".join(parts).strip()
+        if show_live is None:
+            show_live = not response_text.startswith(_TYPE_TAG)
+            if show_live and head:
+                yield head
+
+        result = self._finish_answer(user_query, prepared, response_text)
+        if show_live and result["response_type"] == "MISSING":
+            # 답변 도중 끊긴 경우: 받은 부분 + 오류 안내를 그대로 남김
+            result["response"] = result["response"].replace(_MISSING_TAG, "⚠️ ")
+        self.last_result = result
+        if not show_live:
+            yield result["response"]
+
+    def _prepare_answer(self, user_query: str) -> Dict:
+        """
+        답변 생성 준비 (ask/ask_stream 공통 1~4단계)
+
+        Returns:
+            캐시 적중: {"result": 캐시된 결과}
+            그 외: {"keywords", "context_notices", "cache_key", "prompt"}
+        """
+        # 1. 질문 관련 공지 선택 (키워드 기준 BM25 검색 + 최신 공지 일부)
+        keywords = self._extract_keywords(user_query)
+        context_notices = self._retrieve_notices(user_query, keywords)
+
+        # 1-1. 같은 키워드 + 같은 공지 집합으로 답한 적이 있으면 재사용
+        #      (관리자 답변은 키워드 통계가 들어가므로 캐시하지 않음)
+        is_admin = (self.user_id == "admin")
+        cache_key = None
+        if ANSWER_CACHE_ENABLED and not is_admin:
+            cache_key = answer_cache_key(keywords, context_notices)
+            cached = get_answer_cache().get(cache_key) if cache_key else None
+            if cached:
+                result = cached["result"]
+                self._save_chat_log(
+                    user_query,
+                    cached["raw_response"],
+                    result["response_type"],
+                    result["notice_refs"],
+                    keywords,
+                    cached=True,
+                )
+                result["keywords"] = keywords
+                result["cached"] = True
+                return {"result": result}
 
         # 2. 컨텍스트 구성
-        context = self._build_context(recent_notices)
+        context = self._build_context(context_notices)
 
         # 3. 관리자인 경우 키워드 통계 추가
-        is_admin = (self.user_id == "admin")
         keyword_stats_text = ""
         
         if is_admin:
@@ -97,22 +206,39 @@ class ChatbotEngine:
         # 4. 프롬프트 생성 (관리자면 키워드 통계 포함)
         prompt = self._build_prompt(user_query, context, keyword_stats_text if is_admin else "")
 
-        # 5. POTENS API 호출
-        response_text = self._call_potens_api(prompt)
+        return {
+            "keywords": keywords,
+            "context_notices": context_notices,
+            "cache_key": cache_key,
+            "prompt": prompt,
+        }
+
+    def _finish_answer(self, user_query: str, prepared: Dict, response_text: str) -> Dict:
+        """
+        답변 후처리 (ask/ask_stream 공통 6~10단계)
+
+        Args:
+            user_query: 사용자 질문
+            prepared: _prepare_answer 결과
+            response_text: POTENS 응답 원문
+
+        Returns:
+            ask()와 같은 결과 dict
+        """
+        keywords = prepared["keywords"]
+        context_notices = prepared["context_notices"]
+        cache_key = prepared["cache_key"]
 
         # 6. 응답 타입 분류
         response_type = self._detect_response_type(response_text)
 
         # 7. 참조 공지 추출 (LLM 답변 내 [제목] 등 매칭)
-        notice_refs = self._extract_notice_refs(response_text, recent_notices)
+        notice_refs = self._extract_notice_refs(response_text, context_notices)
         
         # 추가 공지 풀 (검색 결과 저장용)
         extra_notices = []
 
-        # 7-1. 키워드 추출
-        keywords = self._extract_keywords(user_query)
-
-        # 7-2. 만약 참조된 공지가 없다면, 키워드 검색으로 보완
+        # 7-1. 만약 참조된 공지가 없다면, 키워드 검색으로 보완
         if not notice_refs and response_type == "NORMAL":
             # 가장 긴 키워드 우선 사용 (구체적일 확률 높음)
             search_keywords = sorted(keywords, key=len, reverse=True)
@@ -128,8 +254,8 @@ class ChatbotEngine:
                         break
         
         # 8. 참조 공지 상세 정보 생성 (ID + 제목)
-        # recent_notices와 extra_notices를 합쳐서 조회
-        all_pool = recent_notices + extra_notices
+        # context_notices와 extra_notices를 합쳐서 조회
+        all_pool = context_notices + extra_notices
         # 중복 제거 (딕셔너리는 해시 불가능하므로 post_id 기준)
         seen_ids = set()
         unique_pool = []
@@ -156,14 +282,55 @@ class ChatbotEngine:
             keywords
         )
 
-        return {
+        result = {
             "response": self._clean_response(response_text),
             "response_type": response_type,
             "notice_refs": notice_refs,
             "notice_details": notice_details,  # 제목 포함 상세 정보 추가
-            "keywords": keywords
+            "keywords": keywords,
+            "cached": False,
         }
 
+        # 10. 답변 캐시 저장 (API 오류 등 MISSING 응답은 저장하지 않음)
+        if cache_key and response_type != "MISSING":
+            get_answer_cache().put(
+                cache_key,
+                {"result": result, "raw_response": response_text},
+                [n["post_id"] for n in context_notices] + list(notice_refs),
+            )
+
+        return result
+
+    def _retrieve_notices(self, user_query: str, keywords: List[str]) -> List[Dict]:
+        """
+        컨텍스트에 넣을 공지 선택
+
+        Args:
+            user_query: 사용자 질문
+            keywords: 불용어를 제거한 키워드 (없으면 질문 원문으로 검색)
+
+        Returns:
+            관련 공지 + 최신 공지 (RETRIEVAL_TOP_K개, RETRIEVAL_CHAR_BUDGET자 이내)
+        """
+        try:
+            index = get_notice_index()
+            query = " ".join(keywords) if keywords else user_query
+            notices = index.search(query, k=RETRIEVAL_TOP_K, char_budget=RETRIEVAL_CHAR_BUDGET)
+
+            used = sum(context_cost(n) for n in notices)
+            fill = min(RETRIEVAL_RECENT_FILL, RETRIEVAL_TOP_K - len(notices))
+            if fill > 0:
+                notices += index.recent(
+                    k=fill,
+                    char_budget=RETRIEVAL_CHAR_BUDGET - used,
+                    exclude=[n["post_id"] for n in notices],
+                )
+            return notices
+        except Exception as e:
+            # 인덱스 문제로 답변이 막히지 않도록 기존 방식(최근 공지)으로 대체
+            print(f"[ChatbotEngine] 공지 검색 인덱스 오류, 최근 공지로 대체: {e}")
+            return self._get_recent_notices()
+
     def _get_recent_notices(self, limit: int = 30) -> List[Dict]:
         """
         최근 공지 조회 (통합 DB)
@@ -482,31 +649,13 @@ class ChatbotEngine:
         if not self.api_key:
             return "TYPE:MISSING POTENS API 키가 설정되지 않았습니다. 관리자에게 문의하세요."
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {"prompt": prompt}
-
         try:
-            response = requests.post(
-                self.api_url,
-                json=payload,
-                headers=headers,
-                timeout=RESPONSE_TIMEOUT
-            )
-            response.raise_for_status()
-            result = response.json()
-
-            # 응답 파싱 (여러 형식 지원)
-            return (
-                result.get("response") or
-                result.get("answer") or
-                result.get("text") or
-                result.get("message") or
-                result.get("content") or
-                str(result)
-            ).strip()
+            # 공용 클라이언트: 연결 재사용 + 재시도 + 동시 호출 제한 + 서킷 브레이커
+            return get_llm_client().complete(prompt, kind="chat", timeout=RESPONSE_TIMEOUT)
+        except LLMUnavailableError as e:
+            return f"TYPE:MISSING {e}"
+        except LLMBusyError as e:
+            return f"TYPE:MISSING {e}"
         except requests.exceptions.Timeout:
             return "TYPE:MISSING API 요청 시간이 초과되었습니다. 다시 시도해주세요."
         except requests.exceptions.RequestException as e:
@@ -514,6 +663,37 @@ class ChatbotEngine:
         except Exception as e:
             return f"TYPE:MISSING 오류 발생: {str(e)}"
     
+    def _stream_potens_api(self, prompt: str) -> Iterator[str]:
+        """
+        POTENS API 스트리밍 호출 (오류는 _call_potens_api와 같은 TYPE:MISSING 문구로 변환)
+
+        Args:
+            prompt: 프롬프트
+
+        Yields:
+            API 응답 텍스트 조각
+        """
+        if not self.api_key:
+            yield "TYPE:MISSING POTENS API 키가 설정되지 않았습니다. 관리자에게 문의하세요."
+            return
+
+        received = False
+        try:
+            for piece in get_llm_client().stream(prompt, kind="chat", timeout=RESPONSE_TIMEOUT):
+                received = True
+                yield piece
+        except Exception as e:
+            if isinstance(e, (LLMUnavailableError, LLMBusyError)):
+                message = str(e)
+            elif isinstance(e, requests.exceptions.Timeout):
+                message = "API 요청 시간이 초과되었습니다. 다시 시도해주세요."
+            elif isinstance(e, requests.exceptions.RequestException):
+                message = f"API 호출 실패: {str(e)}"
+            else:
+                message = f"오류 발생: {str(e)}"
+            # 일부를 이미 보여줬으면 줄을 바꿔 덧붙임 (응답 타입은 MISSING으로 분류됨)
+            yield f"\n\nTYPE:MISSING {message}" if received else f"TYPE:MISSING {message}"
+
     def _detect_response_type(self, response: str) -> str:
         """
         응답 타입 분류
@@ -643,7 +823,8 @@ class ChatbotEngine:
         response: str,
         response_type: str,
         refs: List[int],
-        keywords: List[str]
+        keywords: List[str],
+        cached: bool = False
     ):
         """
         채팅 로그 저장
@@ -654,42 +835,21 @@ class ChatbotEngine:
             response_type: 응답 타입
             refs: 참조 공지 ID
             keywords: 키워드
+            cached: 답변 캐시에서 재사용한 응답인지 여부
         """
         created_at = int(time.time() * 1000)
 
-        with get_conn() as conn:
-            if USE_POSTGRES:
-                # PostgreSQL
-                cur = conn.cursor()
-                cur.execute("""
-                    INSERT INTO chat_logs
-                    (user_id, user_query, bot_response, response_type, notice_refs, keywords, created_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    self.user_id,
-                    query,
-                    response,
-                    response_type,
-                    json.dumps(refs),
-                    json.dumps(keywords, ensure_ascii=False),
-                    created_at
-                ))
-                conn.commit()
-            else:
-                # SQLite
-                conn.execute("""
-                    INSERT INTO chat_logs
-                    (user_id, user_query, bot_response, response_type, notice_refs, keywords, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    self.user_id,
-                    query,
-                    response,
-                    response_type,
-                    json.dumps(refs),
-                    json.dumps(keywords, ensure_ascii=False),
-                    created_at
-                ))
+        # 답변 지연에 포함되지 않도록 백그라운드 저장기에 넘김 (core/chat_log_sink.py)
+        submit_chat_log((
+            self.user_id,
+            query,
+            response,
+            response_type,
+            json.dumps(refs),
+            json.dumps(keywords, ensure_ascii=False),
+            1 if cached else 0,
+            created_at,
+        ))
 
     # ===== 팝업 연동 기능 =====
 
@@ -718,50 +878,16 @@ class ChatbotEngine:
 
     def search_notices(self, keyword: str, limit: int = 20) -> List[Dict]:
         """
-        키워드로 공지 검색
+        키워드로 공지 검색 (전문 검색 인덱스 사용, core.search 참고)
 
         Args:
             keyword: 검색 키워드
             limit: 최대 결과 수 (기본값 20개로 증가)
 
         Returns:
-            검색된 공지 리스트 (날짜 기준 내림차순)
+            검색된 공지 리스트 (관련도 순, 같으면 최신순)
         """
-        with get_conn() as conn:
-            if USE_POSTGRES:
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT post_id, title, content, department, date, type
-                    FROM notices
-                    WHERE title LIKE %s OR content LIKE %s OR department LIKE %s
-                    ORDER BY
-                        CASE
-                            WHEN date IS NOT NULL THEN date::date
-                            ELSE to_timestamp(created_at / 1000)::date
-                        END DESC,
-                        post_id DESC
-                    LIMIT %s
-                """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", limit))
-                rows = cur.fetchall()
-                # RealDictCursor는 이미 dict-like 객체를 반환
-                return [dict(row) for row in rows]
-            else:
-                cur = conn.execute("""
-                    SELECT post_id, title, content,
-                           COALESCE(department, '전체') as department,
-                           COALESCE(date, strftime('%Y-%m-%d', created_at/1000, 'unixepoch')) as date,
-                           type
-                    FROM notices
-                    WHERE title LIKE ? OR content LIKE ? OR department LIKE ?
-                    ORDER BY
-                        CASE
-                            WHEN date IS NOT NULL THEN date
-                            ELSE strftime('%Y-%m-%d', created_at/1000, 'unixepoch')
-                        END DESC,
-                        post_id DESC
-                    LIMIT ?
-                """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", limit))
-                return [dict(r) for r in cur.fetchall()]
+        return search_notices(keyword, limit)
 
     def summarize_query(self, user_query: str) -> str:
         """
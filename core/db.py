@@ -1,8 +1,11 @@
 # STREAMLIT/core/db.py
 import os
 import sqlite3
+import threading
+import time
 from pathlib import Path
 from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
 
 from core.auth import hash_password
 
@@ -13,6 +16,17 @@ DATABASE_URL = os.getenv("DATABASE_URL", "")
 # PostgreSQL 사용 여부 (Railway 환경 감지)
 USE_POSTGRES = bool(DATABASE_URL)
 
+# 공지 검색 대상 식 (PostgreSQL trigram 인덱스와 검색 쿼리가 같은 식을 써야 인덱스를 탐)
+NOTICES_SEARCH_EXPR = "title || ' ' || content || ' ' || COALESCE(department, '')"
+
+# 커넥션 풀 설정
+# - DB_POOL_ENABLED=0 이면 기존처럼 get_conn() 호출마다 새 연결을 열고 닫음
+DB_POOL_ENABLED = os.getenv("DB_POOL_ENABLED", "1").lower() not in ("0", "false", "no")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))                                   # 풀당 최대 연결 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))                          # 체크아웃 대기 한도(초)
+DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300"))               # 유휴 연결 정리 기준(초)
+DB_POOL_HEALTHCHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTHCHECK_INTERVAL", "30"))  # 재사용 전 ping 기준(초)
+
 if USE_POSTGRES:
     import psycopg2
     from psycopg2.extras import RealDictCursor
@@ -41,6 +55,15 @@ class PostgresConnectionWrapper:
             self._cursor.execute(pg_sql)
         return self._cursor
 
+    def executemany(self, sql, seq_of_params):
+        """SQLite-style executemany (플레이스홀더 자동 변환)"""
+        if self._cursor is None:
+            self._cursor = self._conn.cursor(cursor_factory=RealDictCursor)
+
+        pg_sql = sql.replace('?', '%s')
+        self._cursor.executemany(pg_sql, seq_of_params)
+        return self._cursor
+
     def cursor(self, cursor_factory=None):
         """Create a new cursor (for direct cursor usage)"""
         if cursor_factory:
@@ -53,9 +76,17 @@ class PostgresConnectionWrapper:
     def rollback(self):
         return self._conn.rollback()
 
+    def release_cursor(self):
+        """공용 커서만 닫고 실제 연결은 유지 (풀 반납용)"""
+        if self._cursor is not None:
+            try:
+                self._cursor.close()
+            except Exception:
+                pass
+            self._cursor = None
+
     def close(self):
-        if self._cursor:
-            self._cursor.close()
+        self.release_cursor()
         return self._conn.close()
 
     def __enter__(self):
@@ -67,51 +98,330 @@ class PostgresConnectionWrapper:
         return False
 
 
-@contextmanager
-def get_conn():
+class ConnectionPool:
     """
-    환경에 따라 SQLite 또는 PostgreSQL 연결 반환
+    스레드 안전한 고정 크기 커넥션 풀
 
-    - 로컬 개발: SQLite (groupware.db)
-    - Railway 배포: PostgreSQL (DATABASE_URL)
+    - 최대 max_size개까지만 연결을 만들고, 모두 사용 중이면 timeout초까지 대기
+    - 반납된 연결은 LIFO로 재사용 (가장 최근에 쓴 연결이 살아있을 확률이 높음)
+    - idle_timeout초 이상 놀고 있던 연결은 체크아웃 시점에 정리
+    - healthcheck_interval초 이상 놀았던 연결은 내주기 전에 ping으로 확인
     """
-    conn = None
-    is_postgres = False
 
+    def __init__(
+        self,
+        name: str,
+        factory: Callable,
+        ping: Callable,
+        max_size: int = DB_POOL_SIZE,
+        timeout: float = DB_POOL_TIMEOUT,
+        idle_timeout: float = DB_POOL_IDLE_TIMEOUT,
+        healthcheck_interval: float = DB_POOL_HEALTHCHECK_INTERVAL,
+    ):
+        self.name = name
+        self.max_size = max(1, int(max_size))
+        self.timeout = float(timeout)
+        self.idle_timeout = float(idle_timeout)
+        self.healthcheck_interval = float(healthcheck_interval)
+
+        self._factory = factory
+        self._ping = ping
+        self._idle: List[Tuple[object, float]] = []  # [(conn, 마지막 반납 시각)]
+        self._total = 0                              # 생성되어 살아있는 연결 수 (대여 중 + 유휴)
+        self._cond = threading.Condition()
+
+        # 모니터링용 카운터
+        self._stats = {
+            "created": 0,
+            "checkouts": 0,
+            "timeouts": 0,
+            "evicted_idle": 0,
+            "health_failures": 0,
+            "discarded": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    def acquire(self):
+        """연결 대여 (필요 시 생성 / 대기)"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while True:
+            conn, last_used = self._reserve(deadline)
+
+            if conn is None:
+                # 빈 슬롯을 예약했으므로 락 밖에서 새 연결 생성
+                try:
+                    conn = self._factory()
+                except Exception:
+                    self._forget()
+                    raise
+                with self._cond:
+                    self._stats["created"] += 1
+            elif time.monotonic() - last_used >= self.healthcheck_interval and not self._is_alive(conn):
+                with self._cond:
+                    self._stats["health_failures"] += 1
+                self._close_quietly(conn)
+                self._forget()
+                continue
+
+            waited_ms = (time.monotonic() - started) * 1000
+            with self._cond:
+                self._stats["checkouts"] += 1
+                self._stats["wait_ms_total"] += waited_ms
+                if waited_ms > self._stats["wait_ms_max"]:
+                    self._stats["wait_ms_max"] = waited_ms
+            return conn
+
+    def release(self, conn, discard: bool = False):
+        """연결 반납 (discard=True면 닫고 버림)"""
+        if discard:
+            with self._cond:
+                self._stats["discarded"] += 1
+            self._close_quietly(conn)
+            self._forget()
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close_all(self):
+        """유휴 연결 모두 닫기 (대여 중인 연결은 반납 시 다시 풀에 들어감)"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            result = dict(self._stats)
+            result["name"] = self.name
+            result["max_size"] = self.max_size
+            result["idle"] = len(self._idle)
+            result["in_use"] = self._total - len(self._idle)
+            checkouts = result["checkouts"]
+            result["wait_ms_avg"] = (result["wait_ms_total"] / checkouts) if checkouts else 0.0
+            return result
+
+    # ----- 내부 -----
+    def _reserve(self, deadline: float):
+        """
+        유휴 연결 하나를 꺼내거나 새 연결 슬롯을 예약
+
+        Returns:
+            (conn, last_used) - 유휴 연결 재사용
+            (None, None)      - 새 연결을 만들어도 되는 슬롯 확보
+        """
+        with self._cond:
+            while True:
+                self._evict_idle_locked()
+
+                if self._idle:
+                    return self._idle.pop()
+
+                if self._total < self.max_size:
+                    self._total += 1
+                    return None, None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise TimeoutError(
+                        f"[{self.name}] DB 커넥션 풀 대기 시간 초과 ({self.timeout}s, size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+    def _evict_idle_locked(self):
+        if not self._idle or self.idle_timeout <= 0:
+            return
+        now = time.monotonic()
+        keep = []
+        for conn, last_used in self._idle:
+            if now - last_used >= self.idle_timeout:
+                self._close_quietly(conn)
+                self._total -= 1
+                self._stats["evicted_idle"] += 1
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+
+    def _forget(self):
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def _is_alive(self, conn) -> bool:
+        try:
+            return bool(self._ping(conn))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+# -------------------------
+# 연결 생성 / 헬스체크
+# -------------------------
+_pg_connect_kwargs: Optional[Dict] = None
+
+
+def _connect_postgres():
+    """DATABASE_URL로 psycopg2 연결 생성 (URL 파싱은 최초 1회만)"""
+    global _pg_connect_kwargs
+    if _pg_connect_kwargs is None:
+        url = urlparse.urlparse(DATABASE_URL)
+        _pg_connect_kwargs = {
+            "database": url.path[1:],
+            "user": url.username,
+            "password": url.password,
+            "host": url.hostname,
+            "port": url.port,
+        }
+    return psycopg2.connect(**_pg_connect_kwargs)
+
+
+def _connect_sqlite(check_same_thread: bool = True):
+    conn = sqlite3.connect(DB_PATH, check_same_thread=check_same_thread)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _ping_postgres(conn) -> bool:
+    if conn.closed:
+        return False
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT 1")
+        cur.fetchone()
+    finally:
+        cur.close()
+    conn.rollback()
+    return True
+
+
+def _ping_sqlite(conn) -> bool:
+    conn.execute("SELECT 1").fetchone()
+    return True
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(kind: str) -> ConnectionPool:
+    pool = _pools.get(kind)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(kind)
+        if pool is None:
+            if kind == "postgres":
+                pool = ConnectionPool("postgres", _connect_postgres, _ping_postgres)
+            else:
+                # 풀링된 연결은 여러 스크립트 스레드를 오가므로 check_same_thread 해제
+                # (한 시점에는 한 스레드만 사용하도록 풀이 보장)
+                pool = ConnectionPool("sqlite", lambda: _connect_sqlite(check_same_thread=False), _ping_sqlite)
+            _pools[kind] = pool
+    return pool
+
+
+def get_pool_stats() -> Dict[str, Dict]:
+    """
+    커넥션 풀 상태/카운터 조회 (모니터링용)
+
+    Returns:
+        {"postgres": {...}, "sqlite": {...}} - 생성된 풀만 포함
+        각 항목: max_size, idle, in_use, created, checkouts, timeouts,
+                evicted_idle, health_failures, discarded,
+                wait_ms_total, wait_ms_avg, wait_ms_max
+    """
+    return {kind: pool.stats() for kind, pool in list(_pools.items())}
+
+
+def close_pools():
+    """모든 풀의 유휴 연결 정리 (테스트/종료 시)"""
+    for pool in list(_pools.values()):
+        pool.close_all()
+
+
+def _checkout():
+    """
+    연결 대여
+
+    Returns:
+        (conn, pool) - pool이 None이면 사용 후 직접 close
+    """
     if USE_POSTGRES:
         # PostgreSQL 연결 시도 (Railway)
         try:
-            url = urlparse.urlparse(DATABASE_URL)
-            pg_conn = psycopg2.connect(
-                database=url.path[1:],
-                user=url.username,
-                password=url.password,
-                host=url.hostname,
-                port=url.port
-            )
-            # Wrap PostgreSQL connection to support SQLite-style execute()
-            conn = PostgresConnectionWrapper(pg_conn)
-            is_postgres = True
+            if DB_POOL_ENABLED:
+                pool = _get_pool("postgres")
+                # Wrap PostgreSQL connection to support SQLite-style execute()
+                return PostgresConnectionWrapper(pool.acquire()), pool
+            return PostgresConnectionWrapper(_connect_postgres()), None
+        except TimeoutError:
+            # 풀이 가득 찬 것은 DB 장애가 아니므로 SQLite로 폴백하지 않음
+            raise
         except Exception as e:
             print(f"PostgreSQL 연결 실패: {e}")
             print("SQLite로 폴백합니다...")
-            conn = None
 
-    # PostgreSQL 연결 실패 시 SQLite 사용
-    if conn is None:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        is_postgres = False
+    # PostgreSQL 미사용 또는 연결 실패 시 SQLite 사용
+    if DB_POOL_ENABLED:
+        pool = _get_pool("sqlite")
+        return pool.acquire(), pool
+    return _connect_sqlite(), None
+
+
+def _checkin(conn, pool: Optional[ConnectionPool], broken: bool):
+    if pool is None:
+        conn.close()
+        return
+
+    if isinstance(conn, PostgresConnectionWrapper):
+        conn.release_cursor()
+        raw = conn._conn
+        pool.release(raw, discard=broken or bool(raw.closed))
+    else:
+        pool.release(conn, discard=broken)
+
+
+@contextmanager
+def get_conn():
+    """
+    환경에 따라 SQLite 또는 PostgreSQL 연결 반환
+
+    - 로컬 개발: SQLite (groupware.db)
+    - Railway 배포: PostgreSQL (DATABASE_URL)
+    - DB_POOL_ENABLED(기본값 1)이면 커넥션 풀에서 대여/반납
+    """
+    conn, pool = _checkout()
+    broken = False
 
     # 공통 컨텍스트 매니저 로직
     try:
         yield conn
         conn.commit()
-    except Exception:
-        conn.rollback()
+    except BaseException:
+        # st.rerun()/st.stop() 같은 BaseException도 롤백 후 반납해야 트랜잭션이 남지 않음
+        try:
+            conn.rollback()
+        except Exception:
+            # 롤백조차 실패한 연결은 재사용하지 않음
+            broken = True
         raise
     finally:
-        conn.close()
+        _checkin(conn, pool, broken)
 
 
 def init_db():
@@ -128,6 +438,13 @@ def init_db():
         # SQLite 초기화
         _init_sqlite()
 
+    # CSV 대상만 있는 기존 팝업을 정규화 테이블(popup_targets/popup_deliveries)로 이관
+    try:
+        import service
+        service.backfill_popup_deliveries()
+    except Exception as e:
+        print(f"⚠️ 팝업 수신자 이관 실패 (무시됨): {e}")
+
 
 def _init_sqlite():
     """SQLite 초기화"""
@@ -150,6 +467,15 @@ def _init_sqlite():
         # 3) notices 테이블에 department, date 컬럼 추가 (챗봇 통합용)
         _add_notices_columns_sqlite(conn)
 
+        # 3-1) notice_files 이미지 축소본 / 내용 해시 컬럼
+        _add_notice_files_columns_sqlite(conn)
+
+        # 3-2) summary_jobs 실행 번호 컬럼
+        _add_summary_jobs_columns_sqlite(conn)
+
+        # 3-3) 공지 전문 검색 인덱스 (FTS5 trigram + 동기화 트리거)
+        _init_notices_fts_sqlite(conn)
+
         # 4) employees 더미 데이터
         cur = conn.execute("SELECT COUNT(1) AS cnt FROM employees")
         cnt_emp = int(cur.fetchone()["cnt"])
@@ -235,6 +561,7 @@ def _add_chat_logs_table_sqlite(conn):
                 summary TEXT,
                 keywords TEXT,
                 notice_refs TEXT,
+                cached INTEGER NOT NULL DEFAULT 0,
                 created_at INTEGER NOT NULL
             )
         """)
@@ -245,6 +572,27 @@ def _add_chat_logs_table_sqlite(conn):
             CREATE INDEX idx_chat_logs_created ON chat_logs(created_at)
         """)
         print("✅ chat_logs 테이블 생성 완료")
+    else:
+        cur = conn.execute("PRAGMA table_info(chat_logs)")
+        cols = [row["name"] for row in cur.fetchall()]
+        if "cached" not in cols:
+            conn.execute("ALTER TABLE chat_logs ADD COLUMN cached INTEGER NOT NULL DEFAULT 0")
+            print("✅ chat_logs.cached 컬럼 추가 완료")
+
+    # chat_keyword_counts 테이블 추가 (키워드 통계 사전 집계)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS chat_keyword_counts (
+            bucket_start INTEGER NOT NULL,
+            granularity TEXT NOT NULL CHECK(granularity IN ('H','D')),
+            team TEXT NOT NULL,
+            department TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            cnt INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (bucket_start, granularity, team, department, keyword)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_keyword_counts_team ON chat_keyword_counts(team, bucket_start)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_keyword_counts_dept ON chat_keyword_counts(department, bucket_start)")
 
     # chat_sessions 테이블 추가 (대화 세션 관리용)
     cur = conn.execute("""
@@ -258,7 +606,8 @@ def _add_chat_logs_table_sqlite(conn):
                 user_id TEXT NOT NULL,
                 name TEXT NOT NULL,
                 created_at INTEGER NOT NULL,
-                updated_at INTEGER NOT NULL
+                updated_at INTEGER NOT NULL,
+                message_count INTEGER NOT NULL DEFAULT 0
             )
         """)
         conn.execute("""
@@ -289,6 +638,21 @@ def _add_chat_logs_table_sqlite(conn):
         """)
         print("✅ chat_messages 테이블 생성 완료")
 
+    # chat_sessions.message_count (사이드바 메시지 수 표시용, 메시지 추가 시 +1)
+    cur = conn.execute("PRAGMA table_info(chat_sessions)")
+    cols = [row["name"] for row in cur.fetchall()]
+    if "message_count" not in cols:
+        conn.execute("ALTER TABLE chat_sessions ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
+        conn.execute("""
+            UPDATE chat_sessions
+            SET message_count = (SELECT COUNT(1) FROM chat_messages m WHERE m.session_id = chat_sessions.session_id)
+        """)
+        print("✅ chat_sessions.message_count 컬럼 추가 완료")
+
+    # 세션 목록 / 메시지 keyset 페이지네이션용
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_updated ON chat_sessions(user_id, updated_at, session_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages(session_id, id)")
+
 
 def _add_notices_columns_sqlite(conn):
     """SQLite notices 테이블에 department, date 컬럼 추가"""
@@ -308,6 +672,130 @@ def _add_notices_columns_sqlite(conn):
         """)
         print("✅ notices.date 컬럼 추가 완료")
 
+    # 게시판 목록 필터 + post_id 내림차순 페이지네이션용
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notices_type_post ON notices(type, post_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notices_dept_post ON notices(department, post_id)")
+
+
+def _add_notice_files_columns_sqlite(conn):
+    """SQLite notice_files 테이블에 이미지 축소본(variant, source_file_id, width), 내용 해시 컬럼 추가"""
+    cur = conn.execute("PRAGMA table_info(notice_files)")
+    cols = [row["name"] for row in cur.fetchall()]
+
+    if "variant" not in cols:
+        conn.execute("ALTER TABLE notice_files ADD COLUMN variant TEXT NOT NULL DEFAULT ''")
+        conn.execute("ALTER TABLE notice_files ADD COLUMN source_file_id INTEGER")
+        conn.execute("ALTER TABLE notice_files ADD COLUMN width INTEGER")
+        print("✅ notice_files 축소본 컬럼 추가 완료")
+
+    if "content_sha256" not in cols:
+        conn.execute("ALTER TABLE notice_files ADD COLUMN content_sha256 TEXT")
+        print("✅ notice_files.content_sha256 컬럼 추가 완료")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notice_files_source ON notice_files(source_file_id)")
+    # 같은 내용 찾기 / 파일 참조 수 세기 (삭제 시 마지막 참조인지 확인)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notice_files_sha ON notice_files(content_sha256)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notice_files_path ON notice_files(file_path)")
+
+
+def _add_summary_jobs_columns_sqlite(conn):
+    """SQLite summary_jobs 테이블에 run_id(선점 번호) 컬럼 추가"""
+    cur = conn.execute("PRAGMA table_info(summary_jobs)")
+    cols = [row["name"] for row in cur.fetchall()]
+
+    if "run_id" not in cols:
+        conn.execute("ALTER TABLE summary_jobs ADD COLUMN run_id INTEGER NOT NULL DEFAULT 0")
+        print("✅ summary_jobs.run_id 컬럼 추가 완료")
+
+
+_NOTICES_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS notices_fts_ai AFTER INSERT ON notices BEGIN
+      INSERT INTO notices_fts(rowid, title, content, department)
+      VALUES (new.post_id, new.title, new.content, new.department);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notices_fts_ad AFTER DELETE ON notices BEGIN
+      INSERT INTO notices_fts(notices_fts, rowid, title, content, department)
+      VALUES ('delete', old.post_id, old.title, old.content, old.department);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notices_fts_au AFTER UPDATE OF title, content, department ON notices BEGIN
+      INSERT INTO notices_fts(notices_fts, rowid, title, content, department)
+      VALUES ('delete', old.post_id, old.title, old.content, old.department);
+      INSERT INTO notices_fts(rowid, title, content, department)
+      VALUES (new.post_id, new.title, new.content, new.department);
+    END
+    """,
+)
+
+
+def _init_notices_fts_sqlite(conn, rebuild: bool = False) -> bool:
+    """
+    SQLite notices 전문 검색 테이블(notices_fts) 생성
+
+    - FTS5 trigram 토크나이저 (SQLite 3.34+) 사용, 3글자 이상 부분 문자열 검색 가능
+    - notices를 원본으로 하는 external content 테이블이라 본문을 중복 저장하지 않음
+    - INSERT/UPDATE/DELETE 트리거로 동기화, 처음 만들 때(또는 rebuild=True) 기존 공지 색인
+
+    Returns:
+        FTS 사용 가능 여부 (미지원 SQLite면 False, 검색은 LIKE로 대체됨)
+    """
+    cur = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='notices_fts'")
+    created = cur.fetchone() is None
+
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS notices_fts USING fts5(
+                title, content, department,
+                content='notices', content_rowid='post_id',
+                tokenize='trigram'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"⚠️ FTS5 trigram 미지원 SQLite ({sqlite3.sqlite_version}), 공지 검색은 LIKE로 동작: {e}")
+        return False
+
+    for trigger_sql in _NOTICES_FTS_TRIGGERS:
+        conn.execute(trigger_sql)
+
+    if created or rebuild:
+        conn.execute("INSERT INTO notices_fts(notices_fts) VALUES('rebuild')")
+        if created:
+            print("✅ notices_fts 전문 검색 테이블 생성 완료")
+    return True
+
+
+def _init_notices_trgm_postgres(conn, reindex: bool = False) -> bool:
+    """
+    PostgreSQL notices 부분 문자열 검색 인덱스 (pg_trgm + GIN)
+
+    - 제목/본문/부서를 합친 식에 GIN 인덱스 -> ILIKE '%키워드%' 가 인덱스를 사용
+    - 일반 인덱스라 INSERT/UPDATE/DELETE 시 PostgreSQL이 자동으로 동기화
+    - 확장 설치 권한이 없으면 False (검색은 인덱스 없이 ILIKE로 동작)
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_notices_search_trgm
+            ON notices USING GIN (({NOTICES_SEARCH_EXPR}) gin_trgm_ops)
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_notices_title_trgm ON notices USING GIN (title gin_trgm_ops)")
+        if reindex:
+            cursor.execute("REINDEX INDEX idx_notices_search_trgm")
+            cursor.execute("REINDEX INDEX idx_notices_title_trgm")
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ pg_trgm 인덱스 생성 실패, 공지 검색은 인덱스 없이 동작: {e}")
+        return False
+    finally:
+        cursor.close()
+
 
 def _init_postgres():
     """PostgreSQL 초기화"""
@@ -319,14 +807,7 @@ def _init_postgres():
         print(f"⚠️ {schema_path} 파일이 없습니다. 기본 스키마 파일 실행을 건너뜁니다.")
     
     try:
-        url = urlparse.urlparse(DATABASE_URL)
-        conn = psycopg2.connect(
-            database=url.path[1:],
-            user=url.username,
-            password=url.password,
-            host=url.hostname,
-            port=url.port
-        )
+        conn = _connect_postgres()
         cursor = conn.cursor()
 
         # ---------------------------------------
@@ -353,12 +834,29 @@ def _init_postgres():
                 summary TEXT,
                 keywords TEXT,
                 notice_refs TEXT,
+                cached INTEGER NOT NULL DEFAULT 0,
                 created_at BIGINT NOT NULL
             )
         """)
+        cursor.execute("ALTER TABLE chat_logs ADD COLUMN IF NOT EXISTS cached INTEGER NOT NULL DEFAULT 0")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_logs_user ON chat_logs(user_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_logs_created ON chat_logs(created_at)")
 
+        # chat_keyword_counts (키워드 통계 사전 집계: 시간/일 구간 × 팀 × 부서 × 키워드)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chat_keyword_counts (
+                bucket_start BIGINT NOT NULL,
+                granularity TEXT NOT NULL CHECK(granularity IN ('H','D')),
+                team TEXT NOT NULL,
+                department TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                cnt INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (bucket_start, granularity, team, department, keyword)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_keyword_counts_team ON chat_keyword_counts(team, bucket_start)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_keyword_counts_dept ON chat_keyword_counts(department, bucket_start)")
+
         # chat_sessions (대화 세션)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS chat_sessions (
@@ -366,7 +864,8 @@ def _init_postgres():
                 user_id TEXT NOT NULL,
                 name TEXT NOT NULL,
                 created_at BIGINT NOT NULL,
-                updated_at BIGINT NOT NULL
+                updated_at BIGINT NOT NULL,
+                message_count INTEGER NOT NULL DEFAULT 0
             )
         """)
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_user ON chat_sessions(user_id)")
@@ -389,15 +888,125 @@ def _init_postgres():
         """)
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_session ON chat_messages(session_id)")
 
+        # chat_sessions.message_count (사이드바 메시지 수 표시용) - 처음 추가될 때만 기존 메시지 수로 채움
+        cursor.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'chat_sessions' AND column_name = 'message_count'
+        """)
+        if cursor.fetchone() is None:
+            cursor.execute("ALTER TABLE chat_sessions ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
+            cursor.execute("""
+                UPDATE chat_sessions
+                SET message_count = (SELECT COUNT(1) FROM chat_messages m WHERE m.session_id = chat_sessions.session_id)
+            """)
+
+        # 세션 목록 / 메시지 keyset 페이지네이션용
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_updated ON chat_sessions(user_id, updated_at, session_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages(session_id, id)")
+
+        # popup_targets / popup_deliveries (팝업 대상 정규화 + 직원별 수신 목록)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS popup_targets (
+                popup_id      BIGINT NOT NULL,
+                target_type   TEXT NOT NULL,
+                target_value  TEXT NOT NULL,
+                PRIMARY KEY (popup_id, target_type, target_value),
+                FOREIGN KEY(popup_id) REFERENCES popups(popup_id) ON DELETE CASCADE
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_popup_targets_value ON popup_targets(target_type, target_value)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS popup_deliveries (
+                popup_id      BIGINT NOT NULL,
+                employee_id   TEXT NOT NULL,
+                created_at    BIGINT NOT NULL,
+                responded_at  BIGINT,
+                PRIMARY KEY (popup_id, employee_id),
+                FOREIGN KEY(popup_id) REFERENCES popups(popup_id) ON DELETE CASCADE,
+                FOREIGN KEY(employee_id) REFERENCES employees(employee_id) ON DELETE CASCADE
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_popup_deliveries_pending "
+            "ON popup_deliveries(employee_id, responded_at, created_at)"
+        )
+
+        # notice_summaries (공지 요약 캐시, 내용 해시 키)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS notice_summaries (
+                cache_key      TEXT PRIMARY KEY,
+                post_id        BIGINT,
+                prompt_version TEXT NOT NULL,
+                summary        TEXT NOT NULL,
+                created_at     BIGINT NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_notice_summaries_post ON notice_summaries(post_id)")
+
+        # notice_viewers (공지 직원별 최초 조회)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS notice_viewers (
+                post_id        BIGINT NOT NULL,
+                employee_id    TEXT NOT NULL,
+                viewed_at      BIGINT NOT NULL,
+                PRIMARY KEY (post_id, employee_id),
+                FOREIGN KEY(post_id) REFERENCES notices(post_id) ON DELETE CASCADE
+            )
+        """)
+
+        # summary_jobs (공지 요약 미리 생성 작업)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS summary_jobs (
+                post_id        BIGINT PRIMARY KEY,
+                status         TEXT NOT NULL DEFAULT 'PENDING' CHECK(status IN ('PENDING','RUNNING','DONE','FAILED')),
+                attempts       INTEGER NOT NULL DEFAULT 0,
+                run_id         INTEGER NOT NULL DEFAULT 0,
+                next_run_at    BIGINT NOT NULL,
+                last_error     TEXT,
+                created_at     BIGINT NOT NULL,
+                updated_at     BIGINT NOT NULL
+            )
+        """)
+        cursor.execute("ALTER TABLE summary_jobs ADD COLUMN IF NOT EXISTS run_id INTEGER NOT NULL DEFAULT 0")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_summary_jobs_due ON summary_jobs(status, next_run_at)")
+
+        # revoked_sessions (로그아웃한 세션 토큰)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS revoked_sessions (
+                token_id       TEXT PRIMARY KEY,
+                login_id       TEXT NOT NULL,
+                expires_at     BIGINT NOT NULL,
+                revoked_at     BIGINT NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_revoked_sessions_expires ON revoked_sessions(expires_at)")
+
         # notices 테이블 컬럼 보완
         cursor.execute("""
             ALTER TABLE notices ADD COLUMN IF NOT EXISTS department TEXT DEFAULT '전체';
             ALTER TABLE notices ADD COLUMN IF NOT EXISTS date TEXT;
         """)
+        # 게시판 목록 필터 + post_id 내림차순 페이지네이션용
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_notices_type_post ON notices(type, post_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_notices_dept_post ON notices(department, post_id)")
+
+        # notice_files 이미지 축소본 / 내용 해시 컬럼
+        cursor.execute("""
+            ALTER TABLE notice_files ADD COLUMN IF NOT EXISTS variant TEXT NOT NULL DEFAULT '';
+            ALTER TABLE notice_files ADD COLUMN IF NOT EXISTS source_file_id INTEGER;
+            ALTER TABLE notice_files ADD COLUMN IF NOT EXISTS width INTEGER;
+            ALTER TABLE notice_files ADD COLUMN IF NOT EXISTS content_sha256 TEXT;
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_notice_files_source ON notice_files(source_file_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_notice_files_sha ON notice_files(content_sha256)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_notice_files_path ON notice_files(file_path)")
 
         # 구조 변경 사항 즉시 커밋 (데이터 삽입 오류와 격리)
         conn.commit()
 
+        # 공지 전문 검색 인덱스 (확장 권한이 없어도 초기화는 계속)
+        _init_notices_trgm_postgres(conn)
+
         # ---------------------------------------
         # 2. 기초 데이터 삽입
         # ---------------------------------------
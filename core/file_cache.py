@@ -0,0 +1,295 @@
+"""
+첨부파일 로컬 디스크 캐시
+
+공지 상세 화면은 리런마다 첨부를 전부 get_file로 읽어서(R2면 HTTP 다운로드)
+st.image / st.download_button에 bytes로 넘기고 있었다.
+
+- R2(URL) 첨부는 내용의 SHA-256 이름으로 ATTACHMENT_CACHE_DIR/blobs에 한 번만 저장 (content-addressed)
+  URL -> (ETag, SHA-256) 대응은 ATTACHMENT_CACHE_DIR/index에 URL별 작은 JSON으로 보관
+- ATTACHMENT_CACHE_REVALIDATE_SEC가 지나면 If-None-Match(ETag)로 재검증, 304면 다시 받지 않음
+  (원격 확인이 실패하면 캐시된 내용을 그대로 사용)
+- 다운로드는 스트리밍으로 임시 파일에 바로 기록 (전체 내용을 메모리에 올리지 않음)
+- 전체 크기가 ATTACHMENT_CACHE_MAX_MB를 넘으면 가장 오래 안 쓴 파일부터 삭제 (LRU, 파일 mtime 기준)
+- 로컬 파일(uploads/)은 복사하지 않고 그 경로를 그대로 사용
+- 내용(bytes)은 다운로드 버튼을 누르거나 get_file을 부를 때만 읽음 (화면을 그릴 때는 경로만 사용)
+- ATTACHMENT_LAZY_DOWNLOAD=1 이면 다운로드 버튼에 함수를 넘겨 클릭했을 때만 내용을 읽음
+  (설치된 Streamlit의 st.download_button이 함수를 받지 못하면 내용을 바로 넘김)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+ATTACHMENT_CACHE_DIR = Path(os.getenv("ATTACHMENT_CACHE_DIR", ".cache/attachments"))
+ATTACHMENT_CACHE_MAX_MB = float(os.getenv("ATTACHMENT_CACHE_MAX_MB", "512"))
+ATTACHMENT_CACHE_REVALIDATE_SEC = float(os.getenv("ATTACHMENT_CACHE_REVALIDATE_SEC", "300"))
+ATTACHMENT_LAZY_DOWNLOAD = os.getenv("ATTACHMENT_LAZY_DOWNLOAD", "1").lower() not in ("0", "false", "no")
+ATTACHMENT_HTTP_TIMEOUT = float(os.getenv("ATTACHMENT_HTTP_TIMEOUT", "10"))
+
+_CHUNK_SIZE = 1024 * 1024
+
+# 같은 URL을 여러 세션이 동시에 처음 열 때 한 번만 받도록
+_fetch_locks: Dict[str, threading.Lock] = {}
+_fetch_locks_guard = threading.Lock()
+_evict_lock = threading.Lock()
+
+
+def _is_remote(path_or_url: str) -> bool:
+    return path_or_url.startswith("http")
+
+
+def _blob_path(sha256: str) -> Path:
+    return ATTACHMENT_CACHE_DIR / "blobs" / sha256[:2] / sha256
+
+
+def _index_path(url: str) -> Path:
+    return ATTACHMENT_CACHE_DIR / "index" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _read_index(url: str) -> Optional[Dict]:
+    try:
+        with open(_index_path(url), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_index(url: str, entry: Dict) -> None:
+    path = _index_path(url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+
+def _fetch_lock(url: str) -> threading.Lock:
+    with _fetch_locks_guard:
+        return _fetch_locks.setdefault(url, threading.Lock())
+
+
+def _touch(path: Path) -> None:
+    """LRU 순서 갱신 (mtime을 마지막 사용 시각으로 사용)"""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+# -------------------------
+# 원격(R2) 다운로드
+# -------------------------
+def _s3_key_from_url(url: str) -> str:
+    from urllib.parse import unquote
+    return unquote("/".join(url.split("/")[-2:]))  # "uploads/file.pdf"
+
+
+def _download(url: str, etag: Optional[str]):
+    """
+    원격 파일을 임시 파일로 스트리밍 다운로드
+
+    Returns:
+        None (304, 변경 없음) 또는 (임시 파일 경로, sha256, 크기, ETag)
+    """
+    import requests
+
+    tmp_dir = ATTACHMENT_CACHE_DIR / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def _save(chunks, new_etag):
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    if chunk:
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return tmp, digest.hexdigest(), size, new_etag
+
+    from botocore.exceptions import ClientError
+    from core.storage import R2_BACKEND, R2_BUCKET_NAME, get_r2_client
+
+    # 로컬 S3 대역(R2_BACKEND=local)은 공개 URL이 없으므로 바로 S3 API 사용
+    if R2_BACKEND != "local":
+        headers = {"If-None-Match": etag} if etag else {}
+        try:
+            with requests.get(url, headers=headers, timeout=ATTACHMENT_HTTP_TIMEOUT, stream=True) as resp:
+                if resp.status_code == 304:
+                    return None
+                resp.raise_for_status()
+                return _save(resp.iter_content(_CHUNK_SIZE), resp.headers.get("ETag"))
+        except Exception as e:
+            print(f"[file_cache] HTTP 다운로드 실패, S3 API 시도: {e}")
+
+    # HTTP 실패 시 S3 API로 다운로드 시도
+    params = {"Bucket": R2_BUCKET_NAME, "Key": _s3_key_from_url(url)}
+    if etag:
+        params["IfNoneMatch"] = etag
+    try:
+        obj = get_r2_client().get_object(**params)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+            return None
+        raise
+    return _save(obj["Body"].iter_chunks(_CHUNK_SIZE), obj.get("ETag"))
+
+
+def _cached_blob(url: str) -> Path:
+    """URL의 캐시된 파일 경로 (없거나 재검증 시각이 지났으면 받아서 저장)"""
+    with _fetch_lock(url):
+        entry = _read_index(url)
+        blob = _blob_path(entry["sha256"]) if entry else None
+        if blob is not None and not blob.exists():
+            entry, blob = None, None   # LRU로 지워진 경우
+
+        if blob is not None and time.time() - entry.get("checkedAt", 0) < ATTACHMENT_CACHE_REVALIDATE_SEC:
+            _touch(blob)
+            return blob
+
+        try:
+            fetched = _download(url, entry.get("etag") if entry else None)
+        except Exception as e:
+            if blob is None:
+                raise
+            print(f"[file_cache] 재검증 실패, 캐시된 파일 사용: {e} ({url})")
+            _touch(blob)
+            return blob
+
+        if fetched is None:
+            # 304: 내용 그대로
+            entry["checkedAt"] = time.time()
+            _write_index(url, entry)
+            _touch(blob)
+            return blob
+
+        tmp, sha256, size, etag = fetched
+        blob = _blob_path(sha256)
+        if blob.exists():
+            os.unlink(tmp)   # 같은 내용이 이미 있음 (다른 URL 포함)
+            _touch(blob)
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, blob)
+        _write_index(url, {"url": url, "etag": etag, "sha256": sha256, "size": size, "checkedAt": time.time()})
+
+    if fetched is not None:
+        evict_attachment_cache()
+    return blob
+
+
+# -------------------------
+# 공개 함수
+# -------------------------
+def attachment_path(path_or_url: str) -> Path:
+    """
+    첨부파일 내용이 있는 로컬 경로 (R2면 캐시에 받아둔 파일)
+
+    Raises:
+        FileNotFoundError: 로컬 파일이 없을 때
+    """
+    if _is_remote(path_or_url):
+        return _cached_blob(path_or_url)
+    path = Path(path_or_url)
+    if not path.is_file():
+        raise FileNotFoundError(path_or_url)
+    return path
+
+
+def read_attachment(path_or_url: str) -> bytes:
+    """첨부파일 내용 (호출할 때마다 파일 전체를 읽음, 메모리에 보관하지 않음)"""
+    return attachment_path(path_or_url).read_bytes()
+
+
+def attachment_image_source(path_or_url: str) -> str:
+    """st.image에 넘길 로컬 파일 경로 (Streamlit이 파일에서 직접 읽음)"""
+    return str(attachment_path(path_or_url))
+
+
+_callable_download: Optional[bool] = None
+
+
+def _download_button_accepts_callable() -> bool:
+    """st.download_button(data=함수) 지원 여부 (지원하는 Streamlit은 data 타입에 Callable이 포함됨)"""
+    global _callable_download
+    if _callable_download is None:
+        try:
+            from streamlit.elements.widgets import button
+            _callable_download = "Callable" in str(getattr(button, "DownloadButtonDataType", ""))
+        except Exception:
+            _callable_download = False
+        if not _callable_download and ATTACHMENT_LAZY_DOWNLOAD:
+            print("[file_cache] 설치된 Streamlit이 지연 다운로드를 지원하지 않아 첨부 내용을 바로 전달")
+    return _callable_download
+
+
+def attachment_download_data(path_or_url: str) -> Union[bytes, Callable[[], bytes]]:
+    """
+    st.download_button의 data 인자
+
+    ATTACHMENT_LAZY_DOWNLOAD가 켜져 있고 Streamlit이 지원하면 클릭했을 때 읽는 함수를,
+    아니면 내용을 바로 반환
+    """
+    if not ATTACHMENT_LAZY_DOWNLOAD or not _download_button_accepts_callable():
+        return read_attachment(path_or_url)
+    if not _is_remote(path_or_url) and not os.path.isfile(path_or_url):
+        raise FileNotFoundError(path_or_url)
+    return lambda: read_attachment(path_or_url)
+
+
+def forget_attachment(path_or_url: str) -> None:
+    """첨부 삭제 시 URL 대응 정보 제거 (내용 파일은 다른 URL이 같은 내용일 수 있어 LRU에 맡김)"""
+    if not _is_remote(path_or_url):
+        return
+    try:
+        os.remove(_index_path(path_or_url))
+    except FileNotFoundError:
+        pass
+
+
+def evict_attachment_cache(max_bytes: Optional[int] = None) -> int:
+    """
+    캐시 전체 크기가 상한을 넘으면 오래 안 쓴 파일부터 삭제
+
+    Returns:
+        삭제한 파일 수
+    """
+    if max_bytes is None:
+        max_bytes = int(ATTACHMENT_CACHE_MAX_MB * 1024 * 1024)
+    blob_root = ATTACHMENT_CACHE_DIR / "blobs"
+    if not blob_root.exists():
+        return 0
+
+    with _evict_lock:
+        files = []
+        total = 0
+        for path in blob_root.glob("*/*"):
+            try:
+                st_ = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st_.st_mtime, st_.st_size, path))
+            total += st_.st_size
+        if total <= max_bytes:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+    return removed
@@ -0,0 +1,506 @@
+"""
+챗봇 질문 키워드 집계
+
+chat_logs 전체를 매번 읽어 JSON 파싱/불용어 정리를 반복하지 않도록
+로그를 저장할 때 정리된 키워드를 (시간 구간 × 팀 × 부서 × 키워드) 건수로 함께 누적한다.
+
+- chat_keyword_counts
+    granularity 'H': 1시간 구간 (최근 KEYWORD_HOURLY_RETENTION_HOURS 동안)
+    granularity 'D': 1일 구간 (KST 자정 기준, 오래된 시간 구간을 압축한 것)
+- 로그 1건은 정확히 한 행(시간 또는 일 구간)에만 집계되므로 두 단위를 합쳐도 중복이 없음
+- 압축(compact_keyword_counts): 오래된 시간 구간을 일 구간으로 합치고,
+  KEYWORD_STATS_RETENTION_DAYS가 지난 일 구간은 삭제 (0이면 보관)
+  로그 저장 후 KEYWORD_COMPACT_INTERVAL_SEC마다 자동 실행
+
+기존 로그로 다시 집계 / 수동 압축:
+  python -m core.keyword_stats --rebuild
+  python -m core.keyword_stats --compact
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.db import get_conn
+
+KEYWORD_HOURLY_RETENTION_HOURS = int(os.getenv("KEYWORD_HOURLY_RETENTION_HOURS", "72"))
+KEYWORD_STATS_RETENTION_DAYS = int(os.getenv("KEYWORD_STATS_RETENTION_DAYS", "0"))
+KEYWORD_COMPACT_INTERVAL_SEC = float(os.getenv("KEYWORD_COMPACT_INTERVAL_SEC", "3600"))
+KEYWORD_STATS_TZ_OFFSET_HOURS = int(os.getenv("KEYWORD_STATS_TZ_OFFSET_HOURS", "9"))  # 일 구간 기준 시간대 (KST)
+
+HOUR_MS = 3600 * 1000
+DAY_MS = 24 * HOUR_MS
+_TZ_OFFSET_MS = KEYWORD_STATS_TZ_OFFSET_HOURS * HOUR_MS
+
+# 직원 정보가 없는 로그(관리자 등)의 팀/부서
+UNKNOWN_GROUP = "기타"
+
+# 불용어 (통계 후처리용)
+STOPWORDS = {
+    '은', '는', '이', '가', '을', '를', '에', '의', '와', '과', '으로', '로', '에서', '부터', '까지',
+    '있다', '없다', '이다', '아니다', '하다', '되다', '않다', '같다', '싶다',
+    '알려줘', '알려주세요', '알려', '주세요', '해주세요', '해줘', '보여줘', '보여주세요',
+    '무엇', '무엇인가요', '어디', '어디서', '언제', '누구', '어떻게', '왜',
+    '궁금해', '궁금해요', '질문', '문의', '사항', '관련', '대한', '대해', '대하여',
+    '안녕', '안녕하세요', '반가워', '반갑습니다', '감사', '고마워',
+    '공지', '사항', '확인', '방법', '좀', '수', '할', '한', '데', '건', '것',
+    '저', '나', '너', '우리', '그', '이', '저', '요', '네', '아니요',
+    '이번', '저번', '다음', '오늘', '내일', '어제', '지금', '현재',
+    '있어', '있나', '있니', '있나요', '없어', '없나', '없니', '없나요',
+    '??', '?!', '??', '..', '...',
+    '공지를', '공지사항', '최근', '뭐가', '뭔가', '알려줄래', '어떤', '어떤게',
+    '관련하여', '내용', '내용이', '불러와줘', '얼마야', '얼마'
+}
+
+# 제거할 조사 목록
+JOSAS = ['은', '는', '이', '가', '을', '를', '에', '의', '와', '과', '으로', '로', '에서', '도', '만']
+
+_NON_WORD_RE = re.compile(r'[^가-힣a-zA-Z0-9]')
+
+_UPSERT_SQL = """
+    INSERT INTO chat_keyword_counts(bucket_start, granularity, team, department, keyword, cnt)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(bucket_start, granularity, team, department, keyword)
+    DO UPDATE SET cnt = chat_keyword_counts.cnt + excluded.cnt
+"""
+
+
+# -------------------------
+# 키워드 정리
+# -------------------------
+def normalize_keyword(keyword) -> Optional[str]:
+    """
+    통계용 키워드 정리 (특수문자/불용어 제거, 끝 조사 1개 제거)
+
+    Returns:
+        정리된 키워드, 통계에서 뺄 단어면 None
+    """
+    k = str(keyword).strip()
+    if not k:
+        return None
+
+    # 1. 특수문자 제거
+    k_clean = _NON_WORD_RE.sub('', k)
+
+    # 2. 길이 체크 및 1차 불용어 체크
+    if len(k_clean) < 2:
+        return None
+    if k in STOPWORDS or k_clean in STOPWORDS:
+        return None
+
+    # 3. 조사(Josa) 제거 - '자동차를' -> '자동차', '학교에서' -> '학교'
+    cand = k_clean
+    for josa in JOSAS:
+        if cand.endswith(josa):
+            # 조사를 제거했을 때 2글자 이상 남아야 함
+            temp = cand[:-len(josa)]
+            if len(temp) >= 2:
+                cand = temp
+                break  # 하나만 제거하고 중단 (중복 조사 처리 안함)
+
+    # 조사 제거 후 다시 불용어 체크
+    if cand in STOPWORDS:
+        return None
+    return cand
+
+
+def _parse_keywords(keywords_json) -> List[str]:
+    """chat_logs.keywords(JSON 배열) -> 정리된 키워드 리스트"""
+    if isinstance(keywords_json, list):
+        keywords = keywords_json
+    else:
+        try:
+            keywords = json.loads(keywords_json)
+        except (TypeError, ValueError):
+            return []
+    if not isinstance(keywords, list):
+        return []
+    result = []
+    for k in keywords:
+        cand = normalize_keyword(k)
+        if cand:
+            result.append(cand)
+    return result
+
+
+def hour_bucket(ts_ms: int) -> int:
+    return int(ts_ms) // HOUR_MS * HOUR_MS
+
+
+def day_bucket(ts_ms: int) -> int:
+    """KST 자정 기준 일 구간 시작 시각(ms)"""
+    return (int(ts_ms) + _TZ_OFFSET_MS) // DAY_MS * DAY_MS - _TZ_OFFSET_MS
+
+
+# -------------------------
+# 로그 저장 시 집계
+# -------------------------
+def record_keyword_counts(conn, rows: Sequence[Tuple]) -> None:
+    """
+    chat_logs 저장과 같은 트랜잭션에서 키워드 건수 누적
+
+    Args:
+        conn: get_conn() 연결
+        rows: (user_id, keywords_json, created_at) 튜플 목록
+    """
+    parsed = [(user_id, _parse_keywords(keywords), created_at) for user_id, keywords, created_at in rows]
+    parsed = [p for p in parsed if p[1]]
+    if not parsed:
+        return
+
+    groups = _lookup_groups(conn, {p[0] for p in parsed if p[0]})
+    counts: Counter = Counter()
+    for user_id, keywords, created_at in parsed:
+        team, department = groups.get(user_id, (UNKNOWN_GROUP, UNKNOWN_GROUP))
+        bucket = hour_bucket(created_at)
+        for k in keywords:
+            counts[(bucket, "H", team, department, k)] += 1
+
+    conn.executemany(_UPSERT_SQL, [key + (cnt,) for key, cnt in counts.items()])
+
+
+def _lookup_groups(conn, user_ids: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    placeholders = ",".join("?" for _ in user_ids)
+    cur = conn.execute(
+        f"SELECT employee_id, team, department FROM employees WHERE employee_id IN ({placeholders})",
+        tuple(user_ids),
+    )
+    return {
+        r["employee_id"]: (r["team"] or UNKNOWN_GROUP, r["department"] or UNKNOWN_GROUP)
+        for r in cur.fetchall()
+    }
+
+
+# -------------------------
+# 조회
+# -------------------------
+def _ensure_backfilled() -> None:
+    """집계 테이블이 비어 있는데 로그가 있으면(기능 도입 직후) 기존 로그로 한 번 집계"""
+    global _backfill_checked
+    if _backfill_checked:
+        return
+    with _backfill_lock:
+        if _backfill_checked:
+            return
+        try:
+            with get_conn() as conn:
+                has_counts = conn.execute("SELECT 1 AS ok FROM chat_keyword_counts LIMIT 1").fetchone()
+                has_logs = conn.execute(
+                    "SELECT 1 AS ok FROM chat_logs WHERE keywords IS NOT NULL AND keywords <> '[]' LIMIT 1"
+                ).fetchone()
+            if has_logs and not has_counts:
+                rebuild_keyword_counts()
+        except Exception as e:
+            print(f"[keyword_stats] 기존 로그 집계 실패: {e}")
+        _backfill_checked = True
+
+
+_backfill_checked = False
+_backfill_lock = threading.Lock()
+
+
+def _flush_pending_logs() -> None:
+    # chat_log_sink가 이 모듈을 import하므로 지연 import
+    from core.chat_log_sink import flush_chat_logs
+
+    # 큐에 남아 있는 최근 로그까지 반영
+    flush_chat_logs(timeout=1.0)
+
+
+def top_keywords(
+    team: Optional[str] = None,
+    department: Optional[str] = None,
+    since_ms: Optional[int] = None,
+    until_ms: Optional[int] = None,
+    limit: Optional[int] = 10,
+) -> List[Tuple[str, int]]:
+    """
+    기간/팀/부서별 상위 키워드
+
+    Args:
+        team: 팀 (None이면 전체)
+        department: 부서 (None이면 전체)
+        since_ms: 시작 시각(포함, ms) - 시간 구간 보관 기간보다 오래되면 일 단위로 맞춰짐
+        until_ms: 끝 시각(미포함, ms)
+        limit: 최대 개수 (None이면 전부)
+
+    Returns:
+        [(키워드, 건수), ...] 건수 내림차순
+    """
+    _flush_pending_logs()
+    _ensure_backfilled()
+
+    where, params = [], []
+    if since_ms is not None:
+        where.append("bucket_start >= ?")
+        params.append(int(since_ms))
+    if until_ms is not None:
+        where.append("bucket_start < ?")
+        params.append(int(until_ms))
+    if team is not None:
+        where.append("team = ?")
+        params.append(team)
+    if department is not None:
+        where.append("department = ?")
+        params.append(department)
+
+    sql = "SELECT keyword, SUM(cnt) AS total FROM chat_keyword_counts"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " GROUP BY keyword ORDER BY total DESC, keyword"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+
+    with get_conn() as conn:
+        rows = conn.execute(sql, tuple(params)).fetchall()
+    return [(r["keyword"], int(r["total"])) for r in rows]
+
+
+def keyword_counts_by_group(
+    group: str = "team",
+    since_ms: Optional[int] = None,
+    until_ms: Optional[int] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    팀(또는 부서)별 키워드 건수
+
+    Args:
+        group: "team" | "department"
+        since_ms / until_ms: 기간 (top_keywords와 같음)
+
+    Returns:
+        {"전체": {키워드: 건수}, 팀명: {키워드: 건수}, ...}
+    """
+    if group not in ("team", "department"):
+        raise ValueError(f"지원하지 않는 group: {group}")
+
+    _flush_pending_logs()
+    _ensure_backfilled()
+
+    where, params = [], []
+    if since_ms is not None:
+        where.append("bucket_start >= ?")
+        params.append(int(since_ms))
+    if until_ms is not None:
+        where.append("bucket_start < ?")
+        params.append(int(until_ms))
+
+    sql = f"SELECT {group} AS grp, keyword, SUM(cnt) AS total FROM chat_keyword_counts"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" GROUP BY {group}, keyword"
+
+    with get_conn() as conn:
+        rows = conn.execute(sql, tuple(params)).fetchall()
+
+    stats: Dict[str, Counter] = {"전체": Counter()}
+    for r in rows:
+        total = int(r["total"])
+        stats["전체"][r["keyword"]] += total
+        stats.setdefault(r["grp"], Counter())[r["keyword"]] += total
+    return {k: dict(v) for k, v in stats.items()}
+
+
+# -------------------------
+# 기간별 통계 (관리자 대시보드)
+# -------------------------
+# 기간 키 -> (표시 이름, 길이(ms), 구간 단위(ms))
+# 24시간은 시간 구간 보관 기간 안이라 1시간 단위, 7일/30일은 일 구간과 맞도록 KST 자정 단위로 자름
+WINDOWS = {
+    "24h": ("최근 24시간", 24 * HOUR_MS, HOUR_MS),
+    "7d": ("최근 7일", 7 * DAY_MS, DAY_MS),
+    "30d": ("최근 30일", 30 * DAY_MS, DAY_MS),
+}
+
+
+def window_range(window: str, now_ms: Optional[int] = None) -> Tuple[int, int]:
+    """
+    기간 키 -> (시작, 끝) ms (끝은 현재 구간 다음 경계, 현재 구간 포함)
+
+    Raises:
+        ValueError: 지원하지 않는 기간
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"지원하지 않는 기간: {window}")
+    _, length, step = WINDOWS[window]
+    now_ms = int(now_ms if now_ms is not None else time.time() * 1000)
+    current = hour_bucket(now_ms) if step == HOUR_MS else day_bucket(now_ms)
+    until = current + step
+    return until - length, until
+
+
+def rising_keywords(
+    window: str,
+    team: Optional[str] = None,
+    department: Optional[str] = None,
+    limit: int = 10,
+    min_count: int = 2,
+    now_ms: Optional[int] = None,
+) -> List[Dict]:
+    """
+    직전 같은 길이의 기간보다 많이 늘어난 키워드
+
+    Args:
+        window: "24h" | "7d" | "30d"
+        team / department: 범위 (None이면 전체)
+        limit: 최대 개수
+        min_count: 이번 기간 최소 건수 (1~2건짜리 잡음 제외)
+
+    Returns:
+        [{"keyword", "count", "previous", "delta", "growth"}, ...] 증가량 내림차순
+        growth는 증가율(%), 직전 기간에 없던 키워드면 None
+    """
+    since, until = window_range(window, now_ms)
+    prev_since = since - (until - since)
+
+    _flush_pending_logs()
+    _ensure_backfilled()
+
+    where, params = ["bucket_start >= ?", "bucket_start < ?"], [prev_since, until]
+    if team is not None:
+        where.append("team = ?")
+        params.append(team)
+    if department is not None:
+        where.append("department = ?")
+        params.append(department)
+
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT keyword,
+                   SUM(CASE WHEN bucket_start >= ? THEN cnt ELSE 0 END) AS cur,
+                   SUM(CASE WHEN bucket_start < ? THEN cnt ELSE 0 END) AS prev
+            FROM chat_keyword_counts
+            WHERE {" AND ".join(where)}
+            GROUP BY keyword
+            """,
+            (since, since, *params),
+        ).fetchall()
+
+    result = []
+    for r in rows:
+        cur, prev = int(r["cur"] or 0), int(r["prev"] or 0)
+        if cur < min_count or cur <= prev:
+            continue
+        result.append({
+            "keyword": r["keyword"],
+            "count": cur,
+            "previous": prev,
+            "delta": cur - prev,
+            "growth": round((cur - prev) * 100 / prev, 1) if prev else None,
+        })
+    result.sort(key=lambda x: (-x["delta"], -x["count"], x["keyword"]))
+    return result[:limit]
+
+
+# -------------------------
+# 재집계 / 압축
+# -------------------------
+def rebuild_keyword_counts(batch_size: int = 5000) -> int:
+    """
+    chat_logs 전체로 집계 테이블 재구성 (일 구간으로 압축된 상태까지 만듦)
+
+    Returns:
+        집계한 로그 수
+    """
+    processed = 0
+    with get_conn() as conn:
+        conn.execute("DELETE FROM chat_keyword_counts")
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                "SELECT id, user_id, keywords, created_at FROM chat_logs WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            record_keyword_counts(conn, [(r["user_id"], r["keywords"], int(r["created_at"])) for r in rows])
+            last_id = int(rows[-1]["id"])
+            processed += len(rows)
+    compact_keyword_counts()
+    print(f"[keyword_stats] 로그 {processed}건으로 키워드 집계 재구성")
+    return processed
+
+
+def compact_keyword_counts(now_ms: Optional[int] = None) -> Dict[str, int]:
+    """
+    오래된 시간 구간을 일 구간으로 합치고 보관 기간이 지난 일 구간 삭제
+
+    Returns:
+        {"merged": 합친 시간 구간 행 수, "expired": 삭제한 일 구간 행 수}
+    """
+    now_ms = int(now_ms if now_ms is not None else time.time() * 1000)
+    # 일 경계에 맞춰서 자름 (하루가 시간/일 구간으로 나뉘지 않도록)
+    cutoff = day_bucket(now_ms - KEYWORD_HOURLY_RETENTION_HOURS * HOUR_MS)
+
+    with get_conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO chat_keyword_counts(bucket_start, granularity, team, department, keyword, cnt)
+            SELECT ((bucket_start + ?) / ?) * ? - ?, 'D', team, department, keyword, SUM(cnt)
+            FROM chat_keyword_counts
+            WHERE granularity = 'H' AND bucket_start < ?
+            GROUP BY 1, 3, 4, 5
+            ON CONFLICT(bucket_start, granularity, team, department, keyword)
+            DO UPDATE SET cnt = chat_keyword_counts.cnt + excluded.cnt
+            """,
+            (_TZ_OFFSET_MS, DAY_MS, DAY_MS, _TZ_OFFSET_MS, cutoff),
+        )
+        merged = conn.execute(
+            "DELETE FROM chat_keyword_counts WHERE granularity = 'H' AND bucket_start < ?",
+            (cutoff,),
+        ).rowcount
+
+        expired = 0
+        if KEYWORD_STATS_RETENTION_DAYS > 0:
+            expire_before = day_bucket(now_ms) - KEYWORD_STATS_RETENTION_DAYS * DAY_MS
+            expired = conn.execute(
+                "DELETE FROM chat_keyword_counts WHERE granularity = 'D' AND bucket_start < ?",
+                (expire_before,),
+            ).rowcount
+
+    if merged or expired:
+        print(f"[keyword_stats] 키워드 집계 압축: 시간 구간 {merged}행 병합, 일 구간 {expired}행 만료")
+    return {"merged": max(0, merged), "expired": max(0, expired)}
+
+
+_last_compact: Optional[float] = None
+_compact_lock = threading.Lock()
+
+
+def maybe_compact_keyword_counts() -> None:
+    """KEYWORD_COMPACT_INTERVAL_SEC마다 한 번 압축 (로그 저장 후 호출, 실패해도 예외를 내지 않음)"""
+    global _last_compact
+    now = time.monotonic()
+    if _last_compact is not None and now - _last_compact < KEYWORD_COMPACT_INTERVAL_SEC:
+        return
+    if not _compact_lock.acquire(blocking=False):
+        return
+    try:
+        if _last_compact is not None and now - _last_compact < KEYWORD_COMPACT_INTERVAL_SEC:
+            return
+        _last_compact = now
+        compact_keyword_counts()
+    except Exception as e:
+        print(f"[keyword_stats] 키워드 집계 압축 실패: {e}")
+    finally:
+        _compact_lock.release()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--rebuild" in args:
+        rebuild_keyword_counts()
+    elif "--compact" in args:
+        compact_keyword_counts()
+    else:
+        print("사용 방법: python -m core.keyword_stats --rebuild | --compact")
+        sys.exit(1)
@@ -1,10 +1,11 @@
-import base64
-import mimetypes
+import math
+import os
 from pathlib import Path
 from typing import Optional, List, Tuple
 import streamlit as st
 import service
 import time
+from core import static_assets
 from core.config import DEPARTMENT_EMAILS, ADMIN_EMAIL
 from core.email_utils import send_email
 
@@ -13,11 +14,8 @@ PORTAL_PRIMARY = "#139fb0"
 PORTAL_BG = "#f5f7fb"
 CARD_BORDER = "rgba(17,24,39,0.10)"
 
-def apply_portal_theme(*, hide_pages_sidebar_nav: bool, hide_sidebar: bool, active_menu: Optional[str] = None):
-    active_menu = active_menu or ""
-    st.markdown(
-        f"""
-        <style>
+# 테마 공통 CSS (페이지별로 달라지는 사이드바 숨김 규칙은 apply_portal_theme에서 따로 추가)
+_PORTAL_THEME_CSS = f"""
         body {{ background: {PORTAL_BG}; }}
         .block-container {{
             padding-top: 0.8rem;
@@ -25,9 +23,6 @@ def apply_portal_theme(*, hide_pages_sidebar_nav: bool, hide_sidebar: bool, acti
             max-width: 1600px;
         }}
 
-        {"div[data-testid='stSidebarNav']{display:none !important;}" if hide_pages_sidebar_nav else ""}
-        {"section[data-testid='stSidebar']{display:none !important;}" if hide_sidebar else ""}
-
         section[data-testid="stSidebar"] > div {{
             background: {PORTAL_PRIMARY};
             color: #fff;
@@ -98,6 +93,50 @@ def apply_portal_theme(*, hide_pages_sidebar_nav: bool, hide_sidebar: bool, acti
             flex-direction: column;
             justify-content: space-between;
         }}
+"""
+
+
+def _inject_stylesheet(css_id: str, url: str):
+    """
+    정적 서빙 CSS를 부모 문서 <head>에 <link>로 한 번만 추가 (id에 내용 해시가 들어 있어 같은 CSS는 중복 추가 안 함)
+    페이지 이동/리런에도 <head>에 남아 있으므로 리런마다 CSS 본문을 다시 보내지 않는다.
+    """
+    import streamlit.components.v1 as components
+    components.html(
+        f"""
+        <script>
+        (function () {{
+          const doc = window.parent.document;
+          const id = {css_id!r};
+          if (doc.getElementById(id)) return;
+          const prefix = id.slice(0, id.lastIndexOf('-') + 1);
+          doc.querySelectorAll('link[id^="' + prefix + '"]').forEach((el) => el.remove());
+          const link = doc.createElement('link');
+          link.id = id;
+          link.rel = 'stylesheet';
+          link.href = new URL({url!r}, doc.baseURI).href;
+          doc.head.appendChild(link);
+        }})();
+        </script>
+        """,
+        height=0,
+    )
+
+
+def apply_portal_theme(*, hide_pages_sidebar_nav: bool, hide_sidebar: bool, active_menu: Optional[str] = None):
+    active_menu = active_menu or ""
+    css_id, css_url = static_assets.stylesheet("portal-theme", _PORTAL_THEME_CSS)
+    if css_url:
+        _inject_stylesheet(css_id, css_url)
+        base_css = ""
+    else:
+        base_css = _PORTAL_THEME_CSS   # 정적 서빙이 꺼져 있으면 기존처럼 리런마다 전송
+    st.markdown(
+        f"""
+        <style>
+        {base_css}
+        {"div[data-testid='stSidebarNav']{display:none !important;}" if hide_pages_sidebar_nav else ""}
+        {"section[data-testid='stSidebar']{display:none !important;}" if hide_sidebar else ""}
         </style>
 
         <script>
@@ -131,17 +170,12 @@ def render_floating_widget(*, img_path: str, width_px: int = 200, bottom_px: int
     """
     import streamlit.components.v1 as components
 
-    p = Path(img_path)
-    if not p.exists():
-        st.warning(f"Floating widget image not found: {p.resolve()}")
+    # 표시 크기(고해상도 화면 2배)로 줄인 이미지를 정적 서빙 URL로 (리런마다 base64를 다시 보내지 않음)
+    img_url = static_assets.image_url(img_path, max_px=width_px * 2)
+    if img_url is None:
+        st.warning(f"Floating widget image not found: {Path(img_path).resolve()}")
         return
 
-    mime, _ = mimetypes.guess_type(str(p))
-    mime = mime or "image/png"
-
-    b64 = base64.b64encode(p.read_bytes()).decode("utf-8")
-    data_url = f"data:{mime};base64,{b64}"
-
     # 버튼 생성
     st.button("open", key="floating_chatbot_trigger", on_click=on_click)
 
@@ -151,6 +185,7 @@ def render_floating_widget(*, img_path: str, width_px: int = 200, bottom_px: int
         <script>
         (function() {{
             const doc = window.parent.document;
+            const imgUrl = new URL({img_url!r}, doc.baseURI).href;
 
             // 기존 요소 제거
             const old = doc.getElementById('floating-chatbot-widget');
@@ -170,7 +205,7 @@ def render_floating_widget(*, img_path: str, width_px: int = 200, bottom_px: int
                 height: {width_px}px;
                 cursor: pointer;
                 transition: transform 0.12s ease, filter 0.12s ease;
-                background-image: url('{data_url}');
+                background-image: url('${{imgUrl}}');
                 background-size: contain;
                 background-repeat: no-repeat;
                 background-position: center;
@@ -343,6 +378,87 @@ def info_card(title: str, subtitle: str, lines: List[Tuple[str, str]], badge: Op
         unsafe_allow_html=True,
     )
 
+# -------------------------
+# 게시판 목록 페이지네이션 (관리자/직원 게시판 공통)
+# -------------------------
+BOARD_PAGE_SIZE = int(os.getenv("BOARD_PAGE_SIZE", "20"))
+
+
+def board_page(key_prefix: str, page_size: int = BOARD_PAGE_SIZE) -> dict:
+    """
+    게시판 필터(유형/부서)를 그리고 현재 페이지 공지 목록 반환
+
+    페이지별 시작 커서(이전 페이지 마지막 post_id)를 session_state에 쌓아두고
+    service.list_posts_page로 한 페이지만 조회한다. 필터가 바뀌면 첫 페이지로,
+    첫 페이지가 아닌데 비어 있으면(공지 삭제 등) 내용이 있는 앞 페이지로 돌아간다.
+
+    Args:
+        key_prefix: 위젯/세션 키 접두사 (게시판마다 다르게)
+        page_size: 페이지당 건수
+
+    Returns:
+        service.list_posts_page 결과
+    """
+    f1, f2 = st.columns([1, 1])
+    with f1:
+        type_label = st.radio(
+            "공지 유형", ["전체", "중요", "일반"], horizontal=True,
+            key=f"{key_prefix}_type", label_visibility="collapsed",
+        )
+    with f2:
+        dept_label = st.selectbox(
+            "부서", ["전체 부서"] + service.list_post_departments(),
+            key=f"{key_prefix}_dept", label_visibility="collapsed",
+        )
+    ntype = None if type_label == "전체" else type_label
+    department = None if dept_label == "전체 부서" else dept_label
+
+    cursor_key = f"{key_prefix}_cursors"
+    filter_key = f"{key_prefix}_filters"
+    if st.session_state.get(filter_key) != (ntype, department) or cursor_key not in st.session_state:
+        st.session_state[cursor_key] = [None]
+        st.session_state[filter_key] = (ntype, department)
+
+    cursors = st.session_state[cursor_key]
+    while True:
+        page = service.list_posts_page(
+            page_size=page_size,
+            before_post_id=cursors[-1],
+            ntype=ntype,
+            department=department,
+        )
+        # 그 사이 공지가 삭제돼 뒤쪽 페이지가 비었으면 앞 페이지로
+        if page["items"] or len(cursors) <= 1:
+            break
+        cursors.pop()
+    page["pageSize"] = page_size
+    return page
+
+
+def render_board_pager(key_prefix: str, page: dict):
+    """이전/다음 페이지 버튼 + 페이지 표시 (board_page와 같은 key_prefix 사용)"""
+    cursors = st.session_state[f"{key_prefix}_cursors"]
+    page_no = len(cursors)
+    total = int(page.get("totalEstimate") or 0)
+    total_pages = max(page_no, math.ceil(total / max(1, page.get("pageSize") or BOARD_PAGE_SIZE)))
+
+    p1, p2, p3 = st.columns([1, 2, 1])
+    with p1:
+        if st.button("◀ 이전", use_container_width=True, disabled=page_no <= 1, key=f"{key_prefix}_prev"):
+            cursors.pop()
+            st.rerun()
+    with p2:
+        st.markdown(
+            f"<div style='text-align:center;color:rgba(0,0,0,0.55);padding-top:6px;'>"
+            f"{page_no} / {total_pages} 페이지 · 총 {total}건</div>",
+            unsafe_allow_html=True,
+        )
+    with p3:
+        if st.button("다음 ▶", use_container_width=True, disabled=page.get("nextCursor") is None, key=f"{key_prefix}_next"):
+            cursors.append(page["nextCursor"])
+            st.rerun()
+
+
 def app_links_card(title: str, links: list[str], role: str):
     st.markdown(f"**{title}**")
     for i, name in enumerate(links):
@@ -463,23 +579,19 @@ def render_chatbot_modal(user_id: str):
                 "content": prompt
             })
 
-            # 챗봇 응답
-            with st.spinner("답변 생성 중..."):
-                result = engine.ask(prompt)
-                response = result["response"]
-
-                # 봇 메시지 추가
-                st.session_state.modal_chat_messages.append({
-                    "role": "assistant",
-                    "content": response
-                })
-
-            # 새 메시지를 즉시 표시
+            # 새 메시지를 즉시 표시 (챗봇 응답은 받는 대로)
             with chat_container:
                 with st.chat_message("user"):
                     st.markdown(prompt)
                 with st.chat_message("assistant"):
-                    st.markdown(response)
+                    st.write_stream(engine.ask_stream(prompt))
+            response = engine.last_result["response"]
+
+            # 봇 메시지 추가
+            st.session_state.modal_chat_messages.append({
+                "role": "assistant",
+                "content": response
+            })
 
         # 하단 버튼
         st.divider()
@@ -588,6 +700,12 @@ def portal_sidebar(*, role: str, active_menu: str, on_menu_change):
         st.session_state.employee_id = None
         st.session_state.employee_info = None
         st.session_state._login_modal_open = True
+
+        # 쿠키가 남아 있어도 자동 로그인되지 않도록 세션 토큰 폐기
+        token = st.session_state.pop("session_token", None)
+        if token:
+            from core.session_token import revoke_session_token
+            revoke_session_token(token)
         
         # 로그아웃 플래그 설정 (Login 페이지에서 쿠키 삭제 처리)
         st.session_state["logout_clicked"] = True
@@ -0,0 +1,442 @@
+"""
+POTENS LLM 공용 클라이언트
+
+챗봇 엔진(core.chatbot_engine)과 공지 요약(core.summary)이 함께 사용한다.
+
+- requests.Session 재사용 (keep-alive, 연결 풀) -> 질문마다 TCP/TLS 연결을 새로 맺지 않음
+- 429/5xx/연결 오류/타임아웃은 지터가 들어간 지수 백오프로 재시도 (429는 Retry-After 우선)
+- 프로세스 전체 동시 호출 수 제한 (세마포어, 대기 한도 초과 시 LLMBusyError)
+- 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 동안 호출 없이 바로 LLMUnavailableError
+- 호출 종류(kind)별 지연시간 지표 (get_llm_metrics)
+- stream(): LLM_STREAMING=1이면 스트리밍 요청(SSE), 업스트림이 스트리밍을 못 하면 전체 응답을 잘게 나눠 전달
+
+예외는 모두 requests.exceptions.RequestException 하위 클래스라
+기존 호출부의 except requests.exceptions.RequestException 처리가 그대로 동작한다.
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, Optional
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+load_dotenv(override=False)
+
+POTENS_API_KEY = os.getenv("POTENS_API_KEY", "")
+POTENS_API_URL = os.getenv("POTENS_API_URL", "https://ai.potens.ai/api/chat")
+RESPONSE_TIMEOUT = float(os.getenv("RESPONSE_TIMEOUT", "30"))
+
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))                  # 첫 시도 외 재시도 횟수
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))            # 첫 재시도 대기 상한(초), 이후 2배씩
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))          # 프로세스 전체 동시 호출 수
+LLM_CONCURRENCY_WAIT = float(os.getenv("LLM_CONCURRENCY_WAIT", "20"))     # 빈 자리 대기 한도(초)
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))        # 연속 실패 몇 번이면 차단할지
+LLM_BREAKER_RESET_SEC = float(os.getenv("LLM_BREAKER_RESET_SEC", "30"))   # 차단 후 시험 호출까지 대기(초)
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+LLM_STREAMING = os.getenv("LLM_STREAMING", "0").lower() in ("1", "true", "yes")       # 스트리밍 요청 사용 여부
+LLM_STREAM_FALLBACK_DELAY = float(os.getenv("LLM_STREAM_FALLBACK_DELAY", "0"))        # 나눠 전달할 때 조각 사이 대기(초)
+
+# 재시도 대상 HTTP 상태
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 지표 계산용 최근 샘플 수
+_METRIC_SAMPLES = 200
+
+
+class LLMBusyError(requests.exceptions.RequestException):
+    """동시 호출 한도 대기 시간 초과"""
+
+
+class LLMUnavailableError(requests.exceptions.ConnectionError):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 기반 서킷 브레이커
+
+    - closed: 정상 호출
+    - open: failure_threshold회 연속 실패 후 reset_timeout초 동안 즉시 실패
+    - half-open: 대기 후 시험 호출 1건만 허용, 성공하면 closed / 실패하면 다시 open
+    """
+
+    def __init__(self, failure_threshold: int = LLM_BREAKER_FAILURES, reset_timeout: float = LLM_BREAKER_RESET_SEC):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state_locked()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    print(f"[llm] POTENS 연속 실패 {self._failures}회, {self.reset_timeout:.0f}초간 호출 차단")
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """시험 호출이 업스트림 장애와 무관한 이유로 끝났을 때 (다음 호출이 다시 시험하도록)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class _LatencyStats:
+    """호출 종류별 지연시간/성공률"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict] = {}
+
+    def record(self, kind: str, elapsed_ms: float, ok: bool, attempts: int) -> None:
+        with self._lock:
+            d = self._data.setdefault(kind, {
+                "calls": 0, "errors": 0, "retries": 0,
+                "total_ms": 0.0, "max_ms": 0.0,
+                "samples": deque(maxlen=_METRIC_SAMPLES),
+            })
+            d["calls"] += 1
+            d["errors"] += 0 if ok else 1
+            d["retries"] += max(0, attempts - 1)
+            d["total_ms"] += elapsed_ms
+            d["max_ms"] = max(d["max_ms"], elapsed_ms)
+            d["samples"].append(elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            result = {}
+            for kind, d in self._data.items():
+                samples = sorted(d["samples"])
+                result[kind] = {
+                    "calls": d["calls"],
+                    "errors": d["errors"],
+                    "retries": d["retries"],
+                    "avg_ms": round(d["total_ms"] / d["calls"], 1) if d["calls"] else 0.0,
+                    "p50_ms": round(_percentile(samples, 0.50), 1),
+                    "p95_ms": round(_percentile(samples, 0.95), 1),
+                    "max_ms": round(d["max_ms"], 1),
+                }
+            return result
+
+
+def _percentile(sorted_samples, q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    idx = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[idx]
+
+
+def parse_potens_response(result) -> str:
+    """POTENS 응답 JSON에서 본문 추출 (response/answer/text/message/content 순, 없으면 전체 문자열)"""
+    if isinstance(result, dict):
+        text = (
+            result.get("response")
+            or result.get("answer")
+            or result.get("text")
+            or result.get("message")
+            or result.get("content")
+        )
+        if text:
+            return str(text).strip()
+    return str(result).strip()
+
+
+# 나눠 전달할 때 조각 단위 (단어 + 뒤따르는 공백, 줄바꿈 유지)
+_CHUNK_RE = re.compile(r"\S+\s*|\s+")
+
+# SSE data 조각에서 텍스트를 찾을 키 (증분 토큰 우선)
+_SSE_TEXT_KEYS = ("delta", "token", "text", "response", "content", "answer", "message")
+
+
+def chunk_text(text: str) -> Iterator[str]:
+    """완성된 응답을 단어 단위 조각으로 나눔 (스트리밍을 못 할 때의 대체 전달)"""
+    for m in _CHUNK_RE.finditer(text or ""):
+        yield m.group(0)
+        if LLM_STREAM_FALLBACK_DELAY > 0:
+            time.sleep(LLM_STREAM_FALLBACK_DELAY)
+
+
+def _iter_sse_text(response) -> Iterator[str]:
+    """text/event-stream 응답에서 data 조각의 텍스트만 추출 ([DONE]에서 종료)"""
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        # charset이 없으면 requests가 ISO-8859-1로 해석하므로 UTF-8로 지정 (SSE 표준 인코딩)
+        response.encoding = "utf-8"
+    # chunk_size=None: 전송 청크가 도착하는 대로 처리 (고정 크기만큼 모일 때까지 기다리지 않음)
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].lstrip()
+        if data == "[DONE]":
+            return
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            yield data
+            continue
+        if isinstance(payload, dict):
+            for key in _SSE_TEXT_KEYS:
+                value = payload.get(key)
+                if isinstance(value, str):
+                    if value:
+                        yield value
+                    break
+        elif isinstance(payload, str) and payload:
+            yield payload
+
+
+class PotensClient:
+    """POTENS API 클라이언트 (프로세스 전역 1개, get_llm_client로 사용)"""
+
+    def __init__(
+        self,
+        api_key: str = POTENS_API_KEY,
+        api_url: str = POTENS_API_URL,
+        timeout: float = RESPONSE_TIMEOUT,
+        max_retries: int = LLM_MAX_RETRIES,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+    ):
+        self.api_key = api_key
+        self.api_url = api_url
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.breaker = CircuitBreaker()
+        self._semaphore = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._stats = _LatencyStats()
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(LLM_POOL_SIZE, max_concurrency))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+
+    def complete(self, prompt: str, kind: str = "chat", timeout: Optional[float] = None) -> str:
+        """
+        프롬프트 1건 호출
+
+        Args:
+            prompt: 프롬프트
+            kind: 지표 구분용 호출 종류 ("chat", "summary", ...)
+            timeout: 요청 1회 타임아웃(초), 기본 RESPONSE_TIMEOUT
+
+        Returns:
+            응답 텍스트
+
+        Raises:
+            LLMUnavailableError: 서킷 브레이커 차단 중
+            LLMBusyError: 동시 호출 한도 대기 초과
+            requests.exceptions.RequestException: 재시도 후에도 실패
+        """
+        if not self.breaker.allow():
+            self._stats.record(kind, 0.0, ok=False, attempts=0)
+            raise LLMUnavailableError("POTENS API가 일시적으로 응답하지 않아 호출을 차단했습니다. 잠시 후 다시 시도해주세요.")
+
+        started = time.perf_counter()
+        if not self._semaphore.acquire(timeout=LLM_CONCURRENCY_WAIT):
+            self.breaker.release_trial()
+            self._stats.record(kind, (time.perf_counter() - started) * 1000, ok=False, attempts=0)
+            raise LLMBusyError("동시 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.")
+
+        attempts = 0
+        try:
+            while True:
+                attempts += 1
+                try:
+                    response = self._session.post(
+                        self.api_url,
+                        json={"prompt": prompt},
+                        timeout=timeout or self.timeout,
+                    )
+                    if response.status_code in _RETRY_STATUSES and attempts <= self.max_retries:
+                        self._sleep_before_retry(kind, attempts, f"HTTP {response.status_code}", response)
+                        continue
+                    response.raise_for_status()
+                    text = parse_potens_response(response.json())
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    if attempts <= self.max_retries:
+                        self._sleep_before_retry(kind, attempts, type(e).__name__)
+                        continue
+                    self.breaker.record_failure()
+                    raise
+                except requests.exceptions.HTTPError as e:
+                    status = e.response.status_code if e.response is not None else 0
+                    if status in _RETRY_STATUSES:
+                        self.breaker.record_failure()
+                    else:
+                        # 4xx(요청 문제)는 업스트림 장애가 아니므로 차단 판단에서 제외
+                        self.breaker.release_trial()
+                    raise
+                except Exception:
+                    self.breaker.release_trial()
+                    raise
+
+                self.breaker.record_success()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self._stats.record(kind, elapsed_ms, ok=True, attempts=attempts)
+                print(f"[llm] {kind} {elapsed_ms:.0f}ms (시도 {attempts}회)")
+                return text
+        except Exception:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats.record(kind, elapsed_ms, ok=False, attempts=attempts)
+            print(f"[llm] {kind} 실패 {elapsed_ms:.0f}ms (시도 {attempts}회)")
+            raise
+        finally:
+            self._semaphore.release()
+
+    def stream(self, prompt: str, kind: str = "chat", timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        프롬프트 1건 스트리밍 호출 (응답 텍스트 조각 generator)
+
+        - LLM_STREAMING이 꺼져 있으면 complete() 결과를 chunk_text로 나눠 전달
+        - 스트리밍 연결이 실패하면 complete()(재시도 포함)로 대체
+        - 업스트림이 JSON 한 덩어리로 답하면(스트리밍 미지원) 그 결과를 나눠 전달
+        - 조각을 받기 시작한 뒤의 오류는 그대로 전파 (이미 보여준 내용이 있으므로 재시도하지 않음)
+
+        Raises:
+            complete()와 동일
+        """
+        if not LLM_STREAMING:
+            yield from chunk_text(self.complete(prompt, kind=kind, timeout=timeout))
+            return
+
+        if not self.breaker.allow():
+            self._stats.record(kind, 0.0, ok=False, attempts=0)
+            raise LLMUnavailableError("POTENS API가 일시적으로 응답하지 않아 호출을 차단했습니다. 잠시 후 다시 시도해주세요.")
+
+        started = time.perf_counter()
+        if not self._semaphore.acquire(timeout=LLM_CONCURRENCY_WAIT):
+            self.breaker.release_trial()
+            self._stats.record(kind, (time.perf_counter() - started) * 1000, ok=False, attempts=0)
+            raise LLMBusyError("동시 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.")
+
+        fallback = False
+        first_chunk_ms = None
+        try:
+            try:
+                response = self._session.post(
+                    self.api_url,
+                    json={"prompt": prompt, "stream": True},
+                    timeout=timeout or self.timeout,
+                    stream=True,
+                )
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"[llm] {kind} 스트리밍 연결 실패, 일반 호출로 대체: {e}")
+                self.breaker.release_trial()
+                fallback = True
+            else:
+                try:
+                    with response:
+                        if "text/event-stream" in response.headers.get("Content-Type", ""):
+                            pieces = _iter_sse_text(response)
+                        else:
+                            pieces = chunk_text(parse_potens_response(response.json()))
+                        for piece in pieces:
+                            if first_chunk_ms is None:
+                                first_chunk_ms = (time.perf_counter() - started) * 1000
+                            yield piece
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                        requests.exceptions.ChunkedEncodingError):
+                    self.breaker.record_failure()
+                    raise
+                except Exception:
+                    self.breaker.release_trial()
+                    raise
+                self.breaker.record_success()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self._stats.record(kind, elapsed_ms, ok=True, attempts=1)
+                print(f"[llm] {kind} 스트리밍 {elapsed_ms:.0f}ms (첫 조각 {first_chunk_ms or elapsed_ms:.0f}ms)")
+        except GeneratorExit:
+            # 화면 이탈 등으로 소비자가 중간에 멈춤 - 업스트림 장애가 아님
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats.record(kind, elapsed_ms, ok=False, attempts=1)
+            print(f"[llm] {kind} 스트리밍 실패 {elapsed_ms:.0f}ms")
+            raise
+        finally:
+            self._semaphore.release()
+
+        if fallback:
+            yield from chunk_text(self.complete(prompt, kind=kind, timeout=timeout))
+
+    def metrics(self) -> Dict:
+        return {
+            "breaker": self.breaker.state,
+            "calls": self._stats.snapshot(),
+        }
+
+    def _sleep_before_retry(self, kind: str, attempt: int, reason: str, response=None) -> None:
+        # full jitter: 0 ~ min(max, base * 2^(n-1))
+        delay = random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** (attempt - 1))))
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = min(LLM_BACKOFF_MAX, float(retry_after))
+        print(f"[llm] {kind} {reason}, {delay:.1f}초 후 재시도 ({attempt}/{self.max_retries})")
+        time.sleep(delay)
+
+
+_client: Optional[PotensClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> PotensClient:
+    """프로세스 전역 POTENS 클라이언트"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PotensClient()
+    return _client
+
+
+def get_llm_metrics() -> Dict:
+    """
+    POTENS 호출 지표
+
+    Returns:
+        {"breaker": "closed"|"open"|"half-open",
+         "calls": {kind: {"calls", "errors", "retries", "avg_ms", "p50_ms", "p95_ms", "max_ms"}}}
+    """
+    return get_llm_client().metrics()
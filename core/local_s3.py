@@ -0,0 +1,240 @@
+"""
+로컬 S3 호환 저장소 (R2 대역)
+
+R2_BACKEND=local 이면 core.storage.get_r2_client()가 boto3 대신 이 클라이언트를 돌려준다.
+R2 계정 없이 업로드/다운로드 경로(멀티파트, 병렬 업로드, ETag 재검증)를 실행하고
+처리량을 측정하기 위한 용도 (benchmarks/bench_r2_upload.py).
+
+- 객체는 R2_LOCAL_ROOT/<bucket>/<key>, 메타데이터(ETag, Content-Type)는 옆의 .meta.json
+- ETag는 S3와 같은 규칙 (단일 업로드: MD5, 멀티파트: 파트 MD5들의 MD5 + "-파트수")
+- R2_LOCAL_LATENCY_MS / R2_LOCAL_BANDWIDTH_MBPS로 요청당 지연과 연결당 대역폭을 흉내냄
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+R2_LOCAL_ROOT = Path(os.getenv("R2_LOCAL_ROOT", ".cache/r2"))
+R2_LOCAL_LATENCY_MS = float(os.getenv("R2_LOCAL_LATENCY_MS", "0"))
+R2_LOCAL_BANDWIDTH_MBPS = float(os.getenv("R2_LOCAL_BANDWIDTH_MBPS", "0"))   # 0 = 제한 없음
+
+
+class _Body:
+    """get_object의 Body (botocore StreamingBody의 read/iter_chunks만)"""
+
+    def __init__(self, f: BinaryIO, client: "LocalS3Client"):
+        self._f = f
+        self._client = client
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        data = self._f.read() if amt is None else self._f.read(amt)
+        self._client._transfer(len(data))
+        if amt is None or not data:
+            self._f.close()
+        return data
+
+    def iter_chunks(self, chunk_size: int = 1024 * 1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        self._f.close()
+
+
+class LocalS3Client:
+    """boto3 S3 클라이언트 중 이 앱이 쓰는 메서드만 파일시스템으로 구현"""
+
+    def __init__(self, root: Path = R2_LOCAL_ROOT):
+        self.root = Path(root)
+        self._uploads: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    # ----- 네트워크 흉내 -----
+    def _request(self) -> None:
+        if R2_LOCAL_LATENCY_MS > 0:
+            time.sleep(R2_LOCAL_LATENCY_MS / 1000.0)
+
+    def _transfer(self, nbytes: int) -> None:
+        if R2_LOCAL_BANDWIDTH_MBPS > 0 and nbytes:
+            time.sleep(nbytes / (R2_LOCAL_BANDWIDTH_MBPS * 1024 * 1024))
+
+    # ----- 경로 -----
+    def _path(self, bucket: str, key: str) -> Path:
+        path = (self.root / bucket / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"잘못된 키: {key}")
+        return path
+
+    @staticmethod
+    def _meta_path(path: Path) -> Path:
+        return path.with_name(path.name + ".meta.json")
+
+    def _commit(self, bucket: str, key: str, tmp: str, etag: str, content_type: Optional[str]) -> None:
+        path = self._path(bucket, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp, path)
+        with open(self._meta_path(path), "w", encoding="utf-8") as f:
+            json.dump({"ETag": etag, "ContentType": content_type or "binary/octet-stream"}, f)
+
+    def _tmp_file(self) -> str:
+        tmp_dir = self.root / ".tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=tmp_dir)
+        os.close(fd)
+        return tmp
+
+    @staticmethod
+    def _error(code: str, operation: str, status: int):
+        return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, operation)
+
+    # ----- 단일 객체 -----
+    def put_object(self, Bucket: str, Key: str, Body, ContentType: Optional[str] = None, **_) -> Dict:
+        self._request()
+        data = Body.read() if hasattr(Body, "read") else bytes(Body)
+        self._transfer(len(data))
+        tmp = self._tmp_file()
+        with open(tmp, "wb") as f:
+            f.write(data)
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        self._commit(Bucket, Key, tmp, etag, ContentType)
+        return {"ETag": etag}
+
+    def head_object(self, Bucket: str, Key: str, **_) -> Dict:
+        self._request()
+        path = self._path(Bucket, Key)
+        try:
+            with open(self._meta_path(path), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            size = path.stat().st_size
+        except FileNotFoundError:
+            raise self._error("404", "HeadObject", 404)
+        return {"ETag": meta["ETag"], "ContentType": meta["ContentType"], "ContentLength": size}
+
+    def get_object(self, Bucket: str, Key: str, IfNoneMatch: Optional[str] = None, **_) -> Dict:
+        try:
+            head = self.head_object(Bucket, Key)
+        except ClientError:
+            raise self._error("NoSuchKey", "GetObject", 404)
+        if IfNoneMatch and IfNoneMatch == head["ETag"]:
+            raise self._error("304", "GetObject", 304)
+        head["Body"] = _Body(open(self._path(Bucket, Key), "rb"), self)
+        return head
+
+    def delete_object(self, Bucket: str, Key: str, **_) -> Dict:
+        self._request()
+        path = self._path(Bucket, Key)
+        for p in (path, self._meta_path(path)):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+        return {}
+
+    # ----- 멀티파트 -----
+    def create_multipart_upload(self, Bucket: str, Key: str, ContentType: Optional[str] = None, **_) -> Dict:
+        self._request()
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._uploads[upload_id] = {"bucket": Bucket, "key": Key, "content_type": ContentType, "parts": {}}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body, **_) -> Dict:
+        self._request()
+        data = Body.read() if hasattr(Body, "read") else bytes(Body)
+        self._transfer(len(data))
+        tmp = self._tmp_file()
+        with open(tmp, "wb") as f:
+            f.write(data)
+        digest = hashlib.md5(data).digest()
+        with self._lock:
+            upload = self._uploads.get(UploadId)
+            if upload is None:
+                os.unlink(tmp)
+                raise self._error("NoSuchUpload", "UploadPart", 404)
+            upload["parts"][int(PartNumber)] = (tmp, digest)
+        return {"ETag": f'"{digest.hex()}"'}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: Dict, **_) -> Dict:
+        self._request()
+        with self._lock:
+            upload = self._uploads.pop(UploadId, None)
+        if upload is None:
+            raise self._error("NoSuchUpload", "CompleteMultipartUpload", 404)
+
+        numbers = [int(p["PartNumber"]) for p in MultipartUpload.get("Parts", [])]
+        tmp = self._tmp_file()
+        md5s = b""
+        with open(tmp, "wb") as out:
+            for n in numbers:
+                part_path, digest = upload["parts"][n]
+                with open(part_path, "rb") as f:
+                    shutil.copyfileobj(f, out)
+                md5s += digest
+        for part_path, _ in upload["parts"].values():
+            os.unlink(part_path)
+        etag = f'"{hashlib.md5(md5s).hexdigest()}-{len(numbers)}"'
+        self._commit(Bucket, Key, tmp, etag, upload["content_type"])
+        return {"ETag": etag}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **_) -> Dict:
+        with self._lock:
+            upload = self._uploads.pop(UploadId, None)
+        for part_path, _ in (upload or {}).get("parts", {}).values():
+            os.unlink(part_path)
+        return {}
+
+    # ----- boto3 managed transfer -----
+    def upload_fileobj(self, Fileobj: BinaryIO, Bucket: str, Key: str, ExtraArgs: Optional[Dict] = None, Config=None, **_) -> None:
+        """boto3 upload_fileobj와 같이 Config(TransferConfig)의 기준 크기 이상이면 멀티파트 병렬 업로드"""
+        extra = ExtraArgs or {}
+        threshold = getattr(Config, "multipart_threshold", 8 * 1024 * 1024)
+        chunk_size = getattr(Config, "multipart_chunksize", 8 * 1024 * 1024)
+        concurrency = getattr(Config, "max_concurrency", 10) if getattr(Config, "use_threads", True) else 1
+
+        first = Fileobj.read(threshold)
+        if len(first) < threshold:
+            self.put_object(Bucket=Bucket, Key=Key, Body=first, **extra)
+            return
+
+        upload_id = self.create_multipart_upload(Bucket=Bucket, Key=Key, **extra)["UploadId"]
+        rest = io.BytesIO(first)
+
+        def _chunks():
+            n = 1
+            while True:
+                chunk = rest.read(chunk_size)
+                if len(chunk) < chunk_size:
+                    chunk += Fileobj.read(chunk_size - len(chunk))
+                if not chunk:
+                    return
+                yield n, chunk
+                n += 1
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+                futures = [
+                    pool.submit(self.upload_part, Bucket=Bucket, Key=Key, UploadId=upload_id, PartNumber=n, Body=chunk)
+                    for n, chunk in _chunks()
+                ]
+                parts: List[Dict] = [
+                    {"PartNumber": i + 1, "ETag": f.result()["ETag"]} for i, f in enumerate(futures)
+                ]
+            self.complete_multipart_upload(
+                Bucket=Bucket, Key=Key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except Exception:
+            self.abort_multipart_upload(Bucket=Bucket, Key=Key, UploadId=upload_id)
+            raise
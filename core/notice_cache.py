@@ -0,0 +1,123 @@
+"""
+공지 상세 캐시 (프로세스 전역 LRU)
+
+챗봇 화면은 리런마다 대화 속 참조 공지를 모두 다시 그리므로
+get_post_by_id(공지 + 첨부 조회)가 참조 수만큼 반복된다.
+공지 상세(첨부 목록 포함)를 메모리에 두고 같은 공지는 DB를 다시 읽지 않는다.
+
+- 크기 상한(NOTICE_CACHE_SIZE)을 넘으면 오래 안 쓴 것부터 제거
+- service의 save_post/update_post/delete_post/save_attachments에서 해당 공지 무효화
+- 무효화마다 공지별 세대 번호를 올리고, 조회 전에 읽어 둔 세대와 다르면 put하지 않음
+  (수정 커밋 전에 읽은 내용이 무효화 뒤에 캐시에 들어가는 경쟁 방지)
+- 다른 프로세스에서 수정된 내용은 NOTICE_CACHE_TTL_SEC 안에 반영
+- 조회수는 캐시에 넣지 않음 (service에서 매번 DB 값 + 저장 전 증가분으로 채움)
+"""
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NOTICE_CACHE_ENABLED = os.getenv("NOTICE_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+NOTICE_CACHE_SIZE = int(os.getenv("NOTICE_CACHE_SIZE", "512"))
+NOTICE_CACHE_TTL_SEC = float(os.getenv("NOTICE_CACHE_TTL_SEC", "300"))
+
+
+class NoticeCache:
+    """post_id -> 공지 상세 dict (TTL + LRU)"""
+
+    def __init__(self, max_size: int = NOTICE_CACHE_SIZE, ttl: float = NOTICE_CACHE_TTL_SEC):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[float, Dict]]" = OrderedDict()
+        self._generations: Dict[int, int] = {}   # post_id -> 무효화 횟수
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, post_ids: Iterable[int]) -> Tuple[Dict[int, Dict], List[int]]:
+        """
+        Returns:
+            (캐시에 있는 공지 {post_id: dict 복사본}, 없는 post_id 목록)
+        """
+        found: Dict[int, Dict] = {}
+        missing: List[int] = []
+        now = time.monotonic()
+        with self._lock:
+            for post_id in post_ids:
+                post_id = int(post_id)
+                if post_id in found or post_id in missing:
+                    continue
+                entry = self._entries.get(post_id)
+                if entry is None or now >= entry[0]:
+                    if entry is not None:
+                        del self._entries[post_id]
+                    missing.append(post_id)
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(post_id)
+                found[post_id] = copy.deepcopy(entry[1])
+                self.hits += 1
+        return found, missing
+
+    def get(self, post_id: int) -> Optional[Dict]:
+        found, _ = self.get_many([post_id])
+        return found.get(int(post_id))
+
+    def generations(self, post_ids: Iterable[int]) -> Dict[int, int]:
+        """조회 전에 읽어 두었다가 put에 넘기는 공지별 세대 번호"""
+        with self._lock:
+            return {int(p): self._generations.get(int(p), 0) for p in post_ids}
+
+    def put(self, post_id: int, post: Dict, generation: int) -> bool:
+        """
+        Args:
+            generation: 조회 전에 generations()로 읽은 값 (그 사이 무효화됐으면 넣지 않음)
+
+        Returns:
+            캐시에 넣었는지 여부
+        """
+        post_id = int(post_id)
+        with self._lock:
+            if self._generations.get(post_id, 0) != generation:
+                return False
+            self._entries[post_id] = (time.monotonic() + self.ttl, copy.deepcopy(post))
+            self._entries.move_to_end(post_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, post_id: int) -> None:
+        post_id = int(post_id)
+        with self._lock:
+            self._entries.pop(post_id, None)
+            self._generations[post_id] = self._generations.get(post_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_cache: Optional[NoticeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_notice_cache() -> NoticeCache:
+    """프로세스 전역 공지 상세 캐시"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = NoticeCache()
+    return _cache
+
+
+def invalidate_notice(post_id: int) -> None:
+    """공지 저장/수정/삭제/첨부 추가 후 호출"""
+    if _cache is not None:
+        _cache.invalidate(post_id)
@@ -0,0 +1,290 @@
+"""
+공지 검색 인덱스 (챗봇 컨텍스트 선택용)
+
+- 한국어 형태소 분석기 없이 동작하도록 문자 n-gram(2, 3글자) 단위로 색인
+  예) "연차신청을" -> 연차, 차신, 신청, 청을, 연차신, 차신청, 신청을
+- BM25로 질문과 공지의 관련도를 계산해서 상위 k개를 문자 수 예산 안에서 선택
+- 프로세스 메모리에 보관하고, 처음 사용할 때 DB에서 한 번 적재
+- service.save_post / update_post / delete_post 에서 해당 공지만 갱신
+- 다른 프로세스에서 바뀐 공지는 NOTICE_INDEX_REFRESH_SEC 주기로 전체 재적재해서 반영
+"""
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from core.db import get_conn
+
+NOTICE_INDEX_REFRESH_SEC = float(os.getenv("NOTICE_INDEX_REFRESH_SEC", "300"))
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 제목은 본문보다 짧고 핵심어가 많으므로 가중치를 더 줌 (제목 n-gram을 여러 번 센다)
+TITLE_WEIGHT = 3
+
+_NGRAM_SIZES = (2, 3)
+_NON_WORD = re.compile(r"[^가-힣a-zA-Z0-9]+")
+
+# 챗봇 컨텍스트에서 공지 1건당 본문 최대 길이 (ChatbotEngine._build_context와 동일)
+CONTEXT_CONTENT_LIMIT = 500
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    문자 n-gram 토큰화
+
+    Args:
+        text: 원문
+
+    Returns:
+        n-gram 리스트 (단어 경계를 넘지 않음, 1글자 단어는 그대로 사용)
+    """
+    grams: List[str] = []
+    for word in _NON_WORD.split((text or "").lower()):
+        if not word:
+            continue
+        if len(word) == 1:
+            grams.append(word)
+            continue
+        for n in _NGRAM_SIZES:
+            if len(word) < n:
+                continue
+            grams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+def context_cost(notice: Dict) -> int:
+    """컨텍스트에 넣었을 때 차지하는 대략적인 문자 수 (제목 + 잘린 본문 + 머리글)"""
+    content = notice.get("content") or ""
+    return len(notice.get("title") or "") + min(len(content), CONTEXT_CONTENT_LIMIT + 3) + 60
+
+
+class NoticeIndex:
+    """
+    공지 BM25 역색인
+
+    - _docs: post_id -> 공지 dict (post_id, title, content, department, date, type)
+    - _tf: post_id -> Counter(n-gram)
+    - _postings: n-gram -> {post_id: tf}
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._docs: Dict[int, Dict] = {}
+        self._tf: Dict[int, Counter] = {}
+        self._lengths: Dict[int, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+        self._loaded_at: Optional[float] = None
+
+    # ----- 적재/갱신 -----
+    def load_all(self) -> int:
+        """DB 전체 공지로 인덱스를 새로 구성 (구성 후 한 번에 교체)"""
+        fresh = NoticeIndex()
+        for row in _fetch_notices():
+            fresh._add(row)
+
+        with self._lock:
+            self._docs = fresh._docs
+            self._tf = fresh._tf
+            self._lengths = fresh._lengths
+            self._postings = fresh._postings
+            self._total_length = fresh._total_length
+            self._loaded_at = time.monotonic()
+            return len(self._docs)
+
+    def ensure_loaded(self) -> None:
+        if not self._is_stale():
+            return
+        # 동시에 여러 세션이 재적재하지 않도록 (검색은 기존 인덱스로 계속 진행)
+        with self._load_lock:
+            if self._is_stale():
+                self.load_all()
+
+    def _is_stale(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at >= NOTICE_INDEX_REFRESH_SEC
+
+    def refresh(self, post_id: int) -> None:
+        """공지 1건을 DB에서 다시 읽어 반영 (없으면 제거). 아직 적재 전이면 무시"""
+        if self._loaded_at is None:
+            return
+        rows = _fetch_notices(post_id)
+        with self._lock:
+            self._remove(int(post_id))
+            for row in rows:
+                self._add(row)
+
+    def remove(self, post_id: int) -> None:
+        if self._loaded_at is None:
+            return
+        with self._lock:
+            self._remove(int(post_id))
+
+    # ----- 검색 -----
+    def search(self, query: str, k: int = 8, char_budget: int = 6000) -> List[Dict]:
+        """
+        관련 공지 검색
+
+        Args:
+            query: 검색어 (질문 또는 추출된 키워드)
+            k: 최대 공지 수
+            char_budget: 선택된 공지들의 컨텍스트 문자 수 합계 상한
+
+        Returns:
+            관련도 내림차순 공지 리스트 (각 dict에 score 포함)
+        """
+        self.ensure_loaded()
+        terms = Counter(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            n_docs = len(self._docs)
+            if n_docs == 0:
+                return []
+            avg_len = self._total_length / n_docs
+
+            scores: Dict[int, float] = {}
+            for term, qtf in terms.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for post_id, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[post_id] / avg_len)
+                    scores[post_id] = scores.get(post_id, 0.0) + qtf * idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+            ranked = sorted(scores.items(), key=lambda x: (x[1], x[0]), reverse=True)
+            return self._within_budget(((pid, s) for pid, s in ranked), k, char_budget)
+
+    def recent(self, k: int = 5, char_budget: int = 6000, exclude: Iterable[int] = ()) -> List[Dict]:
+        """최신 공지 (날짜, post_id 내림차순)"""
+        self.ensure_loaded()
+        exclude = set(exclude)
+        with self._lock:
+            ordered = sorted(
+                (d for d in self._docs.values() if d["post_id"] not in exclude),
+                key=lambda d: (d.get("date") or "", d["post_id"]),
+                reverse=True,
+            )
+            return self._within_budget(((d["post_id"], 0.0) for d in ordered), k, char_budget)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "terms": len(self._postings),
+                "avg_length": (self._total_length / len(self._docs)) if self._docs else 0,
+            }
+
+    # ----- 내부 -----
+    def _within_budget(self, ranked, k: int, char_budget: int) -> List[Dict]:
+        result: List[Dict] = []
+        used = 0
+        for post_id, score in ranked:
+            if len(result) >= k:
+                break
+            doc = self._docs[post_id]
+            cost = context_cost(doc)
+            if used + cost > char_budget:
+                # 큰 공지 하나 때문에 멈추지 않고, 더 작은 다음 후보는 계속 시도
+                continue
+            used += cost
+            result.append({**doc, "score": round(score, 4)})
+        return result
+
+    def _add(self, row: Dict) -> None:
+        post_id = int(row["post_id"])
+        tf = Counter(tokenize(row.get("content") or ""))
+        for gram in tokenize(row.get("title") or ""):
+            tf[gram] += TITLE_WEIGHT
+        for gram in tokenize(row.get("department") or ""):
+            tf[gram] += 1
+
+        length = sum(tf.values())
+        self._docs[post_id] = row
+        self._tf[post_id] = tf
+        self._lengths[post_id] = length
+        self._total_length += length
+        for gram, count in tf.items():
+            self._postings.setdefault(gram, {})[post_id] = count
+
+    def _remove(self, post_id: int) -> None:
+        tf = self._tf.pop(post_id, None)
+        if tf is None:
+            return
+        self._docs.pop(post_id, None)
+        self._total_length -= self._lengths.pop(post_id, 0)
+        for gram in tf:
+            postings = self._postings.get(gram)
+            if postings is None:
+                continue
+            postings.pop(post_id, None)
+            if not postings:
+                del self._postings[gram]
+
+
+def _fetch_notices(post_id: Optional[int] = None) -> List[Dict]:
+    """인덱스용 공지 조회 (SQLite/PostgreSQL 공통 SQL, 기본값은 파이썬에서 채움)"""
+    sql = "SELECT post_id, title, content, department, date, type, created_at FROM notices"
+    params: tuple = ()
+    if post_id is not None:
+        sql += " WHERE post_id = ?"
+        params = (int(post_id),)
+
+    with get_conn() as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    result = []
+    for r in rows:
+        date = r["date"]
+        if not date and r["created_at"]:
+            date = datetime.fromtimestamp(int(r["created_at"]) / 1000).strftime("%Y-%m-%d")
+        result.append({
+            "post_id": int(r["post_id"]),
+            "title": r["title"] or "",
+            "content": r["content"] or "",
+            "department": r["department"] or "전체",
+            "date": str(date or ""),
+            "type": r["type"] or "일반",
+        })
+    return result
+
+
+_index: Optional[NoticeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_notice_index() -> NoticeIndex:
+    """프로세스 전역 공지 인덱스"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = NoticeIndex()
+    return _index
+
+
+def notice_changed(post_id: int) -> None:
+    """공지 저장/수정 후 호출 (인덱스 갱신 실패가 저장을 막지 않도록 예외는 로그만)"""
+    try:
+        get_notice_index().refresh(post_id)
+    except Exception as e:
+        print(f"[notice_index] 공지 {post_id} 색인 갱신 실패 (다음 재적재 때 반영): {e}")
+
+
+def notice_deleted(post_id: int) -> None:
+    """공지 삭제 후 호출"""
+    try:
+        get_notice_index().remove(post_id)
+    except Exception as e:
+        print(f"[notice_index] 공지 {post_id} 색인 삭제 실패: {e}")
@@ -0,0 +1,300 @@
+"""
+팝업 알림 허브 (in-process pub/sub)
+
+직원 홈 화면은 rerun마다 DB를 조회하는 대신, 이 허브의 "버전"만 확인하고
+자신(사번/팀/본부)에게 해당하는 알림이 왔을 때만 DB를 조회한다.
+
+- service.create_popup        -> 대상 팀/본부로 publish
+- service.record_popup_action -> 응답한 직원 본인에게 publish (다음 대기 팝업 재조회용)
+
+백엔드 (NOTIFY_BACKEND):
+- local    : 같은 프로세스 안에서만 전달 (기본값, 단일 Streamlit 서버)
+- postgres : PostgreSQL LISTEN/NOTIFY로 여러 서버 프로세스에 전달
+- file     : 공유 파일(JSON Lines)을 tail 하는 방식 (테스트/로컬 다중 프로세스용)
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+NOTIFY_BACKEND = os.getenv("NOTIFY_BACKEND", "local").lower()
+NOTIFY_PG_CHANNEL = os.getenv("NOTIFY_PG_CHANNEL", "notiguard_popups")
+NOTIFY_FILE_PATH = os.getenv("NOTIFY_FILE_PATH", ".notify_events.jsonl")
+NOTIFY_FILE_POLL_INTERVAL = float(os.getenv("NOTIFY_FILE_POLL_INTERVAL", "0.5"))
+NOTIFY_FILE_MAX_BYTES = int(os.getenv("NOTIFY_FILE_MAX_BYTES", str(1024 * 1024)))   # 넘으면 <파일>.1로 넘기고 새 파일에 기록
+
+# 알림 유실(백엔드 재연결 등)에 대비해 이 주기(초)마다는 알림이 없어도 DB를 다시 확인
+NOTIFY_RESYNC_SEC = float(os.getenv("NOTIFY_RESYNC_SEC", "60"))
+
+
+# -------------------------
+# 백엔드
+# -------------------------
+class LocalNotifyBackend:
+    """같은 프로세스 안에서 바로 전달"""
+
+    def start(self, deliver: Callable[[Dict], None]):
+        self._deliver = deliver
+
+    def publish(self, event: Dict):
+        self._deliver(event)
+
+    def stop(self):
+        pass
+
+
+class PostgresNotifyBackend:
+    """
+    PostgreSQL LISTEN/NOTIFY 백엔드
+
+    - publish: pg_notify(channel, json) (커밋 시점에 모든 리스너로 전달)
+    - 수신: 전용 연결 1개로 LISTEN 하는 데몬 스레드
+    - 자기 자신이 보낸 알림도 LISTEN으로 받으므로 로컬 직접 전달은 하지 않음
+    - 재연결 시에는 유실 가능성이 있으므로 전체 재조회({"all": True})를 전달
+    """
+
+    def __init__(self, channel: str = NOTIFY_PG_CHANNEL):
+        self.channel = channel
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, deliver: Callable[[Dict], None]):
+        self._deliver = deliver
+        self._thread = threading.Thread(target=self._listen_loop, name="notify-pg-listener", daemon=True)
+        self._thread.start()
+
+    def publish(self, event: Dict):
+        from core.db import get_conn
+
+        # pg_notify payload 한도(8000 bytes) 안에서 팀/본부 단위로만 보냄
+        with get_conn() as conn:
+            conn.execute("SELECT pg_notify(?, ?)", (self.channel, json.dumps(event, ensure_ascii=False)))
+
+    def stop(self):
+        self._stopped.set()
+
+    def _listen_loop(self):
+        import select
+        import psycopg2.extensions
+        from core.db import _connect_postgres
+
+        first = True
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = _connect_postgres()
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cur = conn.cursor()
+                cur.execute(f'LISTEN "{self.channel}"')
+
+                if not first:
+                    self._deliver({"all": True})
+                first = False
+
+                while not self._stopped.is_set():
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        n = conn.notifies.pop(0)
+                        try:
+                            self._deliver(json.loads(n.payload))
+                        except ValueError:
+                            print(f"[notify] 잘못된 알림 payload 무시: {n.payload[:100]}")
+            except Exception as e:
+                print(f"[notify] LISTEN 연결 오류, 3초 후 재시도: {e}")
+                time.sleep(3)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+class FileNotifyBackend:
+    """
+    공유 파일 백엔드 (JSON Lines append + tail)
+
+    같은 머신의 여러 프로세스가 같은 파일을 바라보면 서로 알림을 주고받는다.
+    시작 시점 이전의 이벤트는 무시한다.
+    파일이 max_bytes를 넘으면 <파일>.1로 이름을 바꾸고 새 파일에 기록한다.
+    (읽는 쪽은 파일이 바뀌거나 줄어든 것을 보면 처음부터 읽고 전체 재조회)
+    """
+
+    def __init__(self, path: str = NOTIFY_FILE_PATH, poll_interval: float = NOTIFY_FILE_POLL_INTERVAL,
+                 max_bytes: int = NOTIFY_FILE_MAX_BYTES):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.max_bytes = max_bytes
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, deliver: Callable[[Dict], None]):
+        self._deliver = deliver
+        self._inode, self._offset = self._stat()
+        self._thread = threading.Thread(target=self._tail_loop, name="notify-file-tail", daemon=True)
+        self._thread.start()
+
+    def publish(self, event: Dict):
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        self._rotate_if_full()
+        # O_APPEND 한 번의 write는 짧은 줄이면 프로세스 간에 섞이지 않음
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def stop(self):
+        self._stopped.set()
+
+    def _stat(self):
+        """(inode, 크기), 파일이 없으면 (None, 0)"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None, 0
+        return st.st_ino, st.st_size
+
+    def _rotate_if_full(self):
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+            os.replace(self.path, self.path + ".1")
+        except FileNotFoundError:
+            # 없거나 다른 프로세스가 먼저 넘긴 경우
+            pass
+
+    def _tail_loop(self):
+        while not self._stopped.is_set():
+            try:
+                self._read_new_lines()
+            except Exception as e:
+                print(f"[notify] 알림 파일 읽기 실패: {e}")
+            self._stopped.wait(self.poll_interval)
+
+    def _read_new_lines(self):
+        inode, size = self._stat()
+        if inode is None:
+            return
+        if inode != self._inode or size < self._offset:
+            # 파일이 새로 만들어졌거나(로테이션) 비워졌으면 처음부터 다시 (놓친 알림이 있을 수 있으므로 전체 재조회)
+            self._inode, self._offset = inode, 0
+            self._deliver({"all": True})
+        if size == self._offset:
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+
+        # 마지막 줄이 아직 다 쓰이지 않았으면 다음 폴링에서 읽음
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return
+        self._offset += end + 1
+
+        for raw in chunk[: end + 1].splitlines():
+            if not raw.strip():
+                continue
+            try:
+                self._deliver(json.loads(raw.decode("utf-8")))
+            except ValueError:
+                print(f"[notify] 잘못된 알림 줄 무시: {raw[:100]!r}")
+
+
+# -------------------------
+# 허브
+# -------------------------
+class NotificationHub:
+    """
+    구독 키별 버전 카운터
+
+    - 키: "all", "emp:<사번>", "team:<팀>", "dept:<본부>"
+    - 알림이 오면 해당 키들의 버전을 전역 시퀀스로 갱신
+    - 세션은 자신의 키들 중 최대 버전만 기억했다가, 값이 바뀌었을 때만 DB 조회
+    """
+
+    def __init__(self, backend=None):
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._versions: Dict[str, int] = {}
+        self._backend = backend or LocalNotifyBackend()
+        self._backend.start(self._on_event)
+
+    def publish(self, *, employees: Iterable[str] = (), teams: Iterable[str] = (),
+                departments: Iterable[str] = (), everyone: bool = False):
+        event: Dict = {}
+        if everyone:
+            event["all"] = True
+        for field, values in (("employees", employees), ("teams", teams), ("departments", departments)):
+            values = [v for v in values if v]
+            if values:
+                event[field] = values
+        if event:
+            self._backend.publish(event)
+
+    def version_for(self, employee_id: str, team: Optional[str] = None, department: Optional[str] = None) -> int:
+        keys = self._subscriber_keys(employee_id, team, department)
+        with self._lock:
+            return max(self._versions.get(k, 0) for k in keys)
+
+    # ----- 내부 -----
+    @staticmethod
+    def _subscriber_keys(employee_id: str, team: Optional[str], department: Optional[str]) -> List[str]:
+        keys = ["all", f"emp:{employee_id}"]
+        if team:
+            keys.append(f"team:{team}")
+        if department:
+            keys.append(f"dept:{department}")
+        return keys
+
+    def _on_event(self, event: Dict):
+        keys = []
+        if event.get("all"):
+            keys.append("all")
+        keys += [f"emp:{v}" for v in event.get("employees") or []]
+        keys += [f"team:{v}" for v in event.get("teams") or []]
+        keys += [f"dept:{v}" for v in event.get("departments") or []]
+        if not keys:
+            return
+
+        with self._lock:
+            self._seq += 1
+            for k in keys:
+                self._versions[k] = self._seq
+
+
+_hub: Optional[NotificationHub] = None
+_hub_lock = threading.Lock()
+
+
+def _make_backend():
+    if NOTIFY_BACKEND == "postgres":
+        return PostgresNotifyBackend()
+    if NOTIFY_BACKEND == "file":
+        return FileNotifyBackend()
+    return LocalNotifyBackend()
+
+
+def get_hub() -> NotificationHub:
+    """프로세스 전역 허브 (모든 Streamlit 세션이 공유)"""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = NotificationHub(_make_backend())
+    return _hub
+
+
+def publish_popup_event(*, employees: Iterable[str] = (), teams: Iterable[str] = (),
+                        departments: Iterable[str] = ()) -> None:
+    """팝업 관련 알림 발행 (실패해도 호출한 쪽 트랜잭션에는 영향 없음)"""
+    try:
+        get_hub().publish(employees=employees, teams=teams, departments=departments)
+    except Exception as e:
+        print(f"[notify] 알림 발행 실패 (다음 재동기화 때 반영됨): {e}")
+
+
+def popup_version(employee_id: str, team: Optional[str] = None, department: Optional[str] = None) -> int:
+    """직원 세션이 구독하는 키들의 현재 버전 (DB 조회 없음)"""
+    return get_hub().version_for(employee_id, team, department)
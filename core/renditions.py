@@ -0,0 +1,111 @@
+"""
+이미지 첨부 축소본(rendition) 생성
+
+휴대폰 사진 원본(수 MB)을 팝업/게시판에 그대로 내려보내지 않도록
+save_attachments 시점에 고정 폭 몇 가지로 줄인 이미지를 만들어 원본과 함께 저장한다.
+
+- 폭은 ATTACHMENT_RENDITION_WIDTHS (원본보다 작은 폭만 생성)
+- 형식은 ATTACHMENT_RENDITION_FORMAT (webp | jpeg), webp 미지원 환경이면 jpeg
+- EXIF 회전 정보를 반영 (휴대폰 사진이 눕지 않게)
+- 애니메이션 GIF, SVG 등 Pillow로 열 수 없는 이미지는 원본만 사용
+- notice_files에 variant='w<폭>', source_file_id=원본 file_id로 기록 (원본은 variant='')
+"""
+import io
+import os
+from typing import Dict, List, Optional
+
+ATTACHMENT_RENDITIONS_ENABLED = os.getenv("ATTACHMENT_RENDITIONS_ENABLED", "1").lower() not in ("0", "false", "no")
+ATTACHMENT_RENDITION_WIDTHS = sorted(
+    {int(w) for w in os.getenv("ATTACHMENT_RENDITION_WIDTHS", "480,960").split(",") if w.strip()}
+)
+ATTACHMENT_RENDITION_FORMAT = os.getenv("ATTACHMENT_RENDITION_FORMAT", "webp").lower()
+ATTACHMENT_RENDITION_QUALITY = int(os.getenv("ATTACHMENT_RENDITION_QUALITY", "80"))
+
+# 화면별로 필요한 이미지 폭(px)
+POPUP_IMAGE_WIDTH = 480
+BOARD_IMAGE_WIDTH = 960
+
+
+def _output_format() -> str:
+    if ATTACHMENT_RENDITION_FORMAT == "webp":
+        from PIL import features
+        if features.check("webp"):
+            return "webp"
+    return "jpeg"
+
+
+def make_renditions(data: bytes, mime: str) -> List[Dict]:
+    """
+    이미지 축소본 생성
+
+    Args:
+        data: 원본 이미지 내용
+        mime: 원본 MIME 타입
+
+    Returns:
+        [{"width", "data", "mimeType", "ext"}] 폭 오름차순 (만들 수 없으면 빈 목록)
+    """
+    if not ATTACHMENT_RENDITIONS_ENABLED or not (mime or "").lower().startswith("image/"):
+        return []
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return []
+
+    try:
+        img = Image.open(io.BytesIO(data))
+        if getattr(img, "is_animated", False):
+            return []
+        # EXIF 회전(5~8: 90도 회전)을 반영한 표시 크기 기준으로 폭을 정함 (세로 휴대폰 사진)
+        rotated = img.getexif().get(0x0112, 1) in (5, 6, 7, 8)
+        disp_w, disp_h = (img.height, img.width) if rotated else (img.width, img.height)
+        widths = [w for w in ATTACHMENT_RENDITION_WIDTHS if w < disp_w]
+        if not widths:
+            return []
+        if img.format == "JPEG":
+            # 필요한 가장 큰 폭 이상으로만 디코딩 (큰 JPEG 디코딩 시간/메모리 절약)
+            # draft는 회전 전 저장 방향 기준이므로 회전된 사진은 가로/세로를 바꿔서 요청
+            need_w = widths[-1]
+            need_h = -(-need_w * disp_h // disp_w)
+            img.draft("RGB", (need_h, need_w) if rotated else (need_w, need_h))
+        img = ImageOps.exif_transpose(img)
+    except Exception as e:
+        print(f"[renditions] 이미지를 열 수 없어 원본만 사용: {e}")
+        return []
+
+    fmt = _output_format()
+    if fmt == "jpeg":
+        img = img.convert("RGB")
+    elif img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+
+    results: List[Dict] = []
+    # 큰 폭부터 차례로 줄여서 매번 원본을 다시 줄이지 않도록
+    current = img
+    for width in sorted(widths, reverse=True):
+        height = max(1, round(current.height * width / current.width))
+        current = current.resize((width, height), Image.LANCZOS)
+        buf = io.BytesIO()
+        current.save(buf, format=fmt.upper(), quality=ATTACHMENT_RENDITION_QUALITY)
+        results.append({
+            "width": width,
+            "data": buf.getvalue(),
+            "mimeType": f"image/{fmt}",
+            "ext": "jpg" if fmt == "jpeg" else fmt,
+        })
+    return sorted(results, key=lambda r: r["width"])
+
+
+def pick_rendition(attachment: Dict, width: int) -> str:
+    """
+    표시 폭에 맞는 가장 작은 이미지 경로 (맞는 축소본이 없으면 원본)
+
+    Args:
+        attachment: list_attachments 항목 (renditions 포함)
+        width: 표시할 폭(px)
+    """
+    best: Optional[Dict] = None
+    for r in attachment.get("renditions") or []:
+        if r["width"] >= width and (best is None or r["width"] < best["width"]):
+            best = r
+    return best["filePath"] if best else attachment.get("filePath", "")
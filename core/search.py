@@ -0,0 +1,206 @@
+"""
+공지 전문 검색 (ChatbotEngine.search_notices 백엔드)
+
+- SQLite: notices_fts (FTS5 trigram) MATCH + bm25 순위
+- PostgreSQL: pg_trgm GIN 인덱스를 타는 ILIKE + word_similarity 순위
+- 키워드가 3글자 미만이면 trigram 인덱스를 쓸 수 없으므로 LIKE 검색으로 대체
+- NOTICE_SEARCH_MODE=like 이면 항상 기존 LIKE 검색
+
+기존 공지 색인(백필):
+  python -m core.search --rebuild
+"""
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, List, Optional
+
+from core import db
+from core.db import NOTICES_SEARCH_EXPR, USE_POSTGRES, get_conn
+
+NOTICE_SEARCH_MODE = os.getenv("NOTICE_SEARCH_MODE", "fts").lower()
+
+# trigram 인덱스를 쓸 수 있는 최소 키워드 길이
+_MIN_TRIGRAM_LEN = 3
+
+# 제목/본문/부서 bm25 가중치 (SQLite)
+_BM25_WEIGHTS = (10.0, 1.0, 2.0)
+
+# 전문 검색 사용 가능 여부 (확인에 성공하면 프로세스당 1회, 실패하면 잠시 후 다시 확인)
+_fts_available: Optional[bool] = None
+_FTS_PROBE_RETRY_SEC = 30
+_fts_retry_at = 0.0
+
+
+def search_notices(keyword: str, limit: int = 20) -> List[Dict]:
+    """
+    키워드로 공지 검색
+
+    Args:
+        keyword: 검색 키워드
+        limit: 최대 결과 수
+
+    Returns:
+        공지 리스트 (post_id, title, content, department, date, type, rank)
+        rank가 클수록 관련도가 높음, 같은 rank면 최신순
+    """
+    keyword = (keyword or "").strip()
+    if not keyword:
+        return []
+
+    if NOTICE_SEARCH_MODE != "like" and len(keyword) >= _MIN_TRIGRAM_LEN and _is_fts_available():
+        try:
+            if USE_POSTGRES:
+                return _search_trgm_postgres(keyword, limit)
+            return _search_fts_sqlite(keyword, limit)
+        except Exception as e:
+            print(f"[search] 전문 검색 실패, LIKE 검색으로 대체: {e}")
+
+    return _search_like(keyword, limit)
+
+
+def _is_fts_available() -> bool:
+    global _fts_available, _fts_retry_at
+    if _fts_available is not None:
+        return _fts_available
+    if time.monotonic() < _fts_retry_at:
+        return False
+    try:
+        with get_conn() as conn:
+            if USE_POSTGRES:
+                row = conn.execute("SELECT 1 AS ok FROM pg_extension WHERE extname = 'pg_trgm'").fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT 1 AS ok FROM sqlite_master WHERE type='table' AND name='notices_fts'"
+                ).fetchone()
+    except Exception as e:
+        # 일시적인 DB 오류로 프로세스 내내 LIKE 검색에 머물지 않도록 결과를 기억하지 않음
+        print(f"[search] 전문 검색 사용 여부 확인 실패, {_FTS_PROBE_RETRY_SEC}초 후 다시 확인: {e}")
+        _fts_retry_at = time.monotonic() + _FTS_PROBE_RETRY_SEC
+        return False
+    _fts_available = row is not None
+    return _fts_available
+
+
+def _fts_phrase(keyword: str) -> str:
+    """FTS5 MATCH용 구문 (따옴표로 감싸서 연산자/특수문자를 문자 그대로 검색)"""
+    return '"' + keyword.replace('"', '""') + '"'
+
+
+def _search_fts_sqlite(keyword: str, limit: int) -> List[Dict]:
+    with get_conn() as conn:
+        cur = conn.execute(f"""
+            SELECT n.post_id, n.title, n.content,
+                   COALESCE(n.department, '전체') AS department,
+                   COALESCE(n.date, strftime('%Y-%m-%d', n.created_at/1000, 'unixepoch')) AS date,
+                   n.type,
+                   -bm25(notices_fts, {', '.join(str(w) for w in _BM25_WEIGHTS)}) AS rank
+            FROM notices_fts
+            JOIN notices n ON n.post_id = notices_fts.rowid
+            WHERE notices_fts MATCH ?
+            ORDER BY rank DESC, n.post_id DESC
+            LIMIT ?
+        """, (_fts_phrase(keyword), limit))
+        return [dict(r) for r in cur.fetchall()]
+
+
+def _search_trgm_postgres(keyword: str, limit: int) -> List[Dict]:
+    # 와일드카드는 파라미터로 전달 (psycopg2에서 SQL 안의 % 리터럴 충돌 방지)
+    with get_conn() as conn:
+        cur = conn.execute(f"""
+            SELECT post_id, title, content,
+                   COALESCE(department, '전체') AS department,
+                   COALESCE(date, to_char(to_timestamp(created_at / 1000), 'YYYY-MM-DD')) AS date,
+                   type,
+                   (2 * word_similarity(?, title) + word_similarity(?, content)) AS rank
+            FROM notices
+            WHERE ({NOTICES_SEARCH_EXPR}) ILIKE ?
+            ORDER BY rank DESC, post_id DESC
+            LIMIT ?
+        """, (keyword, keyword, f"%{_escape_like(keyword)}%", limit))
+        return [dict(r) for r in cur.fetchall()]
+
+
+def _escape_like(keyword: str) -> str:
+    return keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_like(keyword: str, limit: int) -> List[Dict]:
+    """기존 LIKE 검색 (전체 스캔, 날짜 기준 내림차순)"""
+    with get_conn() as conn:
+        if USE_POSTGRES:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT post_id, title, content, department, date, type, 0 AS rank
+                FROM notices
+                WHERE title LIKE %s OR content LIKE %s OR department LIKE %s
+                ORDER BY
+                    CASE
+                        WHEN date IS NOT NULL THEN date::date
+                        ELSE to_timestamp(created_at / 1000)::date
+                    END DESC,
+                    post_id DESC
+                LIMIT %s
+            """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", limit))
+            rows = cur.fetchall()
+            # RealDictCursor는 이미 dict-like 객체를 반환
+            return [dict(row) for row in rows]
+        else:
+            cur = conn.execute("""
+                SELECT post_id, title, content,
+                       COALESCE(department, '전체') as department,
+                       COALESCE(date, strftime('%Y-%m-%d', created_at/1000, 'unixepoch')) as date,
+                       type, 0 AS rank
+                FROM notices
+                WHERE title LIKE ? OR content LIKE ? OR department LIKE ?
+                ORDER BY
+                    CASE
+                        WHEN date IS NOT NULL THEN date
+                        ELSE strftime('%Y-%m-%d', created_at/1000, 'unixepoch')
+                    END DESC,
+                    post_id DESC
+                LIMIT ?
+            """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", limit))
+            return [dict(r) for r in cur.fetchall()]
+
+
+# -------------------------
+# 백필 (기존 공지 색인)
+# -------------------------
+def rebuild_search_index() -> bool:
+    """
+    전문 검색 인덱스 생성/재구성
+
+    - SQLite: notices_fts가 없으면 만들고 전체 공지를 다시 색인
+    - PostgreSQL: pg_trgm 확장/인덱스를 만들고 REINDEX
+
+    Returns:
+        전문 검색 사용 가능 여부
+    """
+    global _fts_available
+    if USE_POSTGRES:
+        conn = db._connect_postgres()
+        try:
+            ok = db._init_notices_trgm_postgres(conn, reindex=True)
+        finally:
+            conn.close()
+    else:
+        conn = sqlite3.connect(db.DB_PATH)
+        try:
+            ok = db._init_notices_fts_sqlite(conn, rebuild=True)
+            conn.commit()
+        finally:
+            conn.close()
+    _fts_available = ok
+    return ok
+
+
+if __name__ == "__main__":
+    if "--rebuild" not in sys.argv[1:]:
+        print("사용 방법: python -m core.search --rebuild")
+        sys.exit(1)
+    if rebuild_search_index():
+        print("✅ 공지 전문 검색 인덱스 재구성 완료")
+    else:
+        print("⚠️ 전문 검색을 사용할 수 없습니다 (LIKE 검색으로 동작)")
+        sys.exit(1)
@@ -0,0 +1,227 @@
+"""
+서명된 세션 토큰 (user_token 쿠키)
+
+쿠키에 login_id를 그대로 넣고 app.py가 열릴 때마다 get_account_info로 DB를 조회하고 있었다.
+(쿠키 값만 바꾸면 다른 사람으로 로그인되는 문제도 있음)
+
+- 토큰 = "v1.<payload>.<서명>" (base64url), 서명은 SESSION_TOKEN_SECRET으로 만든 HMAC-SHA256
+  payload: login_id, role, 직원 정보 스냅샷, 발급/만료 시각(epoch ms), 토큰 ID
+- 검증은 서명/만료만 확인하므로 DB를 조회하지 않음
+- 로그아웃한 토큰은 revoked_sessions에 기록하고, 프로세스마다 메모리에 들고 있다가
+  SESSION_REVOCATION_REFRESH_SEC마다 다시 읽음 (다른 프로세스의 로그아웃은 이 시간 안에 반영)
+  만료된 폐기 기록은 다시 읽을 때 정리
+- SESSION_TOKEN_SECRET이 없으면 SESSION_SECRET_FILE에 임의 키를 만들어 사용
+  (여러 인스턴스로 배포하면 모든 인스턴스에 같은 SESSION_TOKEN_SECRET을 설정해야 함)
+- 직원 정보는 로그인 시점 스냅샷 (이름/부서 변경은 다시 로그인하면 반영)
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from core.db import get_conn
+
+SESSION_TOKEN_SECRET = os.getenv("SESSION_TOKEN_SECRET", "")
+SESSION_SECRET_FILE = Path(os.getenv("SESSION_SECRET_FILE", ".cache/session_secret"))
+SESSION_TOKEN_TTL_SEC = int(os.getenv("SESSION_TOKEN_TTL_SEC", str(7 * 24 * 3600)))
+SESSION_REVOCATION_REFRESH_SEC = float(os.getenv("SESSION_REVOCATION_REFRESH_SEC", "30"))
+
+_VERSION = "v1"
+
+_secret: Optional[bytes] = None
+_secret_lock = threading.Lock()
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _b64e(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64d(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _get_secret() -> bytes:
+    global _secret
+    if _secret is None:
+        with _secret_lock:
+            if _secret is None:
+                _secret = _load_secret()
+    return _secret
+
+
+def _load_secret() -> bytes:
+    if SESSION_TOKEN_SECRET:
+        return SESSION_TOKEN_SECRET.encode("utf-8")
+    try:
+        return SESSION_SECRET_FILE.read_text(encoding="ascii").strip().encode("ascii")
+    except FileNotFoundError:
+        pass
+
+    print(f"[session_token] SESSION_TOKEN_SECRET이 없어 {SESSION_SECRET_FILE}에 임의 키 생성")
+    SESSION_SECRET_FILE.parent.mkdir(parents=True, exist_ok=True)
+    key = secrets.token_hex(32)
+    try:
+        fd = os.open(SESSION_SECRET_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # 다른 프로세스가 먼저 만든 경우
+        return SESSION_SECRET_FILE.read_text(encoding="ascii").strip().encode("ascii")
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(key)
+    return key.encode("ascii")
+
+
+def _sign(signing_input: str) -> str:
+    return _b64e(hmac.new(_get_secret(), signing_input.encode("ascii"), hashlib.sha256).digest())
+
+
+def _decode(token: str) -> Optional[Dict]:
+    """서명이 맞으면 payload (만료/폐기 여부는 확인하지 않음)"""
+    try:
+        version, body, sig = (token or "").split(".")
+        if version != _VERSION:
+            return None
+        if not hmac.compare_digest(sig, _sign(f"{version}.{body}")):
+            return None
+        payload = json.loads(_b64d(body))
+        return payload if isinstance(payload, dict) else None
+    except Exception:
+        return None
+
+
+# -------------------------
+# 폐기 목록
+# -------------------------
+class RevocationList:
+    """폐기된 토큰 ID 목록 (프로세스 전역 1개, get_revocation_list로 사용)"""
+
+    def __init__(self, refresh_sec: float = SESSION_REVOCATION_REFRESH_SEC):
+        self.refresh_sec = refresh_sec
+        self._lock = threading.Lock()
+        self._revoked: Dict[str, int] = {}   # token_id -> 토큰 만료 시각(ms)
+        self._loaded_at = 0.0
+
+    def is_revoked(self, token_id: str) -> bool:
+        if time.time() - self._loaded_at >= self.refresh_sec:
+            self.refresh()
+        with self._lock:
+            return token_id in self._revoked
+
+    def refresh(self) -> None:
+        """DB의 폐기 목록 다시 읽기 (실패하면 기존 목록 유지)"""
+        now = _now_ms()
+        try:
+            with get_conn() as conn:
+                conn.execute("DELETE FROM revoked_sessions WHERE expires_at <= ?", (now,))
+                rows = conn.execute("SELECT token_id, expires_at FROM revoked_sessions").fetchall()
+        except Exception as e:
+            print(f"[session_token] 폐기 목록 조회 실패, 기존 목록 사용: {e}")
+            self._loaded_at = time.time()
+            return
+        with self._lock:
+            self._revoked = {r["token_id"]: int(r["expires_at"]) for r in rows}
+            self._loaded_at = time.time()
+
+    def revoke(self, token_id: str, login_id: str, expires_at: int) -> None:
+        with get_conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO revoked_sessions(token_id, login_id, expires_at, revoked_at)
+                VALUES(?, ?, ?, ?)
+                ON CONFLICT(token_id) DO NOTHING
+                """,
+                (token_id, login_id, int(expires_at), _now_ms()),
+            )
+        with self._lock:
+            self._revoked[token_id] = int(expires_at)
+
+
+_revocations: Optional[RevocationList] = None
+_revocations_lock = threading.Lock()
+
+
+def get_revocation_list() -> RevocationList:
+    global _revocations
+    if _revocations is None:
+        with _revocations_lock:
+            if _revocations is None:
+                _revocations = RevocationList()
+    return _revocations
+
+
+# -------------------------
+# 공개 함수
+# -------------------------
+def issue_session_token(info: Dict, ttl_sec: int = SESSION_TOKEN_TTL_SEC) -> str:
+    """
+    로그인 결과로 세션 토큰 발급
+
+    Args:
+        info: service.login_account 반환값 (loginId, role, employee)
+        ttl_sec: 유효 시간(초)
+    """
+    now = _now_ms()
+    payload = {
+        "sub": info["loginId"],
+        "role": info["role"],
+        "emp": info.get("employee"),
+        "iat": now,
+        "exp": now + int(ttl_sec) * 1000,
+        "jti": secrets.token_urlsafe(12),
+    }
+    body = _b64e(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return f"{_VERSION}.{body}.{_sign(f'{_VERSION}.{body}')}"
+
+
+def verify_session_token(token: str) -> Optional[Dict]:
+    """
+    세션 토큰 검증 (DB 조회 없음, 폐기 목록은 메모리에서 확인)
+
+    Returns:
+        service.get_account_info와 같은 형식 {"loginId", "role", "employee"}
+        서명이 틀리거나 만료/폐기된 토큰이면 None
+    """
+    payload = _decode(token)
+    if not payload:
+        return None
+    try:
+        if int(payload["exp"]) <= _now_ms():
+            return None
+        role = payload["role"]
+        if role not in ("ADMIN", "EMPLOYEE") or (role == "EMPLOYEE" and not payload.get("emp")):
+            return None
+        if get_revocation_list().is_revoked(str(payload["jti"])):
+            return None
+        return {"loginId": payload["sub"], "role": role, "employee": payload.get("emp") if role == "EMPLOYEE" else None}
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def revoke_session_token(token: str) -> bool:
+    """
+    로그아웃 시 토큰 폐기 (만료 전까지 revoked_sessions에 보관)
+
+    Returns:
+        폐기했으면 True (서명이 틀리거나 이미 만료된 토큰이면 False)
+    """
+    payload = _decode(token)
+    if not payload:
+        return False
+    try:
+        expires_at = int(payload["exp"])
+        if expires_at <= _now_ms():
+            return False
+        get_revocation_list().revoke(str(payload["jti"]), str(payload["sub"]), expires_at)
+        return True
+    except Exception as e:
+        print(f"[session_token] 토큰 폐기 실패: {e}")
+        return False
@@ -0,0 +1,139 @@
+"""
+레이아웃 정적 자원 (플로팅 위젯 이미지, 포털 테마 CSS)
+
+플로팅 위젯은 리런마다 assets/ 이미지를 읽어 base64로 인코딩한 data URL을
+components.html에 넣고 있었고(240KB 가량), 포털 테마 CSS도 리런마다 통째로 다시 보내고 있었다.
+
+- 내용의 SHA-256 앞 16자리를 파일명에 넣어 static/cache/에 한 번만 기록하고
+  Streamlit 정적 파일 서빙(app/static/...) URL을 사용 (내용이 바뀌면 URL도 바뀜)
+- server.enableStaticServing이 꺼져 있으면 data URL로 대신하되 (경로, 수정 시각, 크기)별로 한 번만 인코딩
+- 이미지는 표시 크기(max_px)에 맞게 줄여서 저장 (원본 1024x1536 PNG를 200px 위젯에 쓰지 않도록)
+"""
+import base64
+import hashlib
+import io
+import mimetypes
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Streamlit은 메인 스크립트(app.py) 옆 static/ 폴더를 app/static/ 으로 서빙
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+STATIC_CACHE_DIR = STATIC_DIR / "cache"
+STATIC_URL_PREFIX = "app/static/cache"
+
+_memo: Dict[Tuple, object] = {}
+_memo_lock = threading.Lock()
+
+
+def static_serving_enabled() -> bool:
+    import streamlit as st
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def _content_name(stem: str, data: bytes, ext: str) -> str:
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:16]}{ext}"
+
+
+def _publish(name: str, data: bytes) -> str:
+    """static/cache/<name>에 기록 (이미 있으면 그대로) 후 URL 반환"""
+    path = STATIC_CACHE_DIR / name
+    if not path.exists():
+        STATIC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=STATIC_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)   # mkstemp 기본 0600
+        os.replace(tmp, path)
+    return f"{STATIC_URL_PREFIX}/{name}"
+
+
+def _fit_image(data: bytes, max_px: int) -> Tuple[bytes, str]:
+    """
+    이미지를 max_px x max_px 안에 들어가게 축소 (비율 유지)
+
+    Returns:
+        (내용, 확장자) 축소할 수 없으면 원본 그대로 (확장자는 빈 문자열)
+    """
+    try:
+        from PIL import Image, features
+    except ImportError:
+        return data, ""
+    try:
+        img = Image.open(io.BytesIO(data))
+        if img.width <= max_px and img.height <= max_px:
+            return data, ""
+        img.thumbnail((max_px, max_px), Image.LANCZOS)
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+        buf = io.BytesIO()
+        if features.check("webp"):
+            img.save(buf, format="WEBP", quality=90, method=6)
+            return buf.getvalue(), ".webp"
+        img.save(buf, format="PNG", optimize=True)
+        return buf.getvalue(), ".png"
+    except Exception as e:
+        print(f"[static_assets] 이미지 축소 실패, 원본 사용: {e}")
+        return data, ""
+
+
+def image_url(img_path: str, max_px: Optional[int] = None) -> Optional[str]:
+    """
+    이미지 URL (정적 서빙 URL 또는 data URL), 파일이 없으면 None
+
+    Args:
+        img_path: 이미지 파일 경로
+        max_px: 표시 크기(px), 주면 이 크기 안에 들어가게 줄임 (고해상도 화면을 위해 보통 표시 폭의 2배)
+    """
+    p = Path(img_path)
+    try:
+        st_ = p.stat()
+    except FileNotFoundError:
+        return None
+
+    serve = static_serving_enabled()
+    key = ("image", str(p.resolve()), st_.st_mtime_ns, st_.st_size, max_px, serve)
+    with _memo_lock:
+        if key in _memo:
+            return _memo[key]
+
+    data = p.read_bytes()
+    ext = ""
+    if max_px:
+        data, ext = _fit_image(data, max_px)
+    ext = ext or p.suffix.lower()
+
+    if serve:
+        url = _publish(_content_name(p.stem, data, ext), data)
+    else:
+        mime = mimetypes.guess_type(f"x{ext}")[0] or "image/png"
+        url = f"data:{mime};base64,{base64.b64encode(data).decode('utf-8')}"
+
+    with _memo_lock:
+        _memo[key] = url
+    return url
+
+
+def stylesheet(name: str, css: str) -> Tuple[str, Optional[str]]:
+    """
+    CSS를 내용 해시 이름으로 등록
+
+    Returns:
+        (해시가 들어간 요소 id, 정적 서빙 URL) 정적 서빙이 꺼져 있으면 URL은 None
+    """
+    serve = static_serving_enabled()
+    key = ("css", name, css, serve)
+    with _memo_lock:
+        if key in _memo:
+            return _memo[key]
+
+    data = css.encode("utf-8")
+    css_id = f"{name}-{hashlib.sha256(data).hexdigest()[:16]}"
+    result = (css_id, _publish(_content_name(name, data, ".css"), data) if serve else None)
+    with _memo_lock:
+        _memo[key] = result
+    return result
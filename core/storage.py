@@ -3,9 +3,12 @@ Cloudflare R2 Storage Module
 Railway 배포 시 파일 업로드를 R2에 저장
 """
 import os
+import threading
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
-from typing import Optional, BinaryIO
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, BinaryIO, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -19,11 +22,48 @@ R2_SECRET_ACCESS_KEY = os.getenv("R2_SECRET_ACCESS_KEY", "")
 R2_BUCKET_NAME = os.getenv("R2_BUCKET_NAME", "notiguard-files")
 R2_PUBLIC_URL = os.getenv("R2_PUBLIC_URL", "")  # 커스텀 도메인 또는 R2.dev URL
 
+# r2: Cloudflare R2 / local: 로컬 S3 호환 저장소 (core/local_s3.py, R2 계정 없이 실행·벤치마크용)
+R2_BACKEND = os.getenv("R2_BACKEND", "r2").lower()
+
+# 연결/업로드 튜닝
+R2_MAX_POOL_CONNECTIONS = int(os.getenv("R2_MAX_POOL_CONNECTIONS", "16"))
+R2_UPLOAD_WORKERS = int(os.getenv("R2_UPLOAD_WORKERS", "4"))                 # 여러 파일 동시 업로드 수
+R2_MULTIPART_THRESHOLD_MB = float(os.getenv("R2_MULTIPART_THRESHOLD_MB", "8"))  # 이 크기 이상이면 멀티파트
+R2_MULTIPART_CHUNK_MB = float(os.getenv("R2_MULTIPART_CHUNK_MB", "8"))          # 파트 크기 (R2 최소 5MB)
+R2_MULTIPART_CONCURRENCY = int(os.getenv("R2_MULTIPART_CONCURRENCY", "4"))      # 파일 1개의 파트 동시 업로드 수
+
 # Railway 환경 감지 (DATABASE_URL이 있으면 Railway 환경)
 IS_RAILWAY = bool(os.getenv("DATABASE_URL"))
 
+# R2(또는 로컬 S3 대역)에 저장할지 여부
+USE_R2 = IS_RAILWAY or R2_BACKEND == "local"
+
+_MB = 1024 * 1024
+
+_client = None
+_client_lock = threading.Lock()
+
+
 def get_r2_client():
-    """Cloudflare R2 S3 호환 클라이언트 생성"""
+    """
+    Cloudflare R2 S3 호환 클라이언트 (프로세스 전역 1개 재사용)
+
+    boto3 클라이언트는 만들 때 CPU 비용이 크고 연결 풀도 클라이언트별이라
+    요청마다 새로 만들면 매번 다시 연결한다. 클라이언트는 스레드 안전하므로 공유한다.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_r2_client()
+    return _client
+
+
+def _create_r2_client():
+    if R2_BACKEND == "local":
+        from core.local_s3 import LocalS3Client
+        return LocalS3Client()
+
     if not all([R2_ACCOUNT_ID, R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY]):
         raise ValueError("R2 환경변수가 설정되지 않았습니다.")
 
@@ -35,11 +75,25 @@ def get_r2_client():
         endpoint_url=endpoint_url,
         aws_access_key_id=R2_ACCESS_KEY_ID,
         aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-        config=Config(signature_version='s3v4'),
+        config=Config(
+            signature_version='s3v4',
+            max_pool_connections=max(R2_MAX_POOL_CONNECTIONS, R2_UPLOAD_WORKERS * R2_MULTIPART_CONCURRENCY),
+            retries={'max_attempts': 3, 'mode': 'standard'},
+        ),
         region_name='auto'  # R2는 자동 리전
     )
 
 
+def _transfer_config() -> TransferConfig:
+    """멀티파트 업로드 설정 (R2는 마지막 파트를 제외하고 파트당 최소 5MB)"""
+    return TransferConfig(
+        multipart_threshold=int(R2_MULTIPART_THRESHOLD_MB * _MB),
+        multipart_chunksize=int(max(5.0, R2_MULTIPART_CHUNK_MB) * _MB),
+        max_concurrency=max(1, R2_MULTIPART_CONCURRENCY),
+        use_threads=R2_MULTIPART_CONCURRENCY > 1,
+    )
+
+
 def upload_file_to_r2(
     file_data: BinaryIO,
     filename: str,
@@ -70,12 +124,13 @@ def upload_file_to_r2(
     if content_type:
         extra_args['ContentType'] = content_type
 
-    # R2에 업로드
+    # R2에 업로드 (큰 파일은 멀티파트로 파트 병렬 업로드)
     s3.upload_fileobj(
         file_data,
         R2_BUCKET_NAME,
         s3_key,
-        ExtraArgs=extra_args
+        ExtraArgs=extra_args,
+        Config=_transfer_config(),
     )
 
     # 공개 URL 반환 (URL 인코딩 적용)
@@ -166,7 +221,7 @@ def save_file(
     Returns:
         str: 파일 경로 또는 URL
     """
-    if IS_RAILWAY:
+    if USE_R2:
         # Railway 환경 → R2에 저장
         return upload_file_to_r2(file_data, filename, folder, content_type)
     else:
@@ -181,30 +236,73 @@ def save_file(
         return str(file_path)
 
 
+def save_files(files: List[Tuple[BinaryIO, str, str, Optional[str]]]) -> List[str]:
+    """
+    여러 파일을 동시에 저장 (R2_UPLOAD_WORKERS개씩 병렬 업로드)
+
+    Args:
+        files: [(파일 데이터, 파일명, 폴더명, MIME 타입)]
+
+    Returns:
+        List[str]: 입력 순서대로 파일 경로 또는 URL (하나라도 실패하면 예외)
+    """
+    if len(files) <= 1 or R2_UPLOAD_WORKERS <= 1:
+        return [save_file(f, name, folder, mime) for f, name, folder, mime in files]
+
+    with ThreadPoolExecutor(max_workers=min(R2_UPLOAD_WORKERS, len(files)), thread_name_prefix="r2-upload") as pool:
+        futures = [pool.submit(save_file, f, name, folder, mime) for f, name, folder, mime in files]
+        return [fut.result() for fut in futures]
+
+
+def delete_file(file_path_or_url: str) -> bool:
+    """
+    save_file로 저장한 파일 삭제 (로컬 경로 또는 R2 URL)
+
+    Returns:
+        bool: 성공 여부 (이미 없으면 True)
+    """
+    if file_path_or_url.startswith("http"):
+        from urllib.parse import unquote
+        s3_key = unquote("/".join(file_path_or_url.split("/")[-2:]))  # "uploads/file.pdf"
+        return delete_file_from_r2(s3_key)
+    try:
+        os.remove(file_path_or_url)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"파일 삭제 실패: {e}")
+        return False
+    return True
+
+
+def file_exists(file_path_or_url: str) -> bool:
+    """
+    save_file로 저장한 파일이 아직 있는지 (로컬 경로 또는 R2 URL)
+
+    R2 확인이 실패하면 없는 것으로 본다 (호출하는 쪽은 다시 저장)
+    """
+    if file_path_or_url.startswith("http"):
+        from urllib.parse import unquote
+        s3_key = unquote("/".join(file_path_or_url.split("/")[-2:]))
+        try:
+            get_r2_client().head_object(Bucket=R2_BUCKET_NAME, Key=s3_key)
+            return True
+        except Exception:
+            return False
+    return os.path.isfile(file_path_or_url)
+
+
 def get_file(file_path_or_url: str) -> bytes:
     """
     환경에 따라 자동으로 로컬 또는 R2에서 파일 읽기
 
+    R2 파일은 로컬 디스크 캐시(core/file_cache.py)를 거쳐 ETag가 바뀐 경우에만 다시 받는다.
+
     Args:
         file_path_or_url: 로컬 경로 또는 R2 URL
 
     Returns:
         bytes: 파일 데이터
     """
-    if file_path_or_url.startswith("http"):
-        # R2 공개 URL → HTTP로 직접 다운로드
-        import requests
-
-        try:
-            response = requests.get(file_path_or_url, timeout=10)
-            response.raise_for_status()
-            return response.content
-        except Exception as e:
-            print(f"HTTP 다운로드 실패, S3 API 시도: {e}")
-            # HTTP 실패 시 S3 API로 다운로드 시도
-            s3_key = "/".join(file_path_or_url.split("/")[-2:])  # "uploads/file.pdf"
-            return download_file_from_r2(s3_key)
-    else:
-        # 로컬 파일
-        with open(file_path_or_url, 'rb') as f:
-            return f.read()
+    from core.file_cache import read_attachment
+    return read_attachment(file_path_or_url)
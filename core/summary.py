@@ -1,8 +1,16 @@
 # core/potens.py
+import hashlib
 import os
-import requests
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
 from dotenv import load_dotenv
 
+from core.db import get_conn
+from core.llm_client import get_llm_client
+
 # Streamlit pages / dialog 환경에서도 확실히 잡히게 "여기서" 로드
 load_dotenv(override=False)
 
@@ -10,6 +18,12 @@ POTENS_API_KEY = os.getenv("POTENS_API_KEY", "")
 POTENS_API_URL = os.getenv("POTENS_API_URL", "https://ai.potens.ai/api/chat")
 RESPONSE_TIMEOUT = float(os.getenv("RESPONSE_TIMEOUT", "30"))
 
+# 요약 프롬프트(build_summary_prompt)를 바꾸면 올려서 기존 요약을 새로 생성하게 함
+SUMMARY_PROMPT_VERSION = "v1"
+
+# 프로세스 내 LRU 크기 (DB notice_summaries 앞단)
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "256"))
+
 
 def build_summary_prompt(title: str, content: str) -> str:
     title_part = f"제목: {title}\n" if title else ""
@@ -28,42 +42,169 @@ def build_summary_prompt(title: str, content: str) -> str:
 """
 
 
-def summarize_notice(title: str, content: str) -> str:
-    if not POTENS_API_KEY:
-        raise RuntimeError("POTENS_API_KEY가 설정되지 않았습니다. (.env 또는 배포 환경변수 확인)")
+# -------------------------
+# 요약 캐시 (내용 주소 기반)
+# - 키: sha256(프롬프트 버전, 제목, 내용) -> 같은 공지 버전은 회사 전체에서 1번만 요약
+# - 프로세스 LRU -> DB(notice_summaries) -> POTENS 순서로 조회
+# - 내용이 바뀌면 키가 달라지므로 자동으로 새 요약, 이전 요약 행은 update_post에서 정리
+# -------------------------
+_lru: "OrderedDict[str, Tuple[Optional[int], str]]" = OrderedDict()  # key -> (post_id, summary)
+_lru_lock = threading.Lock()
+
+# 같은 키를 동시에 요청하면 POTENS 호출은 1번만 (나머지는 결과를 기다림)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def summary_cache_key(title: str, content: str) -> str:
+    h = hashlib.sha256()
+    for part in (SUMMARY_PROMPT_VERSION, (title or "").strip(), (content or "").strip()):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _lru_get(key: str) -> Optional[str]:
+    with _lru_lock:
+        entry = _lru.get(key)
+        if entry is None:
+            return None
+        _lru.move_to_end(key)
+        return entry[1]
 
+
+def _lru_put(key: str, post_id: Optional[int], summary: str) -> None:
+    with _lru_lock:
+        _lru[key] = (post_id, summary)
+        _lru.move_to_end(key)
+        while len(_lru) > SUMMARY_CACHE_SIZE:
+            _lru.popitem(last=False)
+
+
+def _load_summary(key: str) -> Optional[Tuple[Optional[int], str]]:
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT post_id, summary FROM notice_summaries WHERE cache_key = ?", (key,)
+        ).fetchone()
+    if not row:
+        return None
+    return (int(row["post_id"]) if row["post_id"] is not None else None, row["summary"])
+
+
+def _store_summary(key: str, post_id: Optional[int], summary: str) -> None:
+    with get_conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO notice_summaries(cache_key, post_id, prompt_version, summary, created_at)
+            VALUES(?,?,?,?,?)
+            ON CONFLICT(cache_key) DO NOTHING
+            """,
+            (key, post_id, SUMMARY_PROMPT_VERSION, summary, int(time.time() * 1000)),
+        )
+
+
+def get_cached_summary(title: str, content: str) -> Optional[str]:
+    """
+    저장된 요약 조회 (POTENS 호출 없음)
+
+    Returns:
+        요약 문자열, 아직 없으면 None
+    """
     content = (content or "").strip()
     if not content:
         return ""
+    key = summary_cache_key(title, content)
+    summary = _lru_get(key)
+    if summary is None:
+        row = _load_summary(key)
+        if row is not None:
+            post_id, summary = row
+            _lru_put(key, post_id, summary)
+    return summary
 
-    prompt = build_summary_prompt(title or "", content)
 
-    headers = {
-        "Authorization": f"Bearer {POTENS_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    payload = {"prompt": prompt}
-
-    r = requests.post(
-        POTENS_API_URL,
-        json=payload,
-        headers=headers,
-        timeout=RESPONSE_TIMEOUT,
-    )
-    r.raise_for_status()
-
-    result = r.json()
-
-    # 챗봇앱과 동일한 '범용 파싱'
-    if isinstance(result, dict):
-        summary = (
-            result.get("response")
-            or result.get("answer")
-            or result.get("text")
-            or result.get("message")
-            or result.get("content")
-        )
+def forget_notice_summaries(post_id: int, keep: Iterable[Tuple[str, str]] = ()) -> int:
+    """
+    공지의 이전 버전 요약 삭제
+
+    Args:
+        post_id: 공지 ID
+        keep: 계속 쓰이는 (제목, 내용) 목록 (현재 공지 내용, 발송된 팝업 내용 등)
+
+    Returns:
+        삭제된 행 수
+    """
+    keep_keys = [summary_cache_key(t, c) for t, c in keep]
+    sql = "DELETE FROM notice_summaries WHERE post_id = ?"
+    params = [int(post_id)]
+    if keep_keys:
+        sql += f" AND cache_key NOT IN ({','.join('?' * len(keep_keys))})"
+        params += keep_keys
+
+    with get_conn() as conn:
+        cur = conn.execute(sql, tuple(params))
+        deleted = cur.rowcount
+
+    with _lru_lock:
+        for key in [k for k, (pid, _) in _lru.items() if pid == int(post_id) and k not in keep_keys]:
+            del _lru[key]
+    return deleted
+
+
+def summarize_notice(title: str, content: str, post_id: Optional[int] = None) -> str:
+    """
+    공지 요약 (캐시 우선)
+
+    Args:
+        title: 공지 제목
+        content: 공지 내용
+        post_id: 공지 ID (있으면 수정/삭제 시 이전 요약 정리에 사용)
+
+    Returns:
+        요약 문자열
+    """
+    content = (content or "").strip()
+    if not content:
+        return ""
+
+    key = summary_cache_key(title, content)
+    cached = get_cached_summary(title, content)
+    if cached is not None:
+        return cached
+
+    with _inflight_lock:
+        event = _inflight.get(key)
+        leader = event is None
+        if leader:
+            event = _inflight[key] = threading.Event()
+
+    if not leader:
+        # 다른 요청이 같은 공지를 요약 중이면 결과를 기다렸다가 사용
+        event.wait(RESPONSE_TIMEOUT + 5)
+        cached = _lru_get(key)
+        if cached is not None:
+            return cached
+
+    try:
+        summary = _request_summary(title or "", content)
         if summary:
-            return str(summary).strip()
+            _lru_put(key, post_id, summary)
+            try:
+                _store_summary(key, post_id, summary)
+            except Exception as e:
+                print(f"[summary] 요약 저장 실패 (이번 요약은 그대로 사용): {e}")
+        return summary
+    finally:
+        if leader:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+            event.set()
 
-    return str(result).strip()
+
+def _request_summary(title: str, content: str) -> str:
+    """POTENS 요약 요청 (캐시 없이 항상 호출)"""
+    if not POTENS_API_KEY:
+        raise RuntimeError("POTENS_API_KEY가 설정되지 않았습니다. (.env 또는 배포 환경변수 확인)")
+
+    prompt = build_summary_prompt(title or "", content)
+    return get_llm_client().complete(prompt, kind="summary", timeout=RESPONSE_TIMEOUT)
@@ -0,0 +1,312 @@
+"""
+공지 요약 미리 생성 (백그라운드 작업 큐)
+
+- 중요공지 저장/수정/팝업 발송 시 summary_jobs에 작업 등록 (공지당 1행, 재등록 시 대기 상태로 초기화)
+- 서버 프로세스 안의 스레드 풀이 작업을 가져가 core.summary.summarize_notice로 요약 생성
+  -> 요약은 notice_summaries에 저장되므로 직원이 "요약 보기"를 누르면 바로 표시
+- 작업 테이블이 DB에 있으므로 서버가 재시작돼도 남은 작업을 이어서 처리
+- 실패 시 지수 백오프(+지터)로 재시도, SUMMARY_JOB_MAX_ATTEMPTS회 실패하면 FAILED
+
+상태: PENDING(대기) -> RUNNING(생성 중) -> DONE(완료) | FAILED(실패)
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from core.db import get_conn
+
+SUMMARY_WORKER_ENABLED = os.getenv("SUMMARY_WORKER_ENABLED", "1").lower() not in ("0", "false", "no")
+SUMMARY_WORKER_THREADS = int(os.getenv("SUMMARY_WORKER_THREADS", "2"))
+SUMMARY_JOB_POLL_SEC = float(os.getenv("SUMMARY_JOB_POLL_SEC", "10"))            # 다른 프로세스가 등록한 작업 확인 주기
+SUMMARY_JOB_MAX_ATTEMPTS = int(os.getenv("SUMMARY_JOB_MAX_ATTEMPTS", "5"))
+SUMMARY_JOB_BACKOFF_BASE = float(os.getenv("SUMMARY_JOB_BACKOFF_BASE", "5"))      # 첫 재시도 대기(초), 이후 2배씩
+SUMMARY_JOB_BACKOFF_MAX = float(os.getenv("SUMMARY_JOB_BACKOFF_MAX", "600"))
+SUMMARY_JOB_STALE_SEC = float(os.getenv("SUMMARY_JOB_STALE_SEC", "300"))         # RUNNING이 이보다 오래되면 중단된 작업으로 보고 재시도
+
+STATUS_LABELS = {
+    "PENDING": "대기",
+    "RUNNING": "생성 중",
+    "DONE": "완료",
+    "FAILED": "실패",
+}
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# -------------------------
+# 작업 등록/조회
+# -------------------------
+def enqueue_summary_job(post_id: int) -> None:
+    """
+    공지 요약 작업 등록 (이미 있으면 대기 상태로 초기화)
+
+    Args:
+        post_id: 공지 ID
+    """
+    ts = _now_ms()
+    with get_conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO summary_jobs(post_id, status, attempts, next_run_at, last_error, created_at, updated_at)
+            VALUES(?, 'PENDING', 0, ?, NULL, ?, ?)
+            ON CONFLICT(post_id) DO UPDATE SET
+                status = 'PENDING', attempts = 0, next_run_at = excluded.next_run_at,
+                last_error = NULL, updated_at = excluded.updated_at
+            """,
+            (int(post_id), ts, ts, ts),
+        )
+    get_summary_worker().wake()
+
+
+def get_summary_job(post_id: int) -> Optional[Dict]:
+    """
+    요약 작업 상태 조회
+
+    Returns:
+        {"status", "statusLabel", "attempts", "lastError", "updatedAt"} 또는 None
+    """
+    with get_conn() as conn:
+        r = conn.execute(
+            "SELECT status, attempts, last_error, updated_at FROM summary_jobs WHERE post_id = ?",
+            (int(post_id),),
+        ).fetchone()
+    if not r:
+        return None
+    return {
+        "status": r["status"],
+        "statusLabel": STATUS_LABELS.get(r["status"], r["status"]),
+        "attempts": int(r["attempts"] or 0),
+        "lastError": r["last_error"] or "",
+        "updatedAt": int(r["updated_at"] or 0),
+    }
+
+
+def delete_summary_job(conn, post_id: int) -> None:
+    """공지 삭제 트랜잭션 안에서 호출"""
+    conn.execute("DELETE FROM summary_jobs WHERE post_id = ?", (int(post_id),))
+
+
+# -------------------------
+# 워커
+# -------------------------
+class SummaryWorker:
+    """
+    요약 작업 처리기
+
+    - 디스패처 스레드 1개가 실행 시점이 된 PENDING 작업을 골라 스레드 풀에 넘김
+    - 작업 선점은 "UPDATE ... WHERE status='PENDING'" 성공 여부로 판단 (여러 프로세스가 같은 DB를 써도 중복 실행 없음)
+    - 선점할 때마다 run_id를 1 올리고, 결과 기록은 그 run_id가 그대로일 때만 반영
+      (실행 중에 공지가 수정돼 다시 선점된 경우 이전 실행이 새 실행의 상태를 DONE/실패로 덮어쓰지 않음)
+    - 이 프로세스에서 실행 중인 공지는 다시 대기 상태가 돼도 실행이 끝날 때까지 선점하지 않음
+    - 등록 직후에는 wake()로 바로 깨우고, 그 외에는 SUMMARY_JOB_POLL_SEC마다 확인
+    - RUNNING에 멈춘 작업(다른 프로세스가 처리 중에 죽은 경우 등)은 SUMMARY_JOB_STALE_SEC마다 다시 대기 상태로
+    """
+
+    def __init__(self, threads: int = SUMMARY_WORKER_THREADS):
+        self.threads = max(1, threads)
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._running: set = set()   # 이 프로세스에서 실행 중인 post_id
+        self._running_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        if self._dispatcher is not None:
+            return True
+        from core.summary import POTENS_API_KEY
+
+        if not POTENS_API_KEY:
+            print("[summary_jobs] POTENS_API_KEY가 없어 요약 워커를 시작하지 않습니다. (작업은 대기 상태로 남음)")
+            return False
+
+        self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="summary-job")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="summary-job-dispatcher", daemon=True)
+        self._dispatcher.start()
+        return True
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    # ----- 내부 -----
+    def _dispatch_loop(self):
+        next_recover = 0.0
+        while not self._stopped.is_set():
+            if time.monotonic() >= next_recover:
+                try:
+                    self._recover_stale()
+                except Exception as e:
+                    print(f"[summary_jobs] 중단된 작업 확인 실패: {e}")
+                next_recover = time.monotonic() + SUMMARY_JOB_STALE_SEC
+            timeout = SUMMARY_JOB_POLL_SEC
+            try:
+                timeout = self._dispatch_due()
+            except Exception as e:
+                print(f"[summary_jobs] 작업 조회 실패: {e}")
+            self._wake.wait(min(timeout, max(0.05, next_recover - time.monotonic())))
+            self._wake.clear()
+
+    def _recover_stale(self):
+        """
+        재시작/다른 프로세스 종료 등으로 RUNNING에 멈춘 작업을 다시 대기 상태로
+        (디스패처가 SUMMARY_JOB_STALE_SEC마다 호출, 이 프로세스에서 아직 실행 중인 작업은 제외)
+        """
+        cutoff = _now_ms() - int(SUMMARY_JOB_STALE_SEC * 1000)
+        with self._running_lock:
+            running = sorted(self._running)
+        sql = "UPDATE summary_jobs SET status = 'PENDING', next_run_at = ? WHERE status = 'RUNNING' AND updated_at < ?"
+        if running:
+            sql += f" AND post_id NOT IN ({','.join('?' for _ in running)})"
+        with get_conn() as conn:
+            cur = conn.execute(sql, [_now_ms(), cutoff] + running)
+            if cur.rowcount:
+                print(f"[summary_jobs] 중단된 요약 작업 {cur.rowcount}건 재시도")
+
+    def _dispatch_due(self) -> float:
+        """
+        실행 시점이 된 작업을 스레드 풀에 넘김
+
+        Returns:
+            다음 확인까지 대기할 시간(초) - 가장 빠른 재시도 예정 시각과 폴링 주기 중 짧은 쪽
+        """
+        with self._running_lock:
+            free = self.threads - len(self._running)
+            running = sorted(self._running)
+        if free <= 0:
+            return SUMMARY_JOB_POLL_SEC
+
+        now = _now_ms()
+        # 실행 중에 재등록된 공지는 대기 상태로 두었다가 실행이 끝난 뒤(_run에서 wake) 선점
+        not_running = f" AND post_id NOT IN ({','.join('?' for _ in running)})" if running else ""
+        with get_conn() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT post_id FROM summary_jobs
+                WHERE status = 'PENDING' AND next_run_at <= ?{not_running}
+                ORDER BY next_run_at ASC
+                LIMIT ?
+                """,
+                [now] + running + [free],
+            ).fetchall()
+            upcoming = conn.execute(
+                "SELECT MIN(next_run_at) AS next_at FROM summary_jobs WHERE status = 'PENDING' AND next_run_at > ?",
+                (now,),
+            ).fetchone()
+
+        for r in rows:
+            post_id = int(r["post_id"])
+            run_id = self._claim(post_id)
+            if run_id is not None:
+                with self._running_lock:
+                    self._running.add(post_id)
+                self._executor.submit(self._run, post_id, run_id)
+
+        if upcoming and upcoming["next_at"] is not None:
+            return max(0.05, min(SUMMARY_JOB_POLL_SEC, (int(upcoming["next_at"]) - now) / 1000))
+        return SUMMARY_JOB_POLL_SEC
+
+    def _claim(self, post_id: int) -> Optional[int]:
+        """
+        대기 중인 작업 선점
+
+        Returns:
+            이번 실행의 run_id (다른 곳에서 먼저 선점했으면 None)
+        """
+        with get_conn() as conn:
+            row = conn.execute(
+                """
+                UPDATE summary_jobs SET status = 'RUNNING', run_id = run_id + 1, updated_at = ?
+                WHERE post_id = ? AND status = 'PENDING'
+                RETURNING run_id
+                """,
+                (_now_ms(), post_id),
+            ).fetchone()
+            return int(row["run_id"]) if row else None
+
+    def _run(self, post_id: int, run_id: int):
+        from core.summary import summarize_notice
+
+        try:
+            with get_conn() as conn:
+                notice = conn.execute(
+                    "SELECT title, content FROM notices WHERE post_id = ?", (post_id,)
+                ).fetchone()
+            if not notice:
+                with get_conn() as conn:
+                    delete_summary_job(conn, post_id)
+                return
+
+            summarize_notice(notice["title"] or "", notice["content"] or "", post_id=post_id)
+            self._finish(post_id, run_id, "DONE", None)
+        except Exception as e:
+            self._fail(post_id, run_id, e)
+        finally:
+            with self._running_lock:
+                self._running.discard(post_id)
+            # 빈 자리가 생겼으니 밀린 작업 확인
+            self._wake.set()
+
+    def _finish(self, post_id: int, run_id: int, status: str, error: Optional[str],
+                next_run_at: Optional[int] = None):
+        ts = _now_ms()
+        with get_conn() as conn:
+            # 실행 중에 공지가 다시 수정돼 PENDING으로 초기화됐거나 다시 선점됐으면 그 상태를 유지
+            conn.execute(
+                """
+                UPDATE summary_jobs
+                SET status = ?, last_error = ?, next_run_at = COALESCE(?, next_run_at), updated_at = ?
+                WHERE post_id = ? AND status = 'RUNNING' AND run_id = ?
+                """,
+                (status, error, next_run_at, ts, post_id, run_id),
+            )
+
+    def _fail(self, post_id: int, run_id: int, error: Exception):
+        with get_conn() as conn:
+            cur = conn.execute(
+                "UPDATE summary_jobs SET attempts = attempts + 1 WHERE post_id = ? AND status = 'RUNNING' AND run_id = ?",
+                (post_id, run_id),
+            )
+            if cur.rowcount == 0:
+                # 실행 중에 재등록/삭제된 작업이면 실패 횟수를 남기지 않음
+                return
+            row = conn.execute("SELECT attempts FROM summary_jobs WHERE post_id = ?", (post_id,)).fetchone()
+            attempts = int(row["attempts"] or 0)
+
+        message = str(error)[:500]
+        if attempts >= SUMMARY_JOB_MAX_ATTEMPTS:
+            print(f"[summary_jobs] 공지 {post_id} 요약 실패 ({attempts}회), 중단: {message}")
+            self._finish(post_id, run_id, "FAILED", message)
+            return
+
+        delay = min(SUMMARY_JOB_BACKOFF_MAX, SUMMARY_JOB_BACKOFF_BASE * (2 ** (attempts - 1)))
+        delay *= random.uniform(0.8, 1.2)
+        print(f"[summary_jobs] 공지 {post_id} 요약 실패 ({attempts}회), {delay:.0f}초 후 재시도: {message}")
+        self._finish(post_id, run_id, "PENDING", message, next_run_at=_now_ms() + int(delay * 1000))
+
+
+_worker: Optional[SummaryWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_summary_worker() -> SummaryWorker:
+    """프로세스 전역 요약 워커 (처음 호출 시 시작, app.py에서도 호출해 재시작 후 남은 작업 처리)"""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                worker = SummaryWorker()
+                if SUMMARY_WORKER_ENABLED:
+                    worker.start()
+                _worker = worker
+    return _worker
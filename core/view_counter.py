@@ -0,0 +1,260 @@
+"""
+공지 조회수 버퍼링 (write-behind)
+
+공지를 열 때마다 "UPDATE notices SET views = views + 1"을 바로 실행하면
+전사 중요공지 발송 직후 같은 행에 갱신이 몰려 PostgreSQL은 행 잠금 대기,
+SQLite는 "database is locked"가 발생한다.
+
+- 조회는 메모리의 공지별 증가분(delta)에만 더하고 바로 반환
+- 백그라운드 스레드가 VIEW_FLUSH_INTERVAL초마다(또는 대기 건수가 VIEW_FLUSH_MAX_PENDING을 넘으면)
+  한 트랜잭션에서 공지별 UPDATE를 한 번씩 실행 (post_id 순서로 잠가 교착 방지)
+- 조회수를 읽을 때는 pending_views()로 아직 저장 전인 증가분을 더해서 표시
+  (저장 중인 배치도 커밋될 때까지는 저장 전으로 계산)
+- VIEW_UNIQUE_VIEWERS=1 이면 직원별 최초 조회를 notice_viewers에 기록 (같은 방식으로 모아서 저장)
+- 프로세스 종료 시(atexit) 남은 증가분 저장
+- VIEW_COUNT_BUFFERED=0 이면 기존처럼 바로 UPDATE
+"""
+import atexit
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from core.db import get_conn
+
+VIEW_COUNT_BUFFERED = os.getenv("VIEW_COUNT_BUFFERED", "1").lower() not in ("0", "false", "no")
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "2"))
+VIEW_FLUSH_MAX_PENDING = int(os.getenv("VIEW_FLUSH_MAX_PENDING", "500"))
+VIEW_UNIQUE_VIEWERS = os.getenv("VIEW_UNIQUE_VIEWERS", "0").lower() in ("1", "true", "yes")
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class ViewCounter:
+    """공지 조회수 버퍼 (프로세스 전역 1개, get_view_counter로 사용)"""
+
+    def __init__(self, flush_interval: float = VIEW_FLUSH_INTERVAL, max_pending: int = VIEW_FLUSH_MAX_PENDING):
+        self.flush_interval = max(0.05, flush_interval)
+        self.max_pending = max(1, max_pending)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()   # 저장은 한 번에 하나씩
+        self._deltas: Dict[int, int] = {}
+        self._viewers: Dict[Tuple[int, str], int] = {}   # (post_id, employee_id) -> 조회 시각
+        # flush가 DB에 쓰고 있는 배치 (커밋 전까지는 DB views에 없으므로 pending*()에 포함)
+        self._inflight: Dict[int, int] = {}
+        self._inflight_viewers: Dict[Tuple[int, str], int] = {}
+        self._pending_count = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="view-counter", daemon=True)
+        self._thread.start()
+
+    def record(self, post_id: int, employee_id: Optional[str] = None) -> None:
+        """조회 1건 기록 (DB 저장은 백그라운드에서)"""
+        post_id = int(post_id)
+        with self._lock:
+            self._deltas[post_id] = self._deltas.get(post_id, 0) + 1
+            if employee_id and VIEW_UNIQUE_VIEWERS:
+                self._viewers.setdefault((post_id, str(employee_id)), _now_ms())
+            self._pending_count += 1
+            wake = self._pending_count >= self.max_pending
+        if wake:
+            self._wake.set()
+
+    def pending(self, post_id: int) -> int:
+        """아직 저장 전인 조회 증가분"""
+        post_id = int(post_id)
+        with self._lock:
+            return self._deltas.get(post_id, 0) + self._inflight.get(post_id, 0)
+
+    def pending_many(self, post_ids: Iterable[int]) -> Dict[int, int]:
+        result: Dict[int, int] = {}
+        with self._lock:
+            for p in post_ids:
+                n = self._deltas.get(int(p), 0) + self._inflight.get(int(p), 0)
+                if n:
+                    result[int(p)] = n
+        return result
+
+    def pending_viewers(self, post_id: int) -> Set[str]:
+        post_id = int(post_id)
+        with self._lock:
+            return {emp for (pid, emp) in list(self._viewers) + list(self._inflight_viewers) if pid == post_id}
+
+    def forget(self, post_id: int) -> None:
+        """공지 삭제 시 저장 전 증가분 폐기"""
+        post_id = int(post_id)
+        with self._lock:
+            self._pending_count -= self._deltas.pop(post_id, 0)
+            self._inflight.pop(post_id, None)
+            for viewers in (self._viewers, self._inflight_viewers):
+                for key in [k for k in viewers if k[0] == post_id]:
+                    del viewers[key]
+
+    def flush(self) -> int:
+        """
+        저장 전 증가분을 DB에 반영
+
+        Returns:
+            반영한 조회 수
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._inflight, self._deltas = self._deltas, {}
+                self._inflight_viewers, self._viewers = self._viewers, {}
+                self._pending_count = 0
+                deltas, viewers = dict(self._inflight), dict(self._inflight_viewers)
+            if not deltas and not viewers:
+                return 0
+            try:
+                with get_conn() as conn:
+                    # post_id 순서로 갱신해서 여러 프로세스가 동시에 저장해도 교착이 생기지 않게
+                    conn.executemany(
+                        "UPDATE notices SET views = views + ? WHERE post_id = ?",
+                        [(delta, post_id) for post_id, delta in sorted(deltas.items())],
+                    )
+                    if viewers:
+                        # 저장 전에 삭제된 공지는 건너뜀 (FK 오류로 배치 전체가 계속 실패하지 않도록)
+                        conn.executemany(
+                            """
+                            INSERT INTO notice_viewers(post_id, employee_id, viewed_at)
+                            SELECT ?, ?, ?
+                            WHERE EXISTS (SELECT 1 FROM notices WHERE post_id = ?)
+                            ON CONFLICT(post_id, employee_id) DO NOTHING
+                            """,
+                            [(post_id, emp, ts, post_id) for (post_id, emp), ts in sorted(viewers.items())],
+                        )
+            except Exception as e:
+                print(f"[view_counter] 조회수 저장 실패, 다음 주기에 재시도: {e}")
+                with self._lock:
+                    # 저장 중에 forget()으로 빠진 공지는 제외
+                    deltas, viewers = dict(self._inflight), dict(self._inflight_viewers)
+                self._restore(*self._drop_deleted(deltas, viewers))
+                return 0
+            with self._lock:
+                self._inflight, self._inflight_viewers = {}, {}
+            return sum(deltas.values())
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(5)
+        self.flush()
+
+    # ----- 내부 -----
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            self.flush()
+
+    @staticmethod
+    def _drop_deleted(deltas: Dict[int, int], viewers: Dict[Tuple[int, str], int]):
+        """삭제된 공지의 증가분은 다시 넣지 않음 (확인할 수 없으면 전부 유지)"""
+        post_ids = sorted(set(deltas) | {pid for pid, _ in viewers})
+        if not post_ids:
+            return deltas, viewers
+        try:
+            placeholders = ",".join("?" for _ in post_ids)
+            with get_conn() as conn:
+                rows = conn.execute(
+                    f"SELECT post_id FROM notices WHERE post_id IN ({placeholders})", post_ids
+                ).fetchall()
+        except Exception:
+            return deltas, viewers
+        alive = {int(r["post_id"]) for r in rows}
+        return (
+            {pid: d for pid, d in deltas.items() if pid in alive},
+            {k: ts for k, ts in viewers.items() if k[0] in alive},
+        )
+
+    def _restore(self, deltas: Dict[int, int], viewers: Dict[Tuple[int, str], int]) -> None:
+        """저장에 실패한 배치를 다음 저장 대상으로 되돌림 (저장 중 배치 비우기와 한 번에)"""
+        with self._lock:
+            self._inflight, self._inflight_viewers = {}, {}
+            for post_id, delta in deltas.items():
+                self._deltas[post_id] = self._deltas.get(post_id, 0) + delta
+                self._pending_count += delta
+            for key, ts in viewers.items():
+                self._viewers.setdefault(key, ts)
+
+
+_counter: Optional[ViewCounter] = None
+_counter_lock = threading.Lock()
+
+
+def get_view_counter() -> ViewCounter:
+    """프로세스 전역 조회수 버퍼 (처음 호출 시 저장 스레드 시작, 종료 시 자동 저장)"""
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = ViewCounter()
+                atexit.register(_counter.stop)
+    return _counter
+
+
+def record_view(post_id: int, employee_id: Optional[str] = None) -> None:
+    """
+    공지 조회 기록
+
+    Args:
+        post_id: 공지 ID
+        employee_id: 조회한 직원 (VIEW_UNIQUE_VIEWERS가 켜져 있으면 직원별 최초 조회 기록)
+    """
+    if VIEW_COUNT_BUFFERED:
+        get_view_counter().record(post_id, employee_id)
+        return
+
+    with get_conn() as conn:
+        conn.execute("UPDATE notices SET views = views + 1 WHERE post_id = ?", (int(post_id),))
+        if employee_id and VIEW_UNIQUE_VIEWERS:
+            conn.execute(
+                """
+                INSERT INTO notice_viewers(post_id, employee_id, viewed_at)
+                VALUES(?, ?, ?)
+                ON CONFLICT(post_id, employee_id) DO NOTHING
+                """,
+                (int(post_id), str(employee_id), _now_ms()),
+            )
+
+
+def pending_views(post_id: int) -> int:
+    """저장 전 조회 증가분 (DB views에 더해서 표시)"""
+    if not VIEW_COUNT_BUFFERED or _counter is None:
+        return 0
+    return _counter.pending(post_id)
+
+
+def pending_views_many(post_ids: Iterable[int]) -> Dict[int, int]:
+    if not VIEW_COUNT_BUFFERED or _counter is None:
+        return {}
+    return _counter.pending_many(post_ids)
+
+
+def unique_viewer_count(post_id: int) -> int:
+    """직원별 최초 조회 수 (저장 전 조회 포함)"""
+    post_id = int(post_id)
+    pending = _counter.pending_viewers(post_id) if _counter is not None else set()
+    with get_conn() as conn:
+        count = int(conn.execute(
+            "SELECT COUNT(1) AS cnt FROM notice_viewers WHERE post_id = ?", (post_id,)
+        ).fetchone()["cnt"])
+        if pending:
+            placeholders = ",".join("?" for _ in pending)
+            already = int(conn.execute(
+                f"SELECT COUNT(1) AS cnt FROM notice_viewers WHERE post_id = ? AND employee_id IN ({placeholders})",
+                (post_id, *pending),
+            ).fetchone()["cnt"])
+            count += len(pending) - already
+    return count
+
+
+def forget_views(post_id: int) -> None:
+    """공지 삭제 후 호출"""
+    if _counter is not None:
+        _counter.forget(post_id)
@@ -1,6 +1,7 @@
 import streamlit as st
 import service
 from core.layout import apply_portal_theme
+from core.session_token import SESSION_TOKEN_TTL_SEC, issue_session_token
 import extra_streamlit_components as stx
 import datetime
 
@@ -109,8 +110,9 @@ def login_modal():
                     st.session_state.login_error = "로그인 정보가 올바르지 않습니다."
                     st.rerun()
                 else:
-                    expires = datetime.datetime.now() + datetime.timedelta(days=7)
-                    cookie_manager.set("user_token", info["loginId"], expires_at=expires)
+                    expires = datetime.datetime.now() + datetime.timedelta(seconds=SESSION_TOKEN_TTL_SEC)
+                    st.session_state.session_token = issue_session_token(info)
+                    cookie_manager.set("user_token", st.session_state.session_token, expires_at=expires)
                     
                     st.session_state.logged_in = True
                     st.session_state.role = info["role"]
@@ -142,8 +144,9 @@ def login_modal():
             # Admin 계정으로 자동 로그인
             info = service.login_account("admin", "1234")
             if info:
-                expires = datetime.datetime.now() + datetime.timedelta(days=7)
-                cookie_manager.set("user_token", info["loginId"], expires_at=expires)
+                expires = datetime.datetime.now() + datetime.timedelta(seconds=SESSION_TOKEN_TTL_SEC)
+                st.session_state.session_token = issue_session_token(info)
+                cookie_manager.set("user_token", st.session_state.session_token, expires_at=expires)
                 
                 st.session_state.logged_in = True
                 st.session_state.role = info["role"]
@@ -161,8 +164,9 @@ def login_modal():
             # HS001 계정으로 자동 로그인
             info = service.login_account("HS001", "1234")
             if info:
-                expires = datetime.datetime.now() + datetime.timedelta(days=7)
-                cookie_manager.set("user_token", info["loginId"], expires_at=expires)
+                expires = datetime.datetime.now() + datetime.timedelta(seconds=SESSION_TOKEN_TTL_SEC)
+                st.session_state.session_token = issue_session_token(info)
+                cookie_manager.set("user_token", st.session_state.session_token, expires_at=expires)
                 
                 st.session_state.logged_in = True
                 st.session_state.role = info["role"]
@@ -181,8 +185,9 @@ def login_modal():
             # HS002 계정으로 자동 로그인
             info = service.login_account("HS002", "1234")
             if info:
-                expires = datetime.datetime.now() + datetime.timedelta(days=7)
-                cookie_manager.set("user_token", info["loginId"], expires_at=expires)
+                expires = datetime.datetime.now() + datetime.timedelta(seconds=SESSION_TOKEN_TTL_SEC)
+                st.session_state.session_token = issue_session_token(info)
+                cookie_manager.set("user_token", st.session_state.session_token, expires_at=expires)
                 
                 st.session_state.logged_in = True
                 st.session_state.role = info["role"]
@@ -11,7 +11,10 @@ from core.layout import (
     app_links_card,
     portal_sidebar,
     remove_floating_widget,
+    board_page,
+    render_board_pager,
 )
+from core.view_counter import VIEW_UNIQUE_VIEWERS
 
 st.set_page_config(page_title="Admin", layout="wide", initial_sidebar_state="expanded")
 
@@ -198,6 +201,12 @@ def target_dialog():
                 st.divider()
 
     st.divider()
+    recipient_count = service.count_popup_recipients(
+        sorted(st.session_state.target_selected_departments),
+        sorted(st.session_state.target_selected_teams),
+    )
+    st.caption(f"발송 대상 직원: {recipient_count}명")
+
     c1, c2 = st.columns([1, 1])
 
     with c1:
@@ -317,6 +326,18 @@ elif menu == "게시판":
                 st.caption(
                     f"작성자: {post['author']} | 작성일: {fmt_dt(post['timestamp'])} | 조회: {post['views']}"
                 )
+                if VIEW_UNIQUE_VIEWERS:
+                    st.caption(f"열람 직원: {service.get_unique_viewer_count(pid)}명")
+                if post["type"] == "중요":
+                    delivery = service.get_popup_delivery_stats(pid)
+                    if delivery["recipients"]:
+                        st.caption(f"팝업 수신: {delivery['recipients']}명 | 응답: {delivery['responded']}명")
+                    job = service.get_summary_job_status(pid)
+                    if job:
+                        msg = f"AI 요약: {job['statusLabel']}"
+                        if job["status"] == "FAILED" and job["lastError"]:
+                            msg += f" ({job['lastError'][:80]})"
+                        st.caption(msg)
                 st.text(post["content"])
                 # 첨부 표시
                 attachments = post.get("attachments", []) if post else []
@@ -328,16 +349,17 @@ elif menu == "게시판":
                         mime = (a.get("mimeType", "") or "").lower()
 
                         try:
-                            from core.storage import get_file
-                            data = get_file(path)
+                            from core.file_cache import attachment_download_data, attachment_image_source
+                            from core.renditions import BOARD_IMAGE_WIDTH, pick_rendition
 
                             # 이미지면 미리보기
                             if mime.startswith("image/"):
-                                st.image(data, caption=name)
+                                st.image(attachment_image_source(pick_rendition(a, BOARD_IMAGE_WIDTH)), caption=name)
 
+                            # 내용은 다운로드를 눌렀을 때 읽음 (ATTACHMENT_LAZY_DOWNLOAD=0 이면 바로)
                             st.download_button(
                                 label=f"다운로드: {name}",
-                                data=data,
+                                data=attachment_download_data(path),
                                 file_name=name,
                                 mime=a.get("mimeType", "") or None,
                                 key=f"dl_admin_{a['fileId']}",
@@ -382,7 +404,8 @@ elif menu == "게시판":
         box = st.container(border=True)
         with box:
             st.markdown("**전사 공지**")
-            posts = service.list_posts()
+            page = board_page("admin_board")
+            posts = page["items"]
 
             if not posts:
                 st.info("등록된 게시글이 없습니다.")
@@ -423,6 +446,8 @@ elif menu == "게시판":
                     
                     st.markdown("<hr style='margin: 0.2rem 0; border-top: 1px dashed #eee;'>", unsafe_allow_html=True)
 
+            render_board_pager("admin_board", page)
+
 elif menu == "글쓰기":
     st.subheader("새글쓰기")
 
@@ -684,20 +709,32 @@ elif menu == "문의관리":
         # -------------------------
         st.markdown("---")
         st.subheader("📊 챗봇 질문 키워드 통계")
-        
-        stats = service.get_chatbot_keyword_stats()
+
+        window_labels = {"전체 기간": None, "최근 24시간": "24h", "최근 7일": "7d", "최근 30일": "30d"}
+        col_win, col_group = st.columns([3, 1])
+        with col_win:
+            window_label = st.radio("기간", list(window_labels.keys()), index=2, horizontal=True, key="kw_stat_window")
+        with col_group:
+            group_label = st.radio("기준", ["팀", "부서"], horizontal=True, key="kw_stat_group")
+        stat_window = window_labels[window_label]
+        stat_group = "team" if group_label == "팀" else "department"
+
+        stats = service.get_chatbot_keyword_stats(window=stat_window, group=stat_group)
         
         if not stats or not stats.get("전체"):
-            st.info("아직 수집된 챗봇 데이터가 없습니다. 직원이 챗봇에게 질문하면 데이터가 쌓입니다.")
+            if stat_window:
+                st.info(f"{window_label} 동안 수집된 챗봇 질문이 없습니다.")
+            else:
+                st.info("아직 수집된 챗봇 데이터가 없습니다. 직원이 챗봇에게 질문하면 데이터가 쌓입니다.")
         else:
-            # 팀 목록 생성
+            # 팀(부서) 목록 생성
             team_options = sorted([k for k in stats.keys() if k != "전체"])
             team_options.insert(0, "전체") # 전체를 맨 앞으로
             
             col_stat_1, col_stat_2 = st.columns([1, 3])
             
             with col_stat_1:
-                selected_team = st.selectbox("통계를 확인할 부서/팀", team_options)
+                selected_team = st.selectbox(f"통계를 확인할 {group_label}", team_options)
             
             # 선택된 팀의 데이터
             team_stat = stats.get(selected_team, {})
@@ -721,4 +758,26 @@ elif menu == "문의관리":
                 with st.expander("📋 상세 데이터 보기"):
                     st.dataframe(df, use_container_width=True, hide_index=True)
 
+            # 직전 같은 기간 대비 급증 키워드
+            if stat_window:
+                rising = service.get_rising_chatbot_keywords(stat_window, group=stat_group, name=selected_team)
+                st.caption(f"📈 '{selected_team}' 급증 키워드 ({window_label}, 직전 같은 기간 대비)")
+                if not rising:
+                    st.write("급증한 키워드가 없습니다.")
+                else:
+                    st.dataframe(
+                        pd.DataFrame([
+                            {
+                                "키워드": r["keyword"],
+                                "이번 기간": r["count"],
+                                "직전 기간": r["previous"],
+                                "증가": r["delta"],
+                                "증가율": "신규" if r["growth"] is None else f"{r['growth']:+.0f}%",
+                            }
+                            for r in rising
+                        ]),
+                        use_container_width=True,
+                        hide_index=True,
+                    )
+
 
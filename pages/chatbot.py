@@ -10,6 +10,7 @@ from core.layout import (
 from core.chatbot_engine import ChatbotEngine
 from core.config import DEPARTMENT_EMAILS, ADMIN_EMAIL
 from core.email_utils import send_email
+import os
 import time
 
 st.set_page_config(page_title="Chatbot", layout="wide", initial_sidebar_state="expanded")
@@ -77,28 +78,76 @@ else:
     user_id = st.session_state.get("employee_id", "guest")
 engine = get_chatbot_engine(user_id)
 
-# DB에서 채팅 세션 로드 (최초 1회)
+# 대화 히스토리 페이지 크기
+CHAT_SESSION_PAGE_SIZE = int(os.getenv("CHAT_SESSION_PAGE_SIZE", "30"))   # 사이드바에 한 번에 불러올 대화 수
+CHAT_MESSAGE_PAGE_SIZE = int(os.getenv("CHAT_MESSAGE_PAGE_SIZE", "20"))   # 대화를 열 때/더 보기마다 불러올 메시지 수
+
+def _session_entry(s: dict) -> dict:
+    """DB 세션 → session_state 항목 (메시지는 대화를 열 때 불러옴)"""
+    return {
+        "name": s["name"],
+        "messages": [],
+        "timestamp": s["updated_at"],
+        "message_count": s["message_count"],
+        "loaded": False,
+        "older_cursor": None,
+    }
+
+def load_more_sessions():
+    """사이드바 대화 목록 다음 페이지 (메시지 없이 목록만)"""
+    page = service.list_chat_sessions_page(
+        user_id, CHAT_SESSION_PAGE_SIZE, st.session_state.get("chatbot_sessions_cursor")
+    )
+    for s in page["items"]:
+        st.session_state.chatbot_sessions.setdefault(s["session_id"], _session_entry(s))
+    st.session_state.chatbot_sessions_cursor = page["nextCursor"]
+    return page["items"]
+
+def ensure_session_loaded(session_id):
+    """
+    열린 대화의 최신 메시지 한 페이지를 불러옴
+    (다른 대화의 메시지는 메모리에서 내려서 대화 수가 많아도 세션 메모리가 늘지 않게)
+    """
+    for sid, data in st.session_state.chatbot_sessions.items():
+        if sid != session_id and data.get("loaded"):
+            data.update(messages=[], loaded=False, older_cursor=None)
+
+    session = st.session_state.chatbot_sessions.get(session_id)
+    if session is None or session.get("loaded"):
+        return
+    page = service.get_chat_messages_page(session_id, CHAT_MESSAGE_PAGE_SIZE)
+    session.update(messages=page["items"], loaded=True, older_cursor=page["nextCursor"])
+
+def load_older_messages(session_id):
+    """현재 대화의 이전 메시지 한 페이지를 앞에 붙임"""
+    session = st.session_state.chatbot_sessions.get(session_id)
+    if not session or not session.get("older_cursor"):
+        return
+    page = service.get_chat_messages_page(session_id, CHAT_MESSAGE_PAGE_SIZE, session["older_cursor"])
+    session["messages"] = page["items"] + session["messages"]
+    session["older_cursor"] = page["nextCursor"]
+
+def add_message(session_id, role, content, notice_refs=None, notice_details=None):
+    """메시지 DB 저장 + 사이드바 메시지 수 갱신"""
+    service.add_chat_message(session_id, role, content, notice_refs, notice_details)
+    session = st.session_state.chatbot_sessions.get(session_id)
+    if session is not None:
+        session["message_count"] = session.get("message_count", 0) + 1
+
+# DB에서 채팅 세션 목록 로드 (최초 1회, 첫 페이지만)
 if "chatbot_loaded" not in st.session_state:
     st.session_state.chatbot_loaded = False
 
 if not st.session_state.chatbot_loaded:
     with st.spinner("이전 대화 불러오는 중..."):
-        db_sessions = service.get_user_chat_sessions(user_id)
-        sessions = {}
-        for s in db_sessions:
-            sid = s["session_id"]
-            msgs = service.get_chat_messages(sid)
-            sessions[sid] = {
-                "name": s["name"],
-                "messages": msgs,
-                "timestamp": s["updated_at"]
-            }
-        st.session_state.chatbot_sessions = sessions
-        
+        st.session_state.chatbot_sessions = {}
+        st.session_state.chatbot_sessions_cursor = None
+        first_page = load_more_sessions()
+
         # 최신 세션 선택
-        if sessions and not st.session_state.current_session_id:
-            st.session_state.current_session_id = db_sessions[0]["session_id"]
-            
+        if first_page and not st.session_state.current_session_id:
+            st.session_state.current_session_id = first_page[0]["session_id"]
+
         st.session_state.chatbot_loaded = True
 
 # 세션 카운터 (DB 사용 시 큰 의미 없으나 기존 호환 위해 유지)
@@ -144,7 +193,10 @@ def create_new_session(initial_messages=None):
     st.session_state.chatbot_sessions[session_id] = {
         "name": session_name,
         "messages": messages,
-        "timestamp": int(time.time() * 1000)
+        "timestamp": int(time.time() * 1000),
+        "message_count": len(messages),
+        "loaded": True,
+        "older_cursor": None,
     }
     st.session_state.current_session_id = session_id
     
@@ -310,6 +362,10 @@ else:
 if st.session_state.current_session_id is None and st.session_state.chatbot_sessions:
     st.session_state.current_session_id = list(st.session_state.chatbot_sessions.keys())[0]
 
+# 열린 대화의 메시지만 불러옴
+if st.session_state.current_session_id:
+    ensure_session_loaded(st.session_state.current_session_id)
+
 # 레이아웃: 왼쪽 히스토리, 오른쪽 채팅
 col_history, col_chat = st.columns([1, 3], gap="medium")
 
@@ -344,6 +400,7 @@ def render_session_history():
                     key=f"session_{session_id}",
                     use_container_width=True,
                     type=button_type,
+                    help=f"메시지 {session_data.get('message_count', 0)}개",
                 ):
                     st.session_state.current_session_id = session_id
                     st.rerun()
@@ -353,6 +410,12 @@ def render_session_history():
                     delete_session(session_id)
                     st.rerun()
 
+    # 다음 페이지가 있으면 더 보기
+    if st.session_state.get("chatbot_sessions_cursor"):
+        if st.button("이전 대화 더 보기", key="more_sessions", use_container_width=True):
+            load_more_sessions()
+            st.rerun()
+
 with col_history:
     render_session_history()
 
@@ -447,15 +510,16 @@ def render_chat_interface():
                             "role": "user",
                             "content": question
                         })
-                        service.add_chat_message(st.session_state.current_session_id, "user", question)
+                        add_message(st.session_state.current_session_id, "user", question)
                         
                         # 첫 메시지인 경우 세션 이름 업데이트
                         if len(current_session["messages"]) == 1:
                             update_session_name_if_needed(st.session_state.current_session_id)
                         
-                        # 챗봇 응답 생성
-                        with st.spinner("답변 생성 중..."):
-                            result = engine.ask(question)
+                        # 챗봇 응답 생성 (받는 대로 표시)
+                        with st.chat_message("assistant"):
+                            st.write_stream(engine.ask_stream(question))
+                            result = engine.last_result
                             response = result["response"]
                             notice_refs = result.get("notice_refs", [])
                             notice_details = result.get("notice_details", [])
@@ -466,7 +530,7 @@ def render_chat_interface():
                                 "notice_refs": notice_refs,
                                 "notice_details": notice_details
                             })
-                            service.add_chat_message(st.session_state.current_session_id, "assistant", response, notice_refs, notice_details)
+                            add_message(st.session_state.current_session_id, "assistant", response, notice_refs, notice_details)
                         
                         st.rerun()
             
@@ -485,15 +549,16 @@ def render_chat_interface():
                 "role": "user",
                 "content": initial_q
             })
-            service.add_chat_message(st.session_state.current_session_id, "user", initial_q)
+            add_message(st.session_state.current_session_id, "user", initial_q)
             
             # 첫 메시지 등 세션명 업데이트
             if len(current_session["messages"]) == 1:
                 update_session_name_if_needed(st.session_state.current_session_id)
 
-            # 응답 생성
-            with st.spinner("답변 생성 중..."):
-                result = engine.ask(initial_q)
+            # 응답 생성 (받는 대로 표시)
+            with st.chat_message("assistant"):
+                st.write_stream(engine.ask_stream(initial_q))
+                result = engine.last_result
                 response = result["response"]
                 notice_refs = result.get("notice_refs", [])
                 notice_details = result.get("notice_details", [])
@@ -504,7 +569,7 @@ def render_chat_interface():
                     "notice_refs": notice_refs,
                     "notice_details": notice_details
                 })
-                service.add_chat_message(st.session_state.current_session_id, "assistant", response, notice_refs, notice_details)
+                add_message(st.session_state.current_session_id, "assistant", response, notice_refs, notice_details)
 
             # 처리가 끝났으므로 다른 동작 없이 UI 갱신을 위해 리런
             st.rerun()
@@ -527,7 +592,7 @@ def render_chat_interface():
                 "role": "user",
                 "content": prompt
             })
-            service.add_chat_message(st.session_state.current_session_id, "user", prompt)
+            add_message(st.session_state.current_session_id, "user", prompt)
             
 
             
@@ -535,9 +600,10 @@ def render_chat_interface():
             if len(current_session["messages"]) == 1:
                 update_session_name_if_needed(st.session_state.current_session_id)
             
-            # 챗봇 응답 생성
-            with st.spinner("답변 생성 중..."):
-                result = engine.ask(prompt)
+            # 챗봇 응답 생성 (받는 대로 표시)
+            with st.chat_message("assistant"):
+                st.write_stream(engine.ask_stream(prompt))
+                result = engine.last_result
                 response = result["response"]
                 notice_refs = result.get("notice_refs", [])
                 notice_details = result.get("notice_details", [])
@@ -548,7 +614,7 @@ def render_chat_interface():
                     "notice_refs": notice_refs,
                     "notice_details": notice_details
                 })
-                service.add_chat_message(st.session_state.current_session_id, "assistant", response, notice_refs, notice_details)
+                add_message(st.session_state.current_session_id, "assistant", response, notice_refs, notice_details)
                 
 
             
@@ -556,6 +622,18 @@ def render_chat_interface():
         
         # 채팅 메시지 표시 (입력창 아래, border 없음)
         st.markdown("")  # 약간의 여백
+        # 아직 안 불러온 이전 메시지가 있으면 더 보기
+        if current_session.get("older_cursor"):
+            if st.button("⬆️ 이전 메시지 더 보기", key="load_older_messages", use_container_width=True):
+                load_older_messages(st.session_state.current_session_id)
+                st.rerun()
+        # 대화 전체의 참조 공지를 한 번에 조회 (메시지마다 공지별로 DB를 읽지 않도록)
+        ref_posts = service.get_posts_by_ids([
+            detail["post_id"]
+            for msg in current_session["messages"]
+            if msg["role"] == "assistant"
+            for detail in (msg.get("notice_details") or [])
+        ])
         for msg_idx, msg in enumerate(current_session["messages"]):
             with st.chat_message(msg["role"]):
                 st.markdown(msg["content"])
@@ -571,7 +649,7 @@ def render_chat_interface():
                             title = detail["title"]
                             
                             # 공지 상세 정보 가져오기
-                            post_info = service.get_post_by_id(ref_id)
+                            post_info = ref_posts.get(int(ref_id))
                             
                             if post_info:
                                 with st.container():
@@ -13,8 +13,11 @@ from core.layout import (
     app_links_card,
     portal_sidebar,
     render_floating_widget,
+    board_page,
+    render_board_pager,
 )
 from core.summary import summarize_notice
+from core.notify import popup_version, NOTIFY_RESYNC_SEC
 
 
 st.set_page_config(page_title="Employee", layout="wide", initial_sidebar_state="expanded")
@@ -70,6 +73,10 @@ st.session_state.setdefault("selected_post_id", None)
 st.session_state.setdefault("_popup_modal_open", False)
 st.session_state.setdefault("_popup_payload", None)
 st.session_state.setdefault("_last_popup_id", None)
+# 알림 허브 버전 (바뀌었을 때만 DB에서 팝업 재조회)
+st.session_state.setdefault("_popup_seen_version", None)
+st.session_state.setdefault("_popup_checked_at", 0.0)
+st.session_state.setdefault("_popup_cached", None)
 
 # -------------------------
 # 테마/사이드바/상단바
@@ -192,15 +199,15 @@ def _inject_dialog_style():
 #  요약 모달 (중요공지 모달 밖에서만 호출되어야 함!)
 # -------------------------------------------------------
 @st.dialog("공지 요약", width="large")
-def popup_summary_dialog(popup_id: int, title: str, content: str):
+def popup_summary_dialog(popup_id: int, title: str, content: str, post_id: int = None):
     # 캐시 준비
     st.session_state.setdefault("popup_summary_cache", {})  # {popup_id: summary}
 
-    # 요약 생성(캐시 없을 때만)
+    # 요약 생성(캐시 없을 때만) - 공유 요약 캐시에 있으면 POTENS 호출 없이 바로 반환
     if popup_id not in st.session_state.popup_summary_cache:
         with st.spinner("공지 요약 중..."):
             st.session_state.popup_summary_cache[popup_id] = summarize_notice(
-                title=title or "", content=content or ""
+                title=title or "", content=content or "", post_id=post_id
             )
 
     summary = st.session_state.popup_summary_cache.get(popup_id, "")
@@ -422,14 +429,18 @@ def popup_banner_dialog(payload: dict):
                 "content": prompt
             })
             
-            with st.spinner("답변 생성 중..."):
-                result = engine.ask(prompt)
-                response = result["response"]
-                
-                st.session_state._popup_chat_messages.append({
-                    "role": "assistant",
-                    "content": response
-                })
+            # 답변을 받는 대로 대화창에 표시
+            with chat_container:
+                with st.chat_message("user"):
+                    st.markdown(prompt)
+                with st.chat_message("assistant"):
+                    st.write_stream(engine.ask_stream(prompt))
+            response = engine.last_result["response"]
+
+            st.session_state._popup_chat_messages.append({
+                "role": "assistant",
+                "content": response
+            })
             
             st.rerun()
         
@@ -609,10 +620,9 @@ def popup_banner_dialog(payload: dict):
             with st.container(height=CONTENT_HEIGHT, border=False):
                 try:
                     if img_url:
-                        from core.storage import get_file
+                        from core.file_cache import attachment_image_source
                         try:
-                            img_bytes = get_file(img_url)
-                            st.image(img_bytes, use_container_width=True)
+                            st.image(attachment_image_source(img_url), use_container_width=True)
                         except Exception as download_error:
                             st.warning(f"이미지 로드 중 오류: {str(download_error)}")
                             st.caption(f"이미지 URL: {img_url}")
@@ -669,6 +679,7 @@ def popup_banner_dialog(payload: dict):
             st.session_state["_popup_summary_modal_open"] = True
             st.session_state["_popup_summary_payload"] = {
                 "popup_id": popup_id,
+                "post_id": payload.get("postId", popup_id),
                 "title": title,
                 "content": content,
             }
@@ -693,6 +704,7 @@ if st.session_state.get("_popup_summary_modal_open", False):
             popup_id=payload["popup_id"],
             title=payload.get("title", ""),
             content=payload.get("content", ""),
+            post_id=payload.get("post_id"),
         )
         st.stop() # 중복으로 열려서 발생한 에러 해당 st.dialog는 하나만 열려야함
 
@@ -705,10 +717,24 @@ if menu == "홈":
     st.divider()
 
     st.subheader("직원 홈")
-    st.caption("※ 5초마다 중요공지(팝업)를 조회합니다.")
+    st.caption("※ 새 중요공지(팝업)가 발송되면 5초 이내에 표시됩니다.")
 
     emp_id = st.session_state.employee_id
-    popup = service.get_latest_popup_for_employee(emp_id)
+    emp_info = st.session_state.employee_info or {}
+    emp_team = emp_info.get("team")
+    emp_dept = emp_info.get("department")
+
+    # 나/내 팀/내 본부 대상 알림이 왔거나, 재동기화 주기가 지났을 때만 DB 조회
+    # 같은 브라우저 세션에서 다른 직원으로 재로그인한 경우도 구분하도록 사번 포함
+    version = (emp_id, popup_version(emp_id, emp_team, emp_dept))
+    if (
+        st.session_state._popup_seen_version != version
+        or time.time() - st.session_state._popup_checked_at >= NOTIFY_RESYNC_SEC
+    ):
+        st.session_state._popup_cached = service.get_latest_popup_for_employee(emp_id)
+        st.session_state._popup_seen_version = version
+        st.session_state._popup_checked_at = time.time()
+    popup = st.session_state._popup_cached
 
     if popup:
         popup_id = int(popup.get("popupId"))
@@ -727,8 +753,13 @@ if menu == "홈":
     if not popup:
         st.success("현재 수신한 중요공지가 없습니다.")
 
-    # time.sleep(5)
-    # st.rerun()
+    # 5초마다 메모리의 알림 버전만 확인 (DB 조회 없음), 바뀌면 전체 rerun
+    @st.fragment(run_every=5)
+    def _watch_popup_notifications():
+        if (emp_id, popup_version(emp_id, emp_team, emp_dept)) != st.session_state._popup_seen_version:
+            st.rerun()
+
+    _watch_popup_notifications()
 
 elif menu == "게시판":
 
@@ -748,7 +779,7 @@ elif menu == "게시판":
 
         # 핵심: 상세 진입 '최초 1회'만 조회수 +1
         if st.session_state.last_viewed_post_id != pid:
-            service.increment_views(pid)
+            service.increment_views(pid, employee_id=st.session_state.employee_id)
             st.session_state.last_viewed_post_id = pid
 
         post = service.get_post_by_id(pid)
@@ -774,15 +805,16 @@ elif menu == "게시판":
                         mime = (a.get("mimeType", "") or "").lower()
 
                         try:
-                            from core.storage import get_file
-                            data = get_file(path)
+                            from core.file_cache import attachment_download_data, attachment_image_source
+                            from core.renditions import BOARD_IMAGE_WIDTH, pick_rendition
 
                             if mime.startswith("image/"):
-                                st.image(data, caption=name)
+                                st.image(attachment_image_source(pick_rendition(a, BOARD_IMAGE_WIDTH)), caption=name)
 
+                            # 내용은 다운로드를 눌렀을 때 읽음 (ATTACHMENT_LAZY_DOWNLOAD=0 이면 바로)
                             st.download_button(
                                 label=f"다운로드: {name}",
-                                data=data,
+                                data=attachment_download_data(path),
                                 file_name=name,
                                 mime=a.get("mimeType", "") or None,
                                 key=f"dl_emp_{a['fileId']}",
@@ -815,7 +847,8 @@ elif menu == "게시판":
         box = st.container(border=True)
         with box:
             st.markdown("**전사 공지**")
-            posts = service.list_posts()
+            page = board_page("emp_board")
+            posts = page["items"]
 
             if not posts:
                 st.info("등록된 게시글이 없습니다.")
@@ -856,6 +889,8 @@ elif menu == "게시판":
                     
                     # 구분선
                     st.markdown("<hr style='margin: 0.2rem 0; border-top: 1px dashed #eee;'>", unsafe_allow_html=True)
+
+            render_board_pager("emp_board", page)
                     
 else:
     st.info("준비 중인 메뉴입니다.")
@@ -2,9 +2,23 @@ from __future__ import annotations
 import os
 import time
 from pathlib import Path
-from typing import Optional, Dict, List, Any
-
-from core.db import get_conn
+from typing import Optional, Dict, List, Any, Tuple
+
+from core.db import USE_POSTGRES, PostgresConnectionWrapper, get_conn
+from core.notify import publish_popup_event
+from core.notice_index import notice_changed, notice_deleted
+from core.answer_cache import invalidate_answers_for_notice
+from core.file_cache import forget_attachment
+from core.renditions import POPUP_IMAGE_WIDTH
+from core.notice_cache import NOTICE_CACHE_ENABLED, get_notice_cache, invalidate_notice
+from core.summary import forget_notice_summaries
+from core.summary_jobs import enqueue_summary_job, delete_summary_job, get_summary_job
+from core.view_counter import (
+    forget_views,
+    pending_views_many,
+    record_view,
+    unique_viewer_count,
+)
 
 # 관리자 계정 (데모)
 ADMIN_ID = "admin"
@@ -16,14 +30,61 @@ def now_ms() -> int:
 # -------------------------
 # B방식: 공통 로그인 함수 1개
 # -------------------------
-from core.auth import verify_password
+from core.auth import hash_password_async, needs_rehash, verify_password_pooled
+
+# 계정 + 직원 정보를 한 번에 (직원 계정이 아니면 e.* 컬럼은 NULL)
+_ACCOUNT_SQL = """
+    SELECT a.login_id, a.password_hash, a.role, a.employee_id,
+           e.employee_id AS emp_id, e.name, e.department, e.team, e.ignore_remaining
+    FROM accounts a
+    LEFT JOIN employees e ON e.employee_id = a.employee_id
+    WHERE a.login_id = ?
+"""
+
+
+def _fetch_account(login_id: str):
+    with get_conn() as conn:
+        return conn.execute(_ACCOUNT_SQL, (login_id,)).fetchone()
+
+
+def _employee_row(r) -> Optional[Dict]:
+    """_ACCOUNT_SQL 행의 직원 정보 (get_employee_info와 같은 형식)"""
+    if not r["emp_id"]:
+        return None
+    return {
+        "employeeId": r["emp_id"],
+        "name": r["name"],
+        "department": r["department"],
+        "team": r["team"],
+        "ignoreRemaining": int(r["ignore_remaining"] or 0),
+    }
+
+
+def _rehash_password(login_id: str, old_hash: str, pw: str) -> None:
+    """
+    현재 해시 설정(_ITERATIONS)으로 다시 저장 (해시 풀에서 계산, 로그인 응답은 기다리지 않음)
+    그 사이 비밀번호가 바뀌었으면 덮어쓰지 않음 (password_hash 비교 후 갱신)
+    """
+    def _store(fut):
+        try:
+            with get_conn() as conn:
+                conn.execute(
+                    "UPDATE accounts SET password_hash = ? WHERE login_id = ? AND password_hash = ?",
+                    (fut.result(), login_id, old_hash),
+                )
+        except Exception as e:
+            print(f"[login] 비밀번호 재해시 저장 실패 ({login_id}): {e}")
+
+    hash_password_async(pw).add_done_callback(_store)
+
 
 def login_account(login_id: str, pw: str) -> Optional[Dict]:
     """
     공통 로그인(ADMIN/EMPLOYEE 모두 비밀번호 검증):
-      1) accounts에서 login_id 조회
-      2) verify_password로 pw 검증
-      3) role에 따라 세션 정보 반환
+      1) accounts + employees를 한 번에 조회
+      2) 해시 풀에서 pw 검증 (core.auth.verify_password_pooled)
+      3) 해시 설정이 바뀐 계정이면 백그라운드에서 재해시 저장
+      4) role에 따라 세션 정보 반환
     """
     login_id = (login_id or "").strip()
     pw = (pw or "").strip()
@@ -31,30 +92,26 @@ def login_account(login_id: str, pw: str) -> Optional[Dict]:
     if not login_id or not pw:
         return None
 
-    with get_conn() as conn:
-        cur = conn.execute(
-            "SELECT login_id, password_hash, role, employee_id FROM accounts WHERE login_id = ?",
-            (login_id,),
-        )
-        acc = cur.fetchone()
-
+    acc = _fetch_account(login_id)
     if not acc:
         return None
 
-    if not verify_password(pw, acc["password_hash"]):
+    if not verify_password_pooled(pw, acc["password_hash"]):
         return None
 
+    if needs_rehash(acc["password_hash"]):
+        _rehash_password(acc["login_id"], acc["password_hash"], pw)
+
     role = acc["role"]
 
     if role == "ADMIN":
         return {"role": "ADMIN", "loginId": acc["login_id"]}
 
     if role == "EMPLOYEE":
-        emp_id = acc["employee_id"]
-        if not emp_id:
+        if not acc["employee_id"]:
             return None
 
-        emp = get_employee_info(emp_id)
+        emp = _employee_row(acc)
         if not emp:
             return None
 
@@ -111,57 +168,245 @@ def _safe_filename(name: str) -> str:
 
     return f"{safe_stem}{safe_ext}"
 
+_HASH_CHUNK = 1024 * 1024
+
+def _sha256_of(data) -> str:
+    """내용 해시 (1MB씩 나눠 계산, 큰 첨부를 복사하지 않음)"""
+    import hashlib
+
+    view = memoryview(data)
+    digest = hashlib.sha256()
+    for i in range(0, len(view), _HASH_CHUNK):
+        digest.update(view[i:i + _HASH_CHUNK])
+    return digest.hexdigest()
+
+def _blob_name(sha256: str, filename: str) -> str:
+    """내용 기준 저장 파일명 (같은 내용이면 어느 공지에서 올려도 같은 이름)"""
+    return f"{sha256}{Path(filename).suffix.lower()}"
+
+def _find_stored_blobs(conn, hashes: List[str]) -> Dict[str, Dict]:
+    """
+    이미 저장된 원본(+축소본) 찾기
+
+    Returns:
+        {sha256: {"filePath", "renditions": [notice_files 행]}}
+    """
+    if not hashes:
+        return {}
+    placeholders = ",".join("?" for _ in hashes)
+    cur = conn.execute(
+        f"""
+        SELECT file_id, file_path, content_sha256
+        FROM notice_files
+        WHERE content_sha256 IN ({placeholders}) AND source_file_id IS NULL
+        ORDER BY file_id ASC
+        """,
+        hashes,
+    )
+    found: Dict[str, Dict] = {}
+    by_file_id: Dict[int, Dict] = {}
+    for r in cur.fetchall():
+        path = r["file_path"]
+        # 로컬 파일이 지워졌으면 다시 저장
+        if r["content_sha256"] in found or (not path.startswith("http") and not os.path.exists(path)):
+            continue
+        found[r["content_sha256"]] = by_file_id[int(r["file_id"])] = {"filePath": path, "renditions": []}
+
+    if by_file_id:
+        placeholders = ",".join("?" for _ in by_file_id)
+        cur = conn.execute(
+            f"""
+            SELECT source_file_id, filename, mime_type, file_path, file_size, variant, width, content_sha256
+            FROM notice_files
+            WHERE source_file_id IN ({placeholders})
+            ORDER BY file_id ASC
+            """,
+            list(by_file_id),
+        )
+        for r in cur.fetchall():
+            by_file_id[int(r["source_file_id"])]["renditions"].append(r)
+    return found
+
+def _blob_paths(blob: Dict) -> List[str]:
+    """원본 + 축소본 저장 경로"""
+    return [blob["filePath"]] + [r["file_path"] for r in blob["renditions"]]
+
+def _upload_blobs(files: List[Dict]) -> Dict[str, Dict]:
+    """
+    원본(+이미지면 화면 폭별 축소본)을 로컬 또는 R2에 동시에 저장 (같은 내용은 한 번만)
+
+    Returns:
+        {sha256: {"filePath", "renditions": [notice_files 행 dict]}}
+    """
+    from core.renditions import make_renditions
+    from core.storage import save_files
+    import io
+
+    uploads = []    # save_files 입력
+    pending: Dict[str, Dict] = {}
+    for f in files:
+        sha = f["sha256"]
+        if sha in pending:
+            continue
+        # 저장 파일명: 내용 해시 + 확장자
+        uploads.append((io.BytesIO(f["data"]), _blob_name(sha, f["name"]), "uploads", f["mime"]))
+        entry = pending[sha] = {"index": len(uploads) - 1, "renditions": []}
+
+        stem = Path(f["name"]).stem
+        for r in make_renditions(bytes(f["data"]), f["mime"]):
+            r_name = f"{stem}_w{r['width']}.{r['ext']}"
+            r_sha = _sha256_of(r["data"])
+            uploads.append((io.BytesIO(r["data"]), _blob_name(r_sha, r_name), "uploads", r["mimeType"]))
+            entry["renditions"].append({
+                "filename": r_name,
+                "mime_type": r["mimeType"],
+                "file_size": len(r["data"]),
+                "variant": f"w{r['width']}",
+                "width": r["width"],
+                "content_sha256": r_sha,
+                "index": len(uploads) - 1,
+            })
+
+    # 환경에 따라 로컬 또는 R2에 저장 (반환값: 로컬 경로 또는 R2 URL)
+    paths = save_files(uploads) if uploads else []
+    for entry in pending.values():
+        entry["filePath"] = paths[entry["index"]]
+        for r in entry["renditions"]:
+            r["file_path"] = paths[r["index"]]
+    return pending
+
+def _lock_attachment_paths(conn, paths: List[str]) -> None:
+    """
+    첨부 파일 경로 잠금 (트랜잭션이 끝날 때까지 유지)
+
+    공유 파일을 참조하는 저장과 마지막 참조가 없어진 파일 삭제가 겹치지 않도록 양쪽에서 잡는다.
+    - PostgreSQL: 경로별 advisory lock (교착 방지를 위해 정렬 순서로)
+    - SQLite: 쓰기 잠금 (BEGIN IMMEDIATE, 경로와 관계없이 전체 직렬화)
+    """
+    if isinstance(conn, PostgresConnectionWrapper):
+        for path in sorted(set(paths)):
+            conn.execute("SELECT pg_advisory_xact_lock(hashtext(?))", (path,))
+    elif not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
 def save_attachments(post_id: int, uploaded_files: List[Any]) -> None:
     """
     Streamlit UploadedFile 리스트를 받아서:
-      1) 로컬(uploads/) 또는 R2에 저장 (환경 자동 감지)
-      2) notice_files 테이블에 메타데이터 저장
+      1) 내용 해시(SHA-256)로 이미 저장된 파일이면 업로드/축소본 생성 생략하고 그 파일을 참조
+      2) 새 파일이고 이미지면 화면 폭별 축소본 생성 (팝업/게시판은 맞는 크기 중 가장 작은 것을 사용)
+      3) 새 파일(원본 + 축소본)을 로컬(uploads/) 또는 R2에 동시에 저장 (환경 자동 감지)
+      4) notice_files 테이블에 메타데이터를 한 트랜잭션으로 저장
+         (참조할 기존 파일은 이 트랜잭션에서 잠금 후 다시 확인, 그 사이 삭제됐으면 다시 저장)
+
+    같은 파일은 저장소에 1개만 두고 notice_files 행들이 공유한다 (삭제는 마지막 참조가 없어질 때).
     """
     if not uploaded_files:
         return
 
-    from core.storage import save_file
-    import io
+    from core.storage import file_exists
 
     ts = now_ms()
 
-    with get_conn() as conn:
-        for uf in uploaded_files:
-            # uf: streamlit.runtime.uploaded_file_manager.UploadedFile
-            orig_name = _safe_filename(getattr(uf, "name", "") or "file")
-            mime = getattr(uf, "type", "") or ""
-            data = uf.getbuffer()
-            size = int(len(data))
+    files = []
+    for uf in uploaded_files:
+        # uf: streamlit.runtime.uploaded_file_manager.UploadedFile
+        data = uf.getbuffer()
+        files.append({
+            "name": _safe_filename(getattr(uf, "name", "") or "file"),
+            "mime": getattr(uf, "type", "") or "",
+            "data": data,
+            "size": int(len(data)),
+            "sha256": _sha256_of(data),
+        })
 
-            # 저장 파일명: postid_timestamp_originalname
-            save_name = f"{int(post_id)}_{ts}_{orig_name}"
+    with get_conn() as conn:
+        stored = _find_stored_blobs(conn, list(dict.fromkeys(f["sha256"] for f in files)))
 
-            # BytesIO로 변환
-            file_io = io.BytesIO(data)
+    # 1) 새 파일(원본 + 축소본)을 로컬 또는 R2에 저장 (같은 요청 안의 중복도 한 번만)
+    pending = _upload_blobs([f for f in files if f["sha256"] not in stored])
+    reused = {sha: blob for sha, blob in stored.items() if sha not in pending}
+    stored.update(pending)
 
-            # 환경에 따라 로컬 또는 R2에 저장
-            # 반환값: 로컬 경로 또는 R2 URL
-            file_path_or_url = save_file(
-                file_data=file_io,
-                filename=save_name,
-                folder="uploads",
-                content_type=mime
-            )
-
-            # DB 저장
-            conn.execute(
+    # 2) DB 저장 (업로드가 끝난 뒤라 연결을 네트워크 전송 동안 잡고 있지 않음)
+    with get_conn() as conn:
+        if reused:
+            # 중복 확인 뒤 다른 공지 삭제로 공유 파일이 지워졌을 수 있으므로
+            # 삭제(_delete_unreferenced_files)와 같은 잠금을 잡고 다시 확인, 없어진 파일은 다시 저장
+            _lock_attachment_paths(conn, [p for blob in reused.values() for p in _blob_paths(blob)])
+            lost = {sha for sha, blob in reused.items() if not all(file_exists(p) for p in _blob_paths(blob))}
+            if lost:
+                print(f"[service] 공유 첨부 파일 {len(lost)}개가 없어져 다시 저장")
+                stored.update(_upload_blobs([f for f in files if f["sha256"] in lost]))
+        for f in files:
+            blob = stored[f["sha256"]]
+            cur = conn.execute(
                 """
-                INSERT INTO notice_files(post_id, filename, mime_type, file_path, file_size, uploaded_at)
-                VALUES(?,?,?,?,?,?)
+                INSERT INTO notice_files(post_id, filename, mime_type, file_path, file_size, uploaded_at, content_sha256)
+                VALUES(?,?,?,?,?,?,?)
+                RETURNING file_id
                 """,
-                (int(post_id), orig_name, mime, file_path_or_url, size, ts),
+                (int(post_id), f["name"], f["mime"], blob["filePath"], f["size"], ts, f["sha256"]),
             )
+            file_id = int(cur.fetchone()["file_id"])
+            if blob["renditions"]:
+                conn.executemany(
+                    """
+                    INSERT INTO notice_files(post_id, filename, mime_type, file_path, file_size, uploaded_at,
+                                             variant, source_file_id, width, content_sha256)
+                    VALUES(?,?,?,?,?,?,?,?,?,?)
+                    """,
+                    [
+                        (int(post_id), r["filename"], r["mime_type"], r["file_path"], int(r["file_size"] or 0), ts,
+                         r["variant"], file_id, r["width"], r["content_sha256"])
+                        for r in blob["renditions"]
+                    ],
+                )
+    invalidate_notice(int(post_id))
+
+def _attachment_row(r) -> Dict:
+    return {
+        "fileId": int(r["file_id"]),
+        "postId": int(r["post_id"]),
+        "filename": r["filename"],
+        "mimeType": r["mime_type"],
+        "filePath": r["file_path"],
+        "fileSize": int(r["file_size"] or 0),
+        "uploadedAt": int(r["uploaded_at"] or 0),
+    }
+
+def _group_attachments(rows) -> List[Dict]:
+    """notice_files 행(file_id 순)을 원본 목록으로 묶고 축소본은 원본의 renditions에 (폭 오름차순)"""
+    originals: List[Dict] = []
+    by_id: Dict[int, Dict] = {}
+    for r in rows:
+        if r["source_file_id"] is None:
+            att = _attachment_row(r)
+            att["renditions"] = []
+            originals.append(att)
+            by_id[att["fileId"]] = att
+            continue
+        src = by_id.get(int(r["source_file_id"]))
+        if src is not None:
+            src["renditions"].append({
+                "fileId": int(r["file_id"]),
+                "width": int(r["width"] or 0),
+                "mimeType": r["mime_type"],
+                "filePath": r["file_path"],
+                "fileSize": int(r["file_size"] or 0),
+            })
+    for att in originals:
+        att["renditions"].sort(key=lambda x: x["width"])
+    return originals
 
 def list_attachments(post_id: int) -> List[Dict]:
+    """
+    첨부 원본 목록 (이미지 축소본은 각 항목의 renditions에 포함)
+    """
     with get_conn() as conn:
         cur = conn.execute(
             """
-            SELECT file_id, post_id, filename, mime_type, file_path, file_size, uploaded_at
+            SELECT file_id, post_id, filename, mime_type, file_path, file_size, uploaded_at,
+                   source_file_id, width
             FROM notice_files
             WHERE post_id = ?
             ORDER BY file_id ASC
@@ -170,18 +415,7 @@ def list_attachments(post_id: int) -> List[Dict]:
         )
         rows = cur.fetchall()
 
-    res: List[Dict] = []
-    for r in rows:
-        res.append({
-            "fileId": int(r["file_id"]),
-            "postId": int(r["post_id"]),
-            "filename": r["filename"],
-            "mimeType": r["mime_type"],
-            "filePath": r["file_path"],
-            "fileSize": int(r["file_size"] or 0),
-            "uploadedAt": int(r["uploaded_at"] or 0),
-        })
-    return res
+    return _group_attachments(rows)
 
 def get_first_image_attachment(post_id: int) -> Optional[Dict]:
     """
@@ -212,6 +446,12 @@ def save_post(title: str, content: str, ntype: str, uploaded_files: Optional[Lis
             """,
             (post_id, ts, safe_type, title, content, author),
         )
+    notice_changed(post_id)
+    _post_count_cache.clear()
+
+    # 중요공지는 팝업 "요약 보기"가 바로 뜨도록 요약을 미리 생성
+    if safe_type == "중요":
+        _enqueue_summary(post_id)
 
     #  첨부 저장
     if uploaded_files:
@@ -232,6 +472,8 @@ def list_posts() -> List[Dict]:
         cur = conn.execute("SELECT * FROM notices ORDER BY post_id DESC")
         rows = cur.fetchall()
 
+    # 아직 저장 전인 조회 증가분 반영
+    pending = pending_views_many(r["post_id"] for r in rows)
     result = []
     for r in rows:
         result.append({
@@ -241,35 +483,237 @@ def list_posts() -> List[Dict]:
             "title": r["title"],
             "content": r["content"],
             "author": r["author"],
-            "views": int(r["views"] or 0),
+            "views": int(r["views"] or 0) + pending.get(int(r["post_id"]), 0),
         })
     return result
 
-def get_post_by_id(post_id: int) -> Optional[Dict]:
-    with get_conn() as conn:
-        cur = conn.execute("SELECT * FROM notices WHERE post_id = ?", (int(post_id),))
-        r = cur.fetchone()
-    if not r:
-        return None
+# 목록 총 건수 캐시 (필터 -> (만료 시각, 건수)), 공지 저장/삭제 시 비움
+NOTICE_COUNT_CACHE_SEC = float(os.getenv("NOTICE_COUNT_CACHE_SEC", "30"))
+_post_count_cache: Dict[Tuple[Optional[str], Optional[str]], Tuple[float, int]] = {}
 
-    # 첨부 목록 포함해서 반환
-    attachments = list_attachments(int(post_id))
 
-    return {
+def _post_list_filters(ntype: Optional[str], department: Optional[str]) -> Tuple[List[str], List[Any]]:
+    where, params = [], []
+    if ntype:
+        where.append("type = ?")
+        params.append(ntype)
+    if department:
+        where.append("department = ?")
+        params.append(department)
+    return where, params
+
+
+def list_posts_page(
+    page_size: int = 20,
+    before_post_id: Optional[int] = None,
+    ntype: Optional[str] = None,
+    department: Optional[str] = None,
+) -> Dict:
+    """
+    공지 목록 한 페이지 (post_id 내림차순 keyset 페이지네이션, 본문 제외)
+
+    Args:
+        page_size: 페이지당 건수
+        before_post_id: 이전 페이지 마지막 post_id (None이면 첫 페이지)
+        ntype: "중요" | "일반" (None이면 전체)
+        department: 공지 부서 (None이면 전체)
+
+    Returns:
+        {
+            "items": [{"postId", "timestamp", "type", "title", "author", "views", "department"}, ...],
+            "nextCursor": 다음 페이지 before_post_id (마지막 페이지면 None),
+            "totalEstimate": 조건에 맞는 공지 수 (캐시된 추정치)
+        }
+    """
+    page_size = max(1, int(page_size))
+    where, params = _post_list_filters(ntype, department)
+    if before_post_id is not None:
+        where.append("post_id < ?")
+        params.append(int(before_post_id))
+
+    sql = "SELECT post_id, created_at, type, title, author, views, department FROM notices"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY post_id DESC LIMIT ?"
+    params.append(page_size + 1)  # 1건 더 읽어서 다음 페이지 유무 판단
+
+    with get_conn() as conn:
+        rows = conn.execute(sql, tuple(params)).fetchall()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    pending = pending_views_many(r["post_id"] for r in rows)
+    items = [{
         "postId": r["post_id"],
         "timestamp": r["created_at"],
         "type": r["type"],
         "title": r["title"],
-        "content": r["content"],
         "author": r["author"],
-        "views": int(r["views"] or 0),
-        "attachments": attachments,
+        "views": int(r["views"] or 0) + pending.get(int(r["post_id"]), 0),
+        "department": r["department"] or "전체",
+    } for r in rows]
+
+    return {
+        "items": items,
+        "nextCursor": int(rows[-1]["post_id"]) if has_more else None,
+        "totalEstimate": count_posts_estimate(ntype, department),
     }
 
-def increment_views(post_id: int) -> bool:
+
+def count_posts_estimate(ntype: Optional[str] = None, department: Optional[str] = None) -> int:
+    """
+    조건에 맞는 공지 수 (NOTICE_COUNT_CACHE_SEC 동안 캐시)
+
+    PostgreSQL에서 필터가 없으면 COUNT(*) 대신 통계 정보(pg_class.reltuples)를 사용
+    """
+    key = (ntype or None, department or None)
+    cached = _post_count_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    where, params = _post_list_filters(ntype, department)
+    count = None
     with get_conn() as conn:
-        cur = conn.execute("UPDATE notices SET views = views + 1 WHERE post_id = ?", (int(post_id),))
-        return cur.rowcount > 0
+        if USE_POSTGRES and not where:
+            r = conn.execute("SELECT reltuples::BIGINT AS cnt FROM pg_class WHERE relname = 'notices'").fetchone()
+            # 한 번도 ANALYZE되지 않은 테이블은 -1
+            if r and int(r["cnt"]) >= 0:
+                count = int(r["cnt"])
+        if count is None:
+            sql = "SELECT COUNT(1) AS cnt FROM notices"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            count = int(conn.execute(sql, tuple(params)).fetchone()["cnt"])
+
+    _post_count_cache[key] = (time.monotonic() + NOTICE_COUNT_CACHE_SEC, count)
+    return count
+
+
+def list_post_departments() -> List[str]:
+    """공지 목록 부서 필터 선택지"""
+    with get_conn() as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT department FROM notices WHERE department IS NOT NULL ORDER BY department"
+        ).fetchall()
+    return [r["department"] for r in rows]
+
+
+def _load_posts(post_ids: List[int]) -> Dict[int, Dict]:
+    """공지 여러 건을 첨부 목록과 함께 한 번의 쿼리로 조회 (조회수는 DB 저장분만)"""
+    if not post_ids:
+        return {}
+    placeholders = ",".join("?" for _ in post_ids)
+    with get_conn() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT n.post_id, n.created_at, n.type, n.title, n.content, n.author, n.views,
+                   f.file_id, f.filename, f.mime_type, f.file_path, f.file_size, f.uploaded_at,
+                   f.source_file_id, f.width
+            FROM notices n
+            LEFT JOIN notice_files f ON f.post_id = n.post_id
+            WHERE n.post_id IN ({placeholders})
+            ORDER BY n.post_id, f.file_id
+            """,
+            [int(p) for p in post_ids],
+        )
+        rows = cur.fetchall()
+
+    posts: Dict[int, Dict] = {}
+    files: Dict[int, List] = {}
+    for r in rows:
+        pid = int(r["post_id"])
+        post = posts.get(pid)
+        if post is None:
+            files[pid] = []
+            post = posts[pid] = {
+                "postId": r["post_id"],
+                "timestamp": r["created_at"],
+                "type": r["type"],
+                "title": r["title"],
+                "content": r["content"],
+                "author": r["author"],
+                "views": int(r["views"] or 0),
+                "attachments": [],
+            }
+        if r["file_id"] is not None:
+            files[pid].append(r)
+    for pid, post in posts.items():
+        post["attachments"] = _group_attachments(files[pid])
+    return posts
+
+def _load_views(post_ids: List[int]) -> Dict[int, int]:
+    """공지별 DB 저장 조회수 (캐시된 공지 상세에 채워 넣음)"""
+    placeholders = ",".join("?" for _ in post_ids)
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"SELECT post_id, views FROM notices WHERE post_id IN ({placeholders})",
+            [int(p) for p in post_ids],
+        ).fetchall()
+    return {int(r["post_id"]): int(r["views"] or 0) for r in rows}
+
+def get_posts_by_ids(post_ids: List[int]) -> Dict[int, Dict]:
+    """
+    공지 상세 여러 건 조회 (공지 상세 캐시 사용 - core/notice_cache.py)
+
+    Args:
+        post_ids: 공지 ID 목록 (중복/없는 ID는 무시)
+
+    Returns:
+        {post_id: get_post_by_id와 같은 형식의 dict}
+    """
+    ids = list(dict.fromkeys(int(p) for p in post_ids))
+    if not ids:
+        return {}
+
+    if NOTICE_CACHE_ENABLED:
+        cache = get_notice_cache()
+        posts, missing = cache.get_many(ids)
+        # 조회 전 세대를 읽어 두어 조회 중에 수정/무효화된 공지는 캐시에 넣지 않음
+        generations = cache.generations(missing)
+        loaded = _load_posts(missing)
+        for pid, post in loaded.items():
+            cached = dict(post)
+            cached.pop("views", None)   # 조회수는 캐시하지 않음
+            cache.put(pid, cached, generations[pid])
+        if posts:
+            views = _load_views(list(posts))
+            # 캐시에 있지만 그 사이 삭제된 공지는 제외
+            posts = {pid: post for pid, post in posts.items() if pid in views}
+            for pid, post in posts.items():
+                post["views"] = views[pid]
+        posts.update(loaded)
+    else:
+        posts = _load_posts(ids)
+
+    # 저장 전 조회 증가분은 반환할 때만 더함
+    for pid, delta in pending_views_many(posts.keys()).items():
+        posts[pid]["views"] += delta
+    return posts
+
+def get_post_by_id(post_id: int) -> Optional[Dict]:
+    return get_posts_by_ids([int(post_id)]).get(int(post_id))
+
+def increment_views(post_id: int, employee_id: Optional[str] = None) -> bool:
+    """
+    조회수 +1 (메모리에 모았다가 백그라운드에서 일괄 저장 - core/view_counter.py)
+
+    Args:
+        post_id: 공지 ID
+        employee_id: 조회한 직원 (VIEW_UNIQUE_VIEWERS=1 이면 직원별 최초 조회 기록)
+
+    Returns:
+        기록 여부 (저장 실패는 다음 주기에 재시도)
+    """
+    try:
+        record_view(int(post_id), employee_id)
+        return True
+    except Exception as e:
+        print(f"[Warning] Failed to record view: {e} (post_id={post_id})")
+        return False
+
+def get_unique_viewer_count(post_id: int) -> int:
+    """공지를 열어본 직원 수 (VIEW_UNIQUE_VIEWERS=1 일 때만 집계됨)"""
+    return unique_viewer_count(int(post_id))
 
 def update_post(post_id: int, title: str, content: str, ntype: str, uploaded_files: Optional[List[Any]] = None) -> bool:
     """
@@ -297,6 +741,14 @@ def update_post(post_id: int, title: str, content: str, ntype: str, uploaded_fil
             (title, content, safe_type, int(post_id)),
         )
         success = cur.rowcount > 0
+    if success:
+        notice_changed(int(post_id))
+        _post_count_cache.clear()
+        invalidate_notice(int(post_id))
+        invalidate_answers_for_notice(int(post_id))
+        _forget_stale_summaries(int(post_id), title, content)
+        if safe_type == "중요":
+            _enqueue_summary(int(post_id))
 
     # 새 첨부파일 추가 (기존 파일은 유지)
     if success and uploaded_files:
@@ -304,9 +756,31 @@ def update_post(post_id: int, title: str, content: str, ntype: str, uploaded_fil
 
     return success
 
+def _forget_stale_summaries(post_id: int, title: str, content: str) -> None:
+    """
+    수정 전 내용의 요약 정리 (요약 캐시 키가 내용 해시라 새 내용은 자동으로 새 요약)
+
+    이미 발송된 팝업은 발송 시점 내용을 그대로 보여주므로 그 요약은 남겨둔다.
+    """
+    with get_conn() as conn:
+        cur = conn.execute("SELECT title, content FROM popups WHERE post_id = ?", (int(post_id),))
+        keep = [(r["title"], r["content"]) for r in cur.fetchall()]
+    keep.append((title, content))
+    try:
+        forget_notice_summaries(post_id, keep)
+    except Exception as e:
+        print(f"[Warning] Failed to clean up notice summaries: {e} (post_id={post_id})")
+
+def _enqueue_summary(post_id: int) -> None:
+    """요약 작업 등록 (실패해도 게시글 저장은 유지, 요약은 요청 시 생성됨)"""
+    try:
+        enqueue_summary_job(post_id)
+    except Exception as e:
+        print(f"[Warning] Failed to enqueue summary job: {e} (post_id={post_id})")
+
 def delete_post(post_id: int) -> bool:
     """
-    게시글 삭제 (첨부파일 및 연관된 팝업도 CASCADE로 삭제됨)
+    게시글 삭제 (첨부파일 및 연관된 팝업도 삭제, 다른 공지와 공유하는 첨부 파일은 유지)
 
     Args:
         post_id: 삭제할 게시글 ID
@@ -314,20 +788,61 @@ def delete_post(post_id: int) -> bool:
     Returns:
         성공 여부
     """
-    # 첨부파일 물리적 삭제
+    # 첨부파일 경로 (원본 + 축소본, DB 삭제 후 다른 공지가 참조하지 않는 것만 물리적 삭제)
     attachments = list_attachments(int(post_id))
-    for att in attachments:
-        file_path = att.get("filePath", "")
-        if file_path and os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception:
-                pass
+    file_paths = {
+        p for att in attachments
+        for p in [att.get("filePath", "")] + [r["filePath"] for r in att.get("renditions", [])]
+        if p
+    }
 
     # DB 삭제 (FK CASCADE로 notice_files, popups, popup_logs도 자동 삭제)
     with get_conn() as conn:
+        # FK ON DELETE CASCADE가 동작하지 않을 수 있으므로 팝업 수신/대상 목록 먼저 삭제
+        conn.execute(
+            "DELETE FROM popup_deliveries WHERE popup_id IN (SELECT popup_id FROM popups WHERE post_id = ?)",
+            (int(post_id),),
+        )
+        conn.execute(
+            "DELETE FROM popup_targets WHERE popup_id IN (SELECT popup_id FROM popups WHERE post_id = ?)",
+            (int(post_id),),
+        )
+        conn.execute("DELETE FROM notice_summaries WHERE post_id = ?", (int(post_id),))
+        conn.execute("DELETE FROM notice_viewers WHERE post_id = ?", (int(post_id),))
+        # 첨부 참조 수가 정확해야 하므로 FK CASCADE에 맡기지 않고 직접 삭제
+        conn.execute("DELETE FROM notice_files WHERE post_id = ?", (int(post_id),))
+        delete_summary_job(conn, int(post_id))
         cur = conn.execute("DELETE FROM notices WHERE post_id = ?", (int(post_id),))
-        return cur.rowcount > 0
+        success = cur.rowcount > 0
+    if success:
+        _delete_unreferenced_files(file_paths)
+        notice_deleted(int(post_id))
+        _post_count_cache.clear()
+        invalidate_notice(int(post_id))
+        forget_views(int(post_id))
+        invalidate_answers_for_notice(int(post_id))
+        forget_notice_summaries(int(post_id))
+    return success
+
+def _delete_unreferenced_files(file_paths) -> None:
+    """
+    notice_files에서 더 이상 참조하지 않는 첨부 파일 삭제 (로컬 또는 R2)
+
+    save_attachments가 같은 파일을 새로 참조하는 것과 겹치지 않도록
+    경로 잠금을 잡은 채로 파일마다 삭제 직전에 참조 여부를 다시 확인한다.
+    """
+    from core.storage import delete_file
+
+    paths = sorted(set(file_paths))
+    if not paths:
+        return
+    with get_conn() as conn:
+        _lock_attachment_paths(conn, paths)
+        for path in paths:
+            if conn.execute("SELECT 1 FROM notice_files WHERE file_path = ? LIMIT 1", (path,)).fetchone():
+                continue
+            delete_file(path)
+            forget_attachment(path)
 
 # -------------------------
 # 팝업(Popup)
@@ -337,8 +852,10 @@ def create_popup(post_info: Dict, selected_departments: List[str], selected_team
     post_id = int(post_info["postId"])
     title = str(post_info["title"])
     content = str(post_info["content"])
-    dept_csv = ",".join(selected_departments or [])
-    team_csv = ",".join(selected_teams or [])
+    departments = [d for d in (selected_departments or []) if d]
+    teams = [t for t in (selected_teams or []) if t]
+    dept_csv = ",".join(departments)
+    team_csv = ",".join(teams)
     ts = now_ms()
 
     with get_conn() as conn:
@@ -349,8 +866,149 @@ def create_popup(post_info: Dict, selected_departments: List[str], selected_team
             """,
             (popup_id, post_id, title, content, dept_csv, team_csv, ts),
         )
+        # 대상(본부/팀) 정규화 저장 + 발송 시점 기준 수신 직원 목록 확정
+        _save_popup_targets(conn, popup_id, departments, teams)
+        _save_popup_deliveries(conn, popup_id, departments, teams, ts)
+
+    # 이전에 저장된 공지라 요약이 없을 수 있으므로 발송 시점에도 등록 (이미 있으면 캐시로 바로 완료)
+    _enqueue_summary(post_id)
+
+    # 커밋 이후 대상 세션에 알림 (팀 지정이 있으면 팀, 없으면 본부 단위)
+    if teams:
+        publish_popup_event(teams=teams)
+    else:
+        publish_popup_event(departments=departments)
     return True
 
+def _save_popup_targets(conn, popup_id: int, departments: List[str], teams: List[str]) -> None:
+    rows = [(int(popup_id), "DEPARTMENT", d) for d in dict.fromkeys(departments)]
+    rows += [(int(popup_id), "TEAM", t) for t in dict.fromkeys(teams)]
+    if rows:
+        conn.executemany(
+            "INSERT INTO popup_targets(popup_id, target_type, target_value) VALUES(?,?,?)",
+            rows,
+        )
+
+def _resolve_popup_recipients(conn, departments: List[str], teams: List[str]) -> List[str]:
+    """
+    팝업 대상 직원 ID 목록
+
+    최종 룰:
+      1) 팀 지정 -> 팀 기준
+      2) 팀 없음 + 본부 지정 -> 본부 기준
+      3) 둘 다 없음 -> 발송 안 함
+    """
+    if teams:
+        column, values = "team", list(dict.fromkeys(teams))
+    elif departments:
+        column, values = "department", list(dict.fromkeys(departments))
+    else:
+        return []
+
+    placeholders = ",".join("?" * len(values))
+    cur = conn.execute(
+        f"SELECT employee_id FROM employees WHERE {column} IN ({placeholders})",
+        values,
+    )
+    return [r["employee_id"] for r in cur.fetchall()]
+
+def _save_popup_deliveries(conn, popup_id: int, departments: List[str], teams: List[str], created_at: int) -> int:
+    recipients = _resolve_popup_recipients(conn, departments, teams)
+    if recipients:
+        conn.executemany(
+            "INSERT INTO popup_deliveries(popup_id, employee_id, created_at) VALUES(?,?,?)",
+            [(int(popup_id), emp_id, int(created_at)) for emp_id in recipients],
+        )
+    return len(recipients)
+
+def count_popup_recipients(selected_departments: List[str], selected_teams: List[str]) -> int:
+    """팝업 발송 전 수신 대상 직원 수 미리보기"""
+    departments = [d for d in (selected_departments or []) if d]
+    teams = [t for t in (selected_teams or []) if t]
+    with get_conn() as conn:
+        return len(_resolve_popup_recipients(conn, departments, teams))
+
+def get_popup_delivery_stats(post_id: int) -> Dict[str, int]:
+    """
+    게시글에 연결된 팝업의 수신/응답 현황
+
+    Returns:
+        {"recipients": 수신 직원 수, "responded": 응답한 직원 수}
+    """
+    with get_conn() as conn:
+        cur = conn.execute(
+            """
+            SELECT COUNT(1) AS recipients,
+                   COUNT(d.responded_at) AS responded
+            FROM popups p
+            JOIN popup_deliveries d ON d.popup_id = p.popup_id
+            WHERE p.post_id = ?
+            """,
+            (int(post_id),),
+        )
+        r = cur.fetchone()
+    return {
+        "recipients": int(r["recipients"] or 0) if r else 0,
+        "responded": int(r["responded"] or 0) if r else 0,
+    }
+
+def get_summary_job_status(post_id: int) -> Optional[Dict]:
+    """
+    게시글 AI 요약 미리 생성 작업 상태
+
+    Returns:
+        {"status", "statusLabel", "attempts", "lastError", "updatedAt"} 또는 None(작업 없음)
+    """
+    return get_summary_job(post_id)
+
+def backfill_popup_deliveries() -> int:
+    """
+    CSV 대상만 저장된 기존 팝업을 popup_targets / popup_deliveries로 이관
+
+    - 이미 popup_targets 행이 있는 팝업은 건너뜀 (init_db에서 매번 호출해도 안전)
+    - 이미 응답한 직원은 popup_logs 기준으로 responded_at 채움
+
+    Returns:
+        이관한 팝업 수
+    """
+    with get_conn() as conn:
+        cur = conn.execute(
+            """
+            SELECT p.popup_id, p.target_departments, p.target_teams, p.created_at
+            FROM popups p
+            WHERE NOT EXISTS (SELECT 1 FROM popup_targets t WHERE t.popup_id = p.popup_id)
+            """
+        )
+        rows = cur.fetchall()
+
+        migrated = 0
+        for r in rows:
+            departments = _parse_csv(r["target_departments"])
+            teams = _parse_csv(r["target_teams"])
+            if not departments and not teams:
+                continue
+
+            popup_id = int(r["popup_id"])
+            _save_popup_targets(conn, popup_id, departments, teams)
+            _save_popup_deliveries(conn, popup_id, departments, teams, int(r["created_at"]))
+            conn.execute(
+                """
+                UPDATE popup_deliveries
+                SET responded_at = (
+                    SELECT MIN(l.created_at) FROM popup_logs l
+                    WHERE l.employee_id = popup_deliveries.employee_id
+                      AND l.popup_id = popup_deliveries.popup_id
+                )
+                WHERE popup_id = ? AND responded_at IS NULL
+                """,
+                (popup_id,),
+            )
+            migrated += 1
+
+    if migrated:
+        print(f"✅ 기존 팝업 {migrated}건 수신자 테이블 이관 완료")
+    return migrated
+
 
 # -------------------------
 # 직원(Employee)
@@ -387,56 +1045,80 @@ def _has_responded(employee_id: str, popup_id: int) -> bool:
         )
         return cur.fetchone() is not None
 
+# 직원 1명 기준 "최신 미응답 대상 팝업 + 첫 이미지"를 한 번에 구하는 쿼리
+# - 대상 판정: create_popup 시점에 계산해 둔 popup_deliveries 사용
+#   (employee_id, responded_at, created_at) 인덱스로 미응답 행만 최신순 조회
+# - 미응답: popup_logs(employee_id, popup_id) NOT EXISTS anti-join으로 한 번 더 확인
+#   (responded_at 갱신 이전에 쌓인 로그 대비)
+# - 이미지: notice_files(post_id) 인덱스를 타는 상관 서브쿼리
+#   첫 이미지 원본의 축소본 중 팝업 폭(POPUP_IMAGE_WIDTH) 이상인 가장 작은 것, 없으면 원본
+_PENDING_POPUP_SQL = """
+    SELECT p.popup_id, p.post_id, p.title, p.content,
+           e.ignore_remaining,
+           (
+               SELECT COALESCE(
+                   (
+                       SELECT r.file_path
+                       FROM notice_files r
+                       WHERE r.source_file_id = f.file_id AND r.width >= ?
+                       ORDER BY r.width ASC
+                       LIMIT 1
+                   ),
+                   f.file_path
+               )
+               FROM notice_files f
+               WHERE f.post_id = p.post_id
+                 AND f.source_file_id IS NULL
+                 AND SUBSTR(LOWER(f.mime_type), 1, 6) = 'image/'
+               ORDER BY f.file_id ASC
+               LIMIT 1
+           ) AS image_path
+    FROM popup_deliveries d
+    JOIN popups p ON p.popup_id = d.popup_id
+    JOIN employees e ON e.employee_id = d.employee_id
+    WHERE d.employee_id = ?
+      AND d.responded_at IS NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM popup_logs l
+          WHERE l.employee_id = d.employee_id AND l.popup_id = d.popup_id
+      )
+    ORDER BY d.created_at DESC
+    LIMIT 1
+"""
+
 def get_latest_popup_for_employee(employee_id: str) -> Optional[Dict]:
-    emp = get_employee_info(employee_id)
-    if not emp:
-        return None
+    """
+    직원에게 띄울 최신 미응답 팝업 1건 조회 (첫 번째 이미지 첨부 포함)
 
+    홈 화면 rerun마다 호출되므로 대상 판정/응답 여부/이미지 조회를
+    연결 1개, 쿼리 1번으로 처리한다. 대상 직원은 발송 시점(create_popup)
+    기준으로 popup_deliveries에 확정되어 있다.
+    """
     with get_conn() as conn:
-        cur = conn.execute("SELECT * FROM popups ORDER BY created_at DESC")
-        popups = cur.fetchall()
+        cur = conn.execute(_PENDING_POPUP_SQL, (POPUP_IMAGE_WIDTH, employee_id))
+        p = cur.fetchone()
 
-    for p in popups:
-        popup_id = int(p["popup_id"])
-        if _has_responded(employee_id, popup_id):
-            continue
-
-        dept_targets = _parse_csv(p["target_departments"])
-        team_targets = _parse_csv(p["target_teams"])
-
-        # 최종 룰:
-        # 1) 팀 지정 -> 팀 기준
-        # 2) 팀 없음 + 본부 지정 -> 본부 기준
-        # 3) 둘 다 없음 -> 발송 안 함
-        if team_targets:
-            matches = (emp["team"] in team_targets)
-        elif dept_targets:
-            matches = (emp["department"] in dept_targets)
-        else:
-            matches = False
-
-        if matches:
-            post_id = int(p["post_id"])
-            img = get_first_image_attachment(post_id)
+    if not p:
+        return None
 
-            payload = {
-                "popupId": popup_id,
-                "title": p["title"],
-                "content": p["content"],
-                "ignoreRemaining": emp["ignoreRemaining"],
-            }
+    payload = {
+        "popupId": int(p["popup_id"]),
+        "postId": int(p["post_id"]),
+        "title": p["title"],
+        "content": p["content"],
+        "ignoreRemaining": int(p["ignore_remaining"] or 0),
+    }
 
-            # 이미지가 있으면 같이 내려줌 (없으면 필드 자체가 없어도 됨)
-            if img:
-                file_path = img.get("filePath", "")
-                # URL인지 로컬 경로인지 구분하여 올바른 키로 전달
-                if file_path.startswith("http://") or file_path.startswith("https://"):
-                    payload["imageUrl"] = file_path  # R2 URL
-                else:
-                    payload["imagePath"] = file_path  # 로컬 파일 경로
+    # 이미지가 있으면 같이 내려줌 (없으면 필드 자체가 없어도 됨)
+    file_path = p["image_path"] or ""
+    if file_path:
+        # URL인지 로컬 경로인지 구분하여 올바른 키로 전달
+        if file_path.startswith("http://") or file_path.startswith("https://"):
+            payload["imageUrl"] = file_path  # R2 URL
+        else:
+            payload["imagePath"] = file_path  # 로컬 파일 경로
 
-            return payload
-    return None
+    return payload
 
 
 # -------------------------
@@ -456,6 +1138,19 @@ def record_popup_action(employee_id: str, popup_id: int, action: str, confirmed:
         except Exception as e:
             # popup_id가 존재하지 않거나 FK 제약 조건 위반 시 무시 (로그만 남김)
             print(f"[Warning] Failed to record popup action: {e} (popup_id={popup_id})")
+            return
+
+        # 수신 목록에 최초 응답 시각 기록 (미응답 조회 인덱스에서 빠지도록)
+        conn.execute(
+            """
+            UPDATE popup_deliveries SET responded_at = ?
+            WHERE employee_id = ? AND popup_id = ? AND responded_at IS NULL
+            """,
+            (ts, employee_id, int(popup_id)),
+        )
+
+    # 본인 세션이 다음 미응답 팝업을 다시 조회하도록 알림
+    publish_popup_event(employees=[employee_id])
 
 def confirm_popup_action(employee_id: str, popup_id: int) -> bool:
     record_popup_action(employee_id, popup_id, "확인함", "예")
@@ -651,12 +1346,22 @@ def create_chat_session(user_id: str, name: str = "새 대화") -> str:
         )
     return session_id
 
+def _chat_session_row(r) -> Dict:
+    return {
+        "session_id": r["session_id"],
+        "user_id": r["user_id"],
+        "name": r["name"],
+        "created_at": r["created_at"],
+        "updated_at": r["updated_at"],
+        "message_count": int(r["message_count"] or 0),
+    }
+
 def get_user_chat_sessions(user_id: str) -> List[Dict]:
-    """사용자의 대화 세션 목록 조회"""
+    """사용자의 대화 세션 목록 조회 (전체, 화면에서는 list_chat_sessions_page 사용)"""
     with get_conn() as conn:
         cur = conn.execute(
             """
-            SELECT session_id, user_id, name, created_at, updated_at
+            SELECT session_id, user_id, name, created_at, updated_at, message_count
             FROM chat_sessions
             WHERE user_id = ?
             ORDER BY updated_at DESC
@@ -664,17 +1369,46 @@ def get_user_chat_sessions(user_id: str) -> List[Dict]:
             (user_id,),
         )
         rows = cur.fetchall()
-        
-    result = []
-    for r in rows:
-        result.append({
-            "session_id": r["session_id"],
-            "user_id": r["user_id"],
-            "name": r["name"],
-            "created_at": r["created_at"],
-            "updated_at": r["updated_at"],
-        })
-    return result
+
+    return [_chat_session_row(r) for r in rows]
+
+def list_chat_sessions_page(user_id: str, page_size: int = 30, before: Optional[Tuple[int, str]] = None) -> Dict:
+    """
+    대화 세션 목록 한 페이지 (최근 대화순 keyset 페이지네이션, 메시지 제외)
+
+    Args:
+        user_id: 사용자 ID
+        page_size: 페이지당 건수
+        before: 이전 페이지 마지막 (updated_at, session_id) (None이면 첫 페이지)
+
+    Returns:
+        {
+            "items": [{"session_id", "user_id", "name", "created_at", "updated_at", "message_count"}, ...],
+            "nextCursor": 다음 페이지 before (마지막 페이지면 None)
+        }
+    """
+    page_size = max(1, int(page_size))
+    sql = """
+        SELECT session_id, user_id, name, created_at, updated_at, message_count
+        FROM chat_sessions
+        WHERE user_id = ?
+    """
+    params: List[Any] = [user_id]
+    if before is not None:
+        sql += " AND (updated_at < ? OR (updated_at = ? AND session_id < ?))"
+        params.extend([int(before[0]), int(before[0]), str(before[1])])
+    sql += " ORDER BY updated_at DESC, session_id DESC LIMIT ?"
+    params.append(page_size + 1)  # 1건 더 읽어서 다음 페이지 유무 판단
+
+    with get_conn() as conn:
+        rows = conn.execute(sql, tuple(params)).fetchall()
+
+    has_more = len(rows) > page_size
+    items = [_chat_session_row(r) for r in rows[:page_size]]
+    return {
+        "items": items,
+        "nextCursor": (int(items[-1]["updated_at"]), items[-1]["session_id"]) if has_more else None,
+    }
 
 def update_chat_session_name(session_id: str, name: str) -> bool:
     """세션 이름 변경"""
@@ -710,18 +1444,46 @@ def add_chat_message(session_id: str, role: str, content: str, notice_refs: List
             """,
             (session_id, role, content, refs_json, details_json, ts),
         )
-        # 세션 업데이트 시간 갱신
-        conn.execute("UPDATE chat_sessions SET updated_at = ? WHERE session_id = ?", (ts, session_id))
+        # 세션 업데이트 시간 / 메시지 수 갱신
+        conn.execute(
+            "UPDATE chat_sessions SET updated_at = ?, message_count = message_count + 1 WHERE session_id = ?",
+            (ts, session_id),
+        )
         
     return True
 
-def get_chat_messages(session_id: str) -> List[Dict]:
-    """세션의 메시지 목록 조회"""
+def _chat_message_row(r) -> Dict:
     import json
+
+    refs = []
+    if r["notice_refs"]:
+        try:
+            refs = json.loads(r["notice_refs"])
+        except:
+            pass
+
+    details = []
+    if r["notice_details"]:
+        try:
+            details = json.loads(r["notice_details"])
+        except:
+            pass
+
+    return {
+        "id": int(r["id"]),
+        "role": r["role"],
+        "content": r["content"],
+        "notice_refs": refs,
+        "notice_details": details,
+        "created_at": r["created_at"],
+    }
+
+def get_chat_messages(session_id: str) -> List[Dict]:
+    """세션의 메시지 목록 조회 (전체, 화면에서는 get_chat_messages_page 사용)"""
     with get_conn() as conn:
         cur = conn.execute(
             """
-            SELECT role, content, notice_refs, notice_details, created_at
+            SELECT id, role, content, notice_refs, notice_details, created_at
             FROM chat_messages
             WHERE session_id = ?
             ORDER BY id ASC
@@ -729,35 +1491,56 @@ def get_chat_messages(session_id: str) -> List[Dict]:
             (session_id,),
         )
         rows = cur.fetchall()
-        
-    result = []
-    for r in rows:
-        refs = []
-        if r["notice_refs"]:
-            try:
-                refs = json.loads(r["notice_refs"])
-            except:
-                pass
-                
-        details = []
-        if r["notice_details"]:
-            try:
-                details = json.loads(r["notice_details"])
-            except:
-                pass
-        
-        result.append({
-            "role": r["role"],
-            "content": r["content"],
-            "notice_refs": refs,
-            "notice_details": details,
-            "created_at": r["created_at"],
-        })
-    return result
 
-def get_chatbot_keyword_stats() -> Dict[str, Dict[str, int]]:
+    return [_chat_message_row(r) for r in rows]
+
+def get_chat_messages_page(session_id: str, page_size: int = 20, before_id: Optional[int] = None) -> Dict:
+    """
+    세션 메시지 한 페이지 (최신 메시지부터 거꾸로 keyset 페이지네이션)
+
+    Args:
+        session_id: 세션 ID
+        page_size: 페이지당 건수
+        before_id: 이미 불러온 가장 오래된 메시지 id (None이면 최신 페이지)
+
+    Returns:
+        {
+            "items": 메시지 목록 (오래된 것 → 최신 순, 화면 표시 순서),
+            "nextCursor": 더 이전 메시지를 불러올 before_id (처음까지 왔으면 None)
+        }
+    """
+    page_size = max(1, int(page_size))
+    sql = """
+        SELECT id, role, content, notice_refs, notice_details, created_at
+        FROM chat_messages
+        WHERE session_id = ?
+    """
+    params: List[Any] = [session_id]
+    if before_id is not None:
+        sql += " AND id < ?"
+        params.append(int(before_id))
+    sql += " ORDER BY id DESC LIMIT ?"
+    params.append(page_size + 1)
+
+    with get_conn() as conn:
+        rows = conn.execute(sql, tuple(params)).fetchall()
+
+    has_more = len(rows) > page_size
+    items = [_chat_message_row(r) for r in reversed(rows[:page_size])]
+    return {
+        "items": items,
+        "nextCursor": items[0]["id"] if has_more else None,
+    }
+
+def get_chatbot_keyword_stats(window: Optional[str] = None, group: str = "team") -> Dict[str, Dict[str, int]]:
     """
     챗봇 로그에서 팀별 키워드 통계 추출
+    (로그 저장 시 누적한 chat_keyword_counts 조회 - core/keyword_stats.py)
+
+    Args:
+        window: None(전체 기간) | "24h" | "7d" | "30d"
+        group: "team"(팀별) | "department"(부서별)
+
     Returns:
         {
             "전체": {"연차": 10, "휴가": 5, ...},
@@ -765,138 +1548,48 @@ def get_chatbot_keyword_stats() -> Dict[str, Dict[str, int]]:
             ...
         }
     """
-    import json
-    from collections import Counter
-    
-    with get_conn() as conn:
-        # user_id로 팀 정보 조인
-        # chat_logs가 비어있으면 결과 없음
-        try:
-            query = """
-                SELECT l.keywords, e.team, e.department
-                FROM chat_logs l
-                LEFT JOIN employees e ON l.user_id = e.employee_id
-                ORDER BY l.created_at DESC
-            """
-            cur = conn.execute(query)
-            rows = cur.fetchall()
-        except Exception as e:
-            # 테이블이 없거나 에러 발생 시 빈 결과 반환
-            print(f"키워드 통계 조회 실패: {e}")
-            return {}
+    from core.keyword_stats import keyword_counts_by_group, window_range
 
-    stats = {"전체": Counter()}
-    
-    # 불용어 정의 (통계 후처리용)
-    STOPWORDS = {
-        '은', '는', '이', '가', '을', '를', '에', '의', '와', '과', '으로', '로', '에서', '부터', '까지',
-        '있다', '없다', '이다', '아니다', '하다', '되다', '않다', '같다', '싶다',
-        '알려줘', '알려주세요', '알려', '주세요', '해주세요', '해줘', '보여줘', '보여주세요',
-        '무엇', '무엇인가요', '어디', '어디서', '언제', '누구', '어떻게', '왜', 
-        '궁금해', '궁금해요', '질문', '문의', '사항', '관련', '대한', '대해', '대하여',
-        '안녕', '안녕하세요', '반가워', '반갑습니다', '감사', '고마워',
-        '공지', '사항', '확인', '방법', '좀', '수', '할', '한', '데', '건', '것',
-        '저', '나', '너', '우리', '그', '이', '저', '요', '네', '아니요',
-        '이번', '저번', '다음', '오늘', '내일', '어제', '지금', '현재',
-        '있어', '있나', '있니', '있나요', '없어', '없나', '없니', '없나요',
-        '??', '?!', '??', '..', '...',
-        '공지를', '공지사항', '최근', '뭐가', '뭔가', '알려줄래', '어떤', '어떤게',
-        '관련하여', '내용', '내용이', '불러와줘', '얼마야', '얼마'
-    }
-    
-    # 제거할 조사 목록
-    JOSAS = ['은', '는', '이', '가', '을', '를', '에', '의', '와', '과', '으로', '로', '에서', '도', '만']
+    try:
+        since, until = window_range(window) if window else (None, None)
+        return keyword_counts_by_group(group, since_ms=since, until_ms=until)
+    except Exception as e:
+        # 테이블이 없거나 에러 발생 시 빈 결과 반환
+        print(f"키워드 통계 조회 실패: {e}")
+        return {}
 
-    import re
 
-    for r in rows:
-        keywords_json = r["keywords"]
-        team = r["team"] or "기타"
-        
-        try:
-            keywords = json.loads(keywords_json)
-            # 리스트가 아니면 패스
-            if not isinstance(keywords, list):
-                continue
-        except:
-            continue
-            
-        if not keywords:
-            continue
-            
-        if team not in stats:
-            stats[team] = Counter()
-            
-        for k in keywords:
-            k = str(k).strip()
-            if not k:
-                continue
-            
-            # 1. 특수문자 제거
-            k_clean = re.sub(r'[^가-힣a-zA-Z0-9]', '', k)
-            
-            # 2. 길이 체크 및 1차 불용어 체크
-            if len(k_clean) < 2:
-                continue
-                
-            if k in STOPWORDS or k_clean in STOPWORDS:
-                continue
-            
-            # 3. 조사(Josa) 제거 로직 (Simple Stemming)
-            # '자동차를' -> '자동차', '학교에서' -> '학교'
-            cand = k_clean
-            for josa in JOSAS:
-                if cand.endswith(josa):
-                    # 조사를 제거했을 때 2글자 이상 남아야 함
-                    temp = cand[:-len(josa)]
-                    if len(temp) >= 2:
-                        cand = temp
-                        break # 하나만 제거하고 중단 (중복 조사 처리 안함)
-            
-            # 조사 제거 후 다시 불용어 체크
-            if cand in STOPWORDS:
-                continue
-                
-            stats["전체"][cand] += 1
-            stats[team][cand] += 1
-            
-    # Counter 객체를 dict로 변환하여 반환
-    return {k: dict(v) for k, v in stats.items()}
+def get_rising_chatbot_keywords(window: str, group: str = "team", name: Optional[str] = None, limit: int = 10) -> List[Dict]:
+    """
+    직전 기간 대비 급증한 챗봇 키워드
+
+    Args:
+        window: "24h" | "7d" | "30d"
+        group: "team" | "department"
+        name: 팀/부서명 (None 또는 "전체"면 전체)
+        limit: 최대 개수
+
+    Returns:
+        [{"keyword", "count", "previous", "delta", "growth"}, ...]
+    """
+    from core.keyword_stats import rising_keywords
+
+    scope = {} if not name or name == "전체" else {group: name}
+    try:
+        return rising_keywords(window, limit=limit, **scope)
+    except Exception as e:
+        print(f"급증 키워드 조회 실패: {e}")
+        return []
 
 def get_account_info(login_id: str) -> Optional[Dict]:
     """쿠키/토큰 기반 로그인을 위해 ID로 계정 정보 조회"""
-    with get_conn() as conn:
-        # accounts 조회
-        cur = conn.execute(
-            "SELECT * FROM accounts WHERE login_id = ?",
-            (login_id,)
-        )
-        acc = cur.fetchone()
-        
-        if not acc:
-            return None
-            
-        role = acc["role"]
-        
-        result = {
-            "loginId": acc["login_id"],
-            "role": role,
-            "employee": None
-        }
-        
-        if role == "EMPLOYEE" and acc["employee_id"]:
-            cur_emp = conn.execute(
-                "SELECT * FROM employees WHERE employee_id = ?",
-                (acc["employee_id"],)
-            )
-            emp = cur_emp.fetchone()
-            if emp:
-                result["employee"] = {
-                    "employeeId": emp["employee_id"],
-                    "name": emp["name"],
-                    "department": emp["department"],
-                    "team": emp["team"],
-                    "ignoreRemaining": int(emp["ignore_remaining"] or 0),
-                }
-        
-        return result
+    acc = _fetch_account(login_id)
+    if not acc:
+        return None
+
+    role = acc["role"]
+    return {
+        "loginId": acc["login_id"],
+        "role": role,
+        "employee": _employee_row(acc) if role == "EMPLOYEE" else None,
+    }
@@ -51,6 +51,63 @@ ON notices(created_at);
 CREATE INDEX IF NOT EXISTS idx_popups_created_at
 ON popups(created_at);
 
+-- ✅ 팝업 대상 정규화 (popups.target_departments / target_teams CSV를 행 단위로 저장)
+-- target_type: 'DEPARTMENT' | 'TEAM'
+CREATE TABLE IF NOT EXISTS popup_targets (
+  popup_id       INTEGER NOT NULL,
+  target_type    TEXT NOT NULL CHECK(target_type IN ('DEPARTMENT','TEAM')),
+  target_value   TEXT NOT NULL,
+  PRIMARY KEY (popup_id, target_type, target_value),
+  FOREIGN KEY(popup_id) REFERENCES popups(popup_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_popup_targets_value
+ON popup_targets(target_type, target_value);
+
+-- ✅ 직원별 팝업 수신 목록 (create_popup 시점에 대상 직원을 미리 계산해 저장)
+-- responded_at: 최초 응답(확인함/나중에 확인/챗봇이동) 시각, 미응답이면 NULL
+CREATE TABLE IF NOT EXISTS popup_deliveries (
+  popup_id       INTEGER NOT NULL,
+  employee_id    TEXT NOT NULL,
+  created_at     INTEGER NOT NULL,             -- 팝업 생성 시각 (정렬용)
+  responded_at   INTEGER,
+  PRIMARY KEY (popup_id, employee_id),
+  FOREIGN KEY(popup_id) REFERENCES popups(popup_id) ON DELETE CASCADE,
+  FOREIGN KEY(employee_id) REFERENCES employees(employee_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_popup_deliveries_pending
+ON popup_deliveries(employee_id, responded_at, created_at);
+
+-- ✅ 공지 요약 캐시 (cache_key = sha256(프롬프트 버전, 제목, 내용))
+-- 같은 공지 버전의 요약을 모든 직원이 공유, post_id는 수정/삭제 시 이전 요약 정리용
+CREATE TABLE IF NOT EXISTS notice_summaries (
+  cache_key      TEXT PRIMARY KEY,
+  post_id        INTEGER,
+  prompt_version TEXT NOT NULL,
+  summary        TEXT NOT NULL,
+  created_at     INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_notice_summaries_post
+ON notice_summaries(post_id);
+
+-- ✅ 공지 요약 미리 생성 작업 (공지당 1행, core/summary_jobs.py)
+-- status: PENDING(대기) / RUNNING(생성 중) / DONE(완료) / FAILED(실패)
+CREATE TABLE IF NOT EXISTS summary_jobs (
+  post_id        INTEGER PRIMARY KEY,
+  status         TEXT NOT NULL DEFAULT 'PENDING' CHECK(status IN ('PENDING','RUNNING','DONE','FAILED')),
+  attempts       INTEGER NOT NULL DEFAULT 0,
+  run_id         INTEGER NOT NULL DEFAULT 0,     -- 선점할 때마다 +1 (이전 실행이 새 실행의 결과를 덮어쓰지 않도록)
+  next_run_at    INTEGER NOT NULL,             -- 재시도 예정 시각 (epoch ms)
+  last_error     TEXT,
+  created_at     INTEGER NOT NULL,
+  updated_at     INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_jobs_due
+ON summary_jobs(status, next_run_at);
+
 -- ✅ 로그인 계정 테이블 추가
 -- role: 'ADMIN' | 'EMPLOYEE'
 -- employee_id: EMPLOYEE면 employees.employee_id를 참조(연결), ADMIN이면 NULL
@@ -66,6 +123,17 @@ CREATE TABLE IF NOT EXISTS accounts (
 CREATE INDEX IF NOT EXISTS idx_accounts_role
 ON accounts(role);
 
+-- ✅ 로그아웃한 세션 토큰 (core/session_token.py, 토큰 만료 후 삭제)
+CREATE TABLE IF NOT EXISTS revoked_sessions (
+  token_id       TEXT PRIMARY KEY,
+  login_id       TEXT NOT NULL,
+  expires_at     INTEGER NOT NULL,             -- 토큰 만료 시각 (epoch ms)
+  revoked_at     INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_revoked_sessions_expires
+ON revoked_sessions(expires_at);
+
 CREATE TABLE IF NOT EXISTS notice_files (
   file_id     INTEGER PRIMARY KEY AUTOINCREMENT,
   post_id     INTEGER NOT NULL,
@@ -74,12 +142,25 @@ CREATE TABLE IF NOT EXISTS notice_files (
   file_path   TEXT NOT NULL,
   file_size   INTEGER NOT NULL DEFAULT 0,
   uploaded_at INTEGER NOT NULL,
+  variant        TEXT NOT NULL DEFAULT '',   -- '' = 원본, 'w480' 등 = 이미지 축소본
+  source_file_id INTEGER,                    -- 축소본이면 원본 file_id
+  width          INTEGER,                    -- 축소본 폭(px)
+  content_sha256 TEXT,                       -- 내용 해시 (같은 내용은 파일 1개를 공유)
   FOREIGN KEY(post_id) REFERENCES notices(post_id) ON DELETE CASCADE
 );
 
 CREATE INDEX IF NOT EXISTS idx_notice_files_post_id
 ON notice_files(post_id);
 
+-- ✅ 공지 직원별 최초 조회 (VIEW_UNIQUE_VIEWERS=1 일 때 기록)
+CREATE TABLE IF NOT EXISTS notice_viewers (
+  post_id        INTEGER NOT NULL,
+  employee_id    TEXT NOT NULL,
+  viewed_at      INTEGER NOT NULL,             -- 최초 조회 시각 (epoch ms)
+  PRIMARY KEY (post_id, employee_id),
+  FOREIGN KEY(post_id) REFERENCES notices(post_id) ON DELETE CASCADE
+);
+
 -- ✅ 담당자 문의 테이블 추가
 -- 챗봇에서 담당자에게 문의한 내역 저장
 CREATE TABLE IF NOT EXISTS inquiries (
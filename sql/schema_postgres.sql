@@ -27,6 +27,15 @@ CREATE TABLE IF NOT EXISTS popups (
   FOREIGN KEY(post_id) REFERENCES notices(post_id) ON DELETE CASCADE
 );
 
+-- 팝업 대상 정규화 테이블 (target_type: 'DEPARTMENT' | 'TEAM')
+CREATE TABLE IF NOT EXISTS popup_targets (
+  popup_id       BIGINT NOT NULL,
+  target_type    TEXT NOT NULL CHECK(target_type IN ('DEPARTMENT','TEAM')),
+  target_value   TEXT NOT NULL,
+  PRIMARY KEY (popup_id, target_type, target_value),
+  FOREIGN KEY(popup_id) REFERENCES popups(popup_id) ON DELETE CASCADE
+);
+
 -- 직원 테이블
 CREATE TABLE IF NOT EXISTS employees (
   employee_id      TEXT PRIMARY KEY,
@@ -48,6 +57,17 @@ CREATE TABLE IF NOT EXISTS popup_logs (
   FOREIGN KEY(popup_id) REFERENCES popups(popup_id) ON DELETE CASCADE
 );
 
+-- 직원별 팝업 수신 목록 (create_popup 시점에 계산)
+CREATE TABLE IF NOT EXISTS popup_deliveries (
+  popup_id       BIGINT NOT NULL,
+  employee_id    TEXT NOT NULL,
+  created_at     BIGINT NOT NULL,
+  responded_at   BIGINT,
+  PRIMARY KEY (popup_id, employee_id),
+  FOREIGN KEY(popup_id) REFERENCES popups(popup_id) ON DELETE CASCADE,
+  FOREIGN KEY(employee_id) REFERENCES employees(employee_id) ON DELETE CASCADE
+);
+
 -- 계정 테이블
 CREATE TABLE IF NOT EXISTS accounts (
   login_id       TEXT PRIMARY KEY,
@@ -67,6 +87,19 @@ CREATE TABLE IF NOT EXISTS notice_files (
   file_path   TEXT NOT NULL,
   file_size   INTEGER NOT NULL DEFAULT 0,
   uploaded_at BIGINT NOT NULL,
+  variant        TEXT NOT NULL DEFAULT '',   -- '' = 원본, 'w480' 등 = 이미지 축소본
+  source_file_id INTEGER,                    -- 축소본이면 원본 file_id
+  width          INTEGER,                    -- 축소본 폭(px)
+  content_sha256 TEXT,                       -- 내용 해시 (같은 내용은 파일 1개를 공유)
+  FOREIGN KEY(post_id) REFERENCES notices(post_id) ON DELETE CASCADE
+);
+
+-- 공지 직원별 최초 조회 (VIEW_UNIQUE_VIEWERS=1 일 때 기록)
+CREATE TABLE IF NOT EXISTS notice_viewers (
+  post_id        BIGINT NOT NULL,
+  employee_id    TEXT NOT NULL,
+  viewed_at      BIGINT NOT NULL,
+  PRIMARY KEY (post_id, employee_id),
   FOREIGN KEY(post_id) REFERENCES notices(post_id) ON DELETE CASCADE
 );
 
@@ -80,9 +113,50 @@ CREATE TABLE IF NOT EXISTS chat_logs (
   summary        TEXT,
   keywords       TEXT,
   notice_refs    TEXT,
+  cached         INTEGER NOT NULL DEFAULT 0,    -- 답변 캐시 재사용 여부
+  created_at     BIGINT NOT NULL
+);
+
+-- 챗봇 키워드 사전 집계 (granularity H: 1시간 구간, D: 1일 구간 / 로그 저장 시 누적)
+CREATE TABLE IF NOT EXISTS chat_keyword_counts (
+  bucket_start   BIGINT NOT NULL,
+  granularity    TEXT NOT NULL CHECK(granularity IN ('H','D')),
+  team           TEXT NOT NULL,
+  department     TEXT NOT NULL,
+  keyword        TEXT NOT NULL,
+  cnt            INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket_start, granularity, team, department, keyword)
+);
+
+-- 공지 요약 캐시 (cache_key = sha256(프롬프트 버전, 제목, 내용))
+CREATE TABLE IF NOT EXISTS notice_summaries (
+  cache_key      TEXT PRIMARY KEY,
+  post_id        BIGINT,
+  prompt_version TEXT NOT NULL,
+  summary        TEXT NOT NULL,
   created_at     BIGINT NOT NULL
 );
 
+-- 공지 요약 미리 생성 작업 (공지당 1행)
+CREATE TABLE IF NOT EXISTS summary_jobs (
+  post_id        BIGINT PRIMARY KEY,
+  status         TEXT NOT NULL DEFAULT 'PENDING' CHECK(status IN ('PENDING','RUNNING','DONE','FAILED')),
+  attempts       INTEGER NOT NULL DEFAULT 0,
+  run_id         INTEGER NOT NULL DEFAULT 0,
+  next_run_at    BIGINT NOT NULL,
+  last_error     TEXT,
+  created_at     BIGINT NOT NULL,
+  updated_at     BIGINT NOT NULL
+);
+
+-- 로그아웃한 세션 토큰 (토큰 만료 후 삭제)
+CREATE TABLE IF NOT EXISTS revoked_sessions (
+  token_id       TEXT PRIMARY KEY,
+  login_id       TEXT NOT NULL,
+  expires_at     BIGINT NOT NULL,
+  revoked_at     BIGINT NOT NULL
+);
+
 -- 담당자 문의 테이블
 CREATE TABLE IF NOT EXISTS inquiries (
   id             SERIAL PRIMARY KEY,
@@ -99,10 +173,17 @@ CREATE TABLE IF NOT EXISTS inquiries (
 CREATE INDEX IF NOT EXISTS idx_popup_logs_emp_popup ON popup_logs(employee_id, popup_id);
 CREATE INDEX IF NOT EXISTS idx_notices_created_at ON notices(created_at);
 CREATE INDEX IF NOT EXISTS idx_popups_created_at ON popups(created_at);
+CREATE INDEX IF NOT EXISTS idx_popup_targets_value ON popup_targets(target_type, target_value);
+CREATE INDEX IF NOT EXISTS idx_popup_deliveries_pending ON popup_deliveries(employee_id, responded_at, created_at);
+CREATE INDEX IF NOT EXISTS idx_notice_summaries_post ON notice_summaries(post_id);
+CREATE INDEX IF NOT EXISTS idx_summary_jobs_due ON summary_jobs(status, next_run_at);
 CREATE INDEX IF NOT EXISTS idx_accounts_role ON accounts(role);
+CREATE INDEX IF NOT EXISTS idx_revoked_sessions_expires ON revoked_sessions(expires_at);
 CREATE INDEX IF NOT EXISTS idx_notice_files_post_id ON notice_files(post_id);
 CREATE INDEX IF NOT EXISTS idx_chat_logs_user ON chat_logs(user_id);
 CREATE INDEX IF NOT EXISTS idx_chat_logs_created ON chat_logs(created_at);
+CREATE INDEX IF NOT EXISTS idx_chat_keyword_counts_team ON chat_keyword_counts(team, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_chat_keyword_counts_dept ON chat_keyword_counts(department, bucket_start);
 CREATE INDEX IF NOT EXISTS idx_inquiries_created_at ON inquiries(created_at);
 CREATE INDEX IF NOT EXISTS idx_inquiries_status ON inquiries(status);
 